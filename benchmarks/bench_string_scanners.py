@@ -0,0 +1,101 @@
+"""
+Microbenchmark of the scanners of the string predicates against the conversions they
+replace, for a mix of mostly valid and a mix of mostly invalid inputs.
+
+Run it from the root of the repository with `python -m benchmarks.bench_string_scanners`
+"""
+
+import random
+from ipaddress import ip_address
+from timeit import Timer
+from typing import Any, Callable, List
+
+from refined.predicates import ValidIntPredicate, ValidFloatPredicate, IPv4Predicate, IPv6Predicate
+
+NUM_VALUES, REPEAT = 10_000, 5
+
+
+def convert_int(value: str) -> bool:
+    try:
+        _ = int(value)
+        return True
+    except ValueError:
+        return False
+
+
+def convert_float(value: str) -> bool:
+    try:
+        _ = float(value)
+        return True
+    except ValueError:
+        return False
+
+
+def convert_ipv4(value: str) -> bool:
+    try:
+        return ip_address(value).version == 4
+    except ValueError:
+        return False
+
+
+def convert_ipv6(value: str) -> bool:
+    try:
+        return ip_address(value).version == 6
+    except ValueError:
+        return False
+
+
+def random_int(rng: random.Random) -> str:
+    return str(rng.randint(-10 ** 6, 10 ** 6))
+
+
+def random_float(rng: random.Random) -> str:
+    return repr(rng.uniform(-10 ** 6, 10 ** 6))
+
+
+def random_ipv4(rng: random.Random) -> str:
+    return ".".join(str(rng.randint(0, 255)) for _ in range(4))
+
+
+def random_ipv6(rng: random.Random) -> str:
+    return ":".join(f"{rng.randint(0, 0xffff):x}" for _ in range(8))
+
+
+def random_invalid(rng: random.Random) -> str:
+    return rng.choice(["", "abc", "1.2.3", "1..2", "12a", "::g", "256.1.1.1", "1e", "0x1f"])
+
+
+def mix(rng: random.Random, make_valid: Callable[[random.Random], str],
+        valid_ratio: float) -> List[str]:
+    return [make_valid(rng) if rng.random() < valid_ratio else random_invalid(rng)
+            for _ in range(NUM_VALUES)]
+
+
+def best_time(check: Callable[[Any], bool], values: List[str]) -> float:
+    timer = Timer(lambda: [check(_) for _ in values])
+    return min(timer.repeat(repeat=REPEAT, number=1))
+
+
+def main():
+    rng = random.Random(0)
+    cases = [
+        ("int", random_int, convert_int, ValidIntPredicate.type_guard),
+        ("float", random_float, convert_float, ValidFloatPredicate.type_guard),
+        ("ipv4", random_ipv4, convert_ipv4, IPv4Predicate.type_guard),
+        ("ipv6", random_ipv6, convert_ipv6, IPv6Predicate.type_guard),
+    ]
+
+    print(f"{'predicate':<10}{'mix':<10}{'conversion (ms)':>18}{'predicate (ms)':>16}"
+          f"{'speedup':>10}")
+    for name, make_valid, convert, scan in cases:
+        for mix_name, valid_ratio in (("valid", 0.9), ("invalid", 0.1)):
+            values = mix(rng, make_valid, valid_ratio)
+            assert [convert(_) for _ in values] == [scan(_) for _ in values]
+
+            conversion_time, scanner_time = best_time(convert, values), best_time(scan, values)
+            print(f"{name:<10}{mix_name:<10}{conversion_time * 1e3:>18.2f}"
+                  f"{scanner_time * 1e3:>16.2f}{conversion_time / scanner_time:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+"""Check of a million floats, as a refined array or value by value as a refined list"""
+
+import numpy as np
+import pytest
+from typing import List
+from typing_extensions import Annotated
+
+from refined import RefinedValidator
+from refined.predicates import Elementwise
+from refined.predicates.numeric import InRange
+
+VALUES = np.random.default_rng(0).random(1_000_000)
+
+
+@pytest.mark.parametrize("refined_type, values", [
+    (Annotated[np.ndarray, Elementwise[InRange[0, 1]]], VALUES),
+    (Annotated[List[float], Elementwise[InRange[0, 1]]], VALUES.tolist()),
+], ids=["array", "list"])
+def test_elementwise(benchmark, refined_type, values):
+    benchmark.group = "array-predicate"
+    validator = RefinedValidator(refined_type)
+
+    assert benchmark(validator.is_valid, values)
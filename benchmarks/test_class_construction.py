@@ -0,0 +1,38 @@
+"""Construction of refined records, against the same records without the decorator"""
+
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import pytest
+
+from refined import refined
+from refined.refinement_types import NonEmptyString, Positive
+
+
+def make_dataclass(is_refined: bool) -> type:
+    @dataclass
+    class Payment:
+        payer: NonEmptyString
+        payee: NonEmptyString
+        amount: Positive[int]
+
+    return refined(Payment) if is_refined else Payment
+
+
+def make_named_tuple(is_refined: bool) -> type:
+    class Payment(NamedTuple):
+        payer: NonEmptyString
+        payee: NonEmptyString
+        amount: Positive[int]
+
+    return refined(Payment) if is_refined else Payment
+
+
+@pytest.mark.parametrize("is_refined", [False, True], ids=["bare", "refined"])
+@pytest.mark.parametrize("make_class", [make_dataclass, make_named_tuple],
+                         ids=["dataclass", "named_tuple"])
+def test_construction(benchmark, make_class, is_refined):
+    benchmark.group = f"construction-{make_class.__name__[5:]}"
+    record_class = make_class(is_refined)
+
+    benchmark(record_class, "peter", "paul", 10)
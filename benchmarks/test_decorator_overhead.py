@@ -0,0 +1,25 @@
+"""Call overhead of a refined function, against the same function without the decorator"""
+
+import pytest
+
+from benchmarks.utils import make_function, positional_arguments, keyword_arguments
+
+NUM_PARAMETERS = [1, 5, 20]
+
+
+@pytest.mark.parametrize("is_refined", [False, True], ids=["bare", "refined"])
+@pytest.mark.parametrize("num_parameters", NUM_PARAMETERS)
+def test_positional_call(benchmark, num_parameters, is_refined):
+    benchmark.group = f"call-positional-{num_parameters}"
+    function, args = make_function(num_parameters, is_refined), positional_arguments(num_parameters)
+
+    benchmark(function, *args)
+
+
+@pytest.mark.parametrize("is_refined", [False, True], ids=["bare", "refined"])
+@pytest.mark.parametrize("num_parameters", NUM_PARAMETERS)
+def test_keyword_call(benchmark, num_parameters, is_refined):
+    benchmark.group = f"call-keyword-{num_parameters}"
+    function, kwargs = make_function(num_parameters, is_refined), keyword_arguments(num_parameters)
+
+    benchmark(function, **kwargs)
@@ -0,0 +1,32 @@
+"""Cost of calls to refined functions that raise, as the first or every parameter is invalid"""
+
+import pytest
+
+from refined import RefinementTypeException
+from benchmarks.utils import make_function, positional_arguments
+
+NUM_PARAMETERS = [1, 5, 20]
+
+
+def call_and_catch(function, *args):
+    try:
+        function(*args)
+    except RefinementTypeException:
+        pass
+
+
+@pytest.mark.parametrize("num_parameters", NUM_PARAMETERS)
+def test_first_parameter_invalid(benchmark, num_parameters):
+    benchmark.group = f"failing-call-{num_parameters}"
+    function, args = make_function(num_parameters, True), positional_arguments(num_parameters)
+    args[0] = -1
+
+    benchmark(call_and_catch, function, *args)
+
+
+@pytest.mark.parametrize("num_parameters", NUM_PARAMETERS)
+def test_every_parameter_invalid(benchmark, num_parameters):
+    benchmark.group = f"failing-call-{num_parameters}"
+    function, args = make_function(num_parameters, True), positional_arguments(num_parameters, -1)
+
+    benchmark(call_and_catch, function, *args)
@@ -0,0 +1,22 @@
+"""
+Time to import the package and its most used names in a new interpreter, as in a CLI tool
+or a cold start
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+STATEMENTS = {
+    "interpreter": "pass",
+    "package": "import refined",
+    "refinement-types": "from refined.refinement_types import Positive, NonEmptyString",
+    "decorator": "from refined import refined",
+}
+
+
+@pytest.mark.parametrize("statement", list(STATEMENTS.values()), ids=list(STATEMENTS))
+def test_import(benchmark, statement):
+    benchmark.group = "import"
+    benchmark(subprocess.run, [sys.executable, "-c", statement], check=True)
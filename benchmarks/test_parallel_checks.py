@@ -0,0 +1,21 @@
+"""Check of the expensive parameters of a function, one after another or at the same time"""
+
+import pytest
+
+from refined import refined
+from refined.refinement_types import CsvString, XmlString
+
+DOCUMENT = "<a>" + "<b>x</b>" * 20_000 + "</a>"
+TABLE = "a,b\n" * 20_000
+
+
+def merge(first: XmlString, second: XmlString, table: CsvString) -> None:
+    pass
+
+
+@pytest.mark.parametrize("parallel", [None, True], ids=["serial", "parallel"])
+def test_expensive_parameters(benchmark, parallel):
+    benchmark.group = "parallel-checks"
+    function = refined(merge, parallel=parallel)
+
+    benchmark(function, DOCUMENT, DOCUMENT, TABLE)
@@ -0,0 +1,19 @@
+"""Check of a combination of predicates, fused or as separate predicates of a refined type"""
+
+import pytest
+from typing_extensions import Annotated
+
+from refined import RefinedValidator
+from refined.predicates import PositivePredicate
+from refined.predicates.numeric import Greater, Less, Modulo
+
+SEPARATE = Annotated[int, PositivePredicate[int], Greater[10], Less[100], Modulo[2]]
+FUSED = Annotated[int, PositivePredicate[int] & Greater[10] & Less[100] & Modulo[2]]
+
+
+@pytest.mark.parametrize("refined_type", [SEPARATE, FUSED], ids=["separate", "fused"])
+def test_combination(benchmark, refined_type):
+    benchmark.group = "predicate-combination"
+    validator = RefinedValidator(refined_type)
+
+    assert benchmark(validator.is_valid, 42)
@@ -0,0 +1,57 @@
+"""Throughput of the type guard of each predicate, for a valid and an invalid value"""
+
+import pytest
+from typing_extensions import Literal
+
+from refined.predicates import (
+    PositivePredicate,
+    NegativePredicate,
+    EmptyPredicate,
+    NonEmptyPredicate,
+    TrimmedPredicate,
+    ValidIntPredicate,
+    ValidFloatPredicate,
+    XmlPredicate,
+    CsvPredicate,
+    IPv4Predicate,
+    IPv6Predicate,
+)
+from refined.predicates.numeric import Greater, Less, Modulo, NonNan
+from refined.predicates.common import ValueRangePredicate
+from refined.predicates.generic import EqualPredicate
+
+XML_NOTE = "<note><to>Tove</to><body>Don't forget me</body></note>"
+XML_DOCUMENT = "<notes>" + XML_NOTE * 100 + "</notes>"
+CSV_DOCUMENT = "name,quote\r\n" + "peter,\"hello, there\"\r\n" * 100
+
+# predicate, arguments, valid value, invalid value
+CASES = [
+    (Greater, (Literal[0],), 1, -1),
+    (Less, (Literal[0],), -1, 1),
+    (Modulo, (Literal[2],), 4, 3),
+    (NonNan, (), 1.0, float("nan")),
+    (PositivePredicate, (), 1, -1),
+    (NegativePredicate, (), -1, 1),
+    (EmptyPredicate, (), [], [1]),
+    (NonEmptyPredicate, (), [1], []),
+    (ValueRangePredicate, (0, 10), list(range(10)), [11]),
+    (EqualPredicate, ("a",), "a", "b"),
+    (TrimmedPredicate, (), "hello", " hello "),
+    (ValidIntPredicate, (), "-123", "12a"),
+    (ValidFloatPredicate, (), "-1.5e3", "1.5f"),
+    (XmlPredicate, (), XML_DOCUMENT, XML_DOCUMENT[:-1]),
+    (CsvPredicate, (), CSV_DOCUMENT, "\"" + "a" * 200_000),
+    (IPv4Predicate, (), "192.168.0.1", "192.168.0.256"),
+    (IPv6Predicate, (), "fe80::1:2:3:4", "fe80::1::2"),
+]
+
+
+@pytest.mark.parametrize("is_valid", [True, False], ids=["valid", "invalid"])
+@pytest.mark.parametrize("predicate, args, valid_value, invalid_value", CASES,
+                         ids=[_[0].__name__ for _ in CASES])
+def test_type_guard(benchmark, predicate, args, valid_value, invalid_value, is_valid):
+    benchmark.group = f"predicate-{predicate.__name__}"
+    value = valid_value if is_valid else invalid_value
+
+    result = benchmark(predicate.type_guard, value, *args)
+    assert result is is_valid
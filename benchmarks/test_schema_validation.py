@@ -0,0 +1,60 @@
+"""Check of a payload, with a compiled schema or field by field through refined functions"""
+
+from typing import List
+
+from typing_extensions import TypedDict
+
+from refined import compile_schema, refined
+from refined.refinement_types import NonEmptyString, Positive, TrimmedString
+
+
+class Order(TypedDict):
+    id: Positive[int]
+    email: NonEmptyString
+    name: TrimmedString
+    quantity: Positive[int]
+    items: List[Positive[int]]
+
+
+PAYLOAD = {"id": 1, "email": "a@b.c", "name": "Ada", "quantity": 3, "items": [1, 2, 3]}
+
+
+@refined
+def check_id(value: Positive[int]) -> None:
+    pass
+
+
+@refined
+def check_email(value: NonEmptyString) -> None:
+    pass
+
+
+@refined
+def check_name(value: TrimmedString) -> None:
+    pass
+
+
+@refined
+def check_items(value: List[Positive[int]]) -> None:
+    pass
+
+
+def check_fields(payload):
+    check_id(payload["id"])
+    check_email(payload["email"])
+    check_name(payload["name"])
+    check_id(payload["quantity"])
+    check_items(payload["items"])
+
+
+def test_compiled_schema(benchmark):
+    benchmark.group = "schema-validation"
+    validator = compile_schema(Order)
+
+    benchmark(validator.check, PAYLOAD)
+
+
+def test_field_by_field(benchmark):
+    benchmark.group = "schema-validation"
+
+    benchmark(check_fields, PAYLOAD)
@@ -0,0 +1,25 @@
+from typing import Any, Callable, Dict, List
+
+from refined import refined
+from refined.refinement_types import Positive
+
+
+def make_function(num_parameters: int, is_refined: bool) -> Callable[..., Any]:
+    """Build a function with 'num_parameters' parameters of type 'Positive[int]'"""
+    parameters = [f"p{_}" for _ in range(num_parameters)]
+    annotated_parameters = ", ".join(f"{_}: Positive[int]" for _ in parameters)
+    source = f"def function({annotated_parameters}):\n    return p0\n"
+
+    namespace: Dict[str, Any] = {"Positive": Positive}
+    exec(source, namespace)
+
+    function = namespace["function"]
+    return refined(function) if is_refined else function
+
+
+def positional_arguments(num_parameters: int, value: int = 1) -> List[int]:
+    return [value] * num_parameters
+
+
+def keyword_arguments(num_parameters: int, value: int = 1) -> Dict[str, int]:
+    return {f"p{_}": value for _ in range(num_parameters)}
@@ -1,2 +1,65 @@
-from .decorator import refined
-from .predicates import RefinementTypeException
+"""
+The public names of the package are imported lazily, on first use (PEP 562), so that
+'import refined' does not load the decorator, its code generation, or NumPy, until they
+are needed.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .config import configure
+    from .instrumentation import stats, reset_stats, set_stats_callback
+    from .decorator import refined
+    from .validator import RefinedValidator, refine
+    from .proof import ProvenValue
+    from .bulk import validate_many
+    from .schema import SchemaValidator, compile_schema
+    from .predicates import RefinementTypeException, RefinementViolation
+
+__all__ = [
+    'configure',
+    'stats',
+    'reset_stats',
+    'set_stats_callback',
+    'refined',
+    'RefinedValidator',
+    'refine',
+    'ProvenValue',
+    'validate_many',
+    'SchemaValidator',
+    'compile_schema',
+    'RefinementTypeException',
+    'RefinementViolation',
+]
+
+# the module of each public name
+_LAZY_ATTRIBUTES = {
+    'configure': '.config',
+    'stats': '.instrumentation',
+    'reset_stats': '.instrumentation',
+    'set_stats_callback': '.instrumentation',
+    'refined': '.decorator',
+    'RefinedValidator': '.validator',
+    'refine': '.validator',
+    'ProvenValue': '.proof',
+    'validate_many': '.bulk',
+    'SchemaValidator': '.schema',
+    'compile_schema': '.schema',
+    'RefinementTypeException': '.predicates',
+    'RefinementViolation': '.predicates',
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = globals()[name] = getattr(import_module(module, __name__), name)
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *__all__})
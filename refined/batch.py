@@ -0,0 +1,305 @@
+"""
+Validation of large CSV and JSONL files against a schema, across a pool of processes.
+
+A schema maps the fields of the rows to refined types, e.g. '{"id": ValidIntString, "email":
+NonEmptyString}'. 'validate_file' memory-maps the file, splits it into chunks that end on
+record boundaries, and checks the chunks in worker processes. Each worker compiles the
+validators of the schema once, when it starts, and maps the file itself, so the tasks that
+are sent to it are only the byte ranges of the chunks.
+
+The rows of CSV files are read by the names in their header, as strings; quoted fields can
+span several lines. The byte order mark that spreadsheets write at the start of UTF-8 files
+is skipped. The rows of JSONL files are JSON objects, whose values are checked as
+they are parsed, so, as for the parameters of refined functions, a value of another type than
+the one of its refined type is not checked. Missing fields and rows that can not be parsed
+are reported as failures.
+"""
+
+import codecs
+import csv
+import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from refined.validator import RefinedValidator
+
+__all__ = ['RowFailure', 'BatchReport', 'validate_file', 'iter_failures']
+
+_CHUNK_SIZE = 16 * 1024 * 1024
+_BLOCK_SIZE = 1024 * 1024  # the size of the slices in which a chunk is scanned for quotes
+
+_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+_MISSING = object()
+
+_Chunk = Tuple[int, int]
+_ChunkResult = Tuple[int, List["RowFailure"]]
+
+
+class RowFailure(NamedTuple):
+    """A row that does not hold the conditions of a schema"""
+    offset: int  # the byte offset of the start of the row in the file
+    # the fields that do not hold their conditions, empty if the row can not be parsed
+    fields: Tuple[str, ...]
+
+
+class BatchReport(NamedTuple):
+    """The number of rows that were checked in a file, and the ones that failed, in file order"""
+    rows: int
+    failures: List[RowFailure]
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.failures
+
+
+class _FileSpec(NamedTuple):
+    path: str
+    file_format: str
+    # the index of each field of the schema in the rows of a CSV file
+    columns: Optional[Tuple[int, ...]]
+    encoding: str
+    delimiter: str
+
+
+def validate_file(path: Union[str, "os.PathLike[str]"], schema: Mapping[str, Any],
+                  workers: Optional[int] = None, file_format: Optional[str] = None,
+                  chunk_size: int = _CHUNK_SIZE, max_items: Optional[int] = None,
+                  encoding: str = "utf-8", delimiter: str = ",") -> BatchReport:
+    """
+    Check every row of a CSV or JSONL file against a schema, with 'workers' processes, one per
+    CPU by default. The format is the one of the extension of the file, unless 'file_format'
+    is given as 'csv' or 'jsonl'. The file is split into chunks of about 'chunk_size' bytes,
+    and 'max_items' applies to the containers in the rows, as in 'RefinedValidator'
+    """
+    rows, failures = 0, []
+
+    chunks = _validate_chunks(path, schema, workers, file_format, chunk_size, max_items, encoding,
+                              delimiter)
+
+    for chunk_rows, chunk_failures in chunks:
+        rows += chunk_rows
+        failures.extend(chunk_failures)
+
+    return BatchReport(rows, failures)
+
+
+def iter_failures(path: Union[str, "os.PathLike[str]"], schema: Mapping[str, Any],
+                  workers: Optional[int] = None, file_format: Optional[str] = None,
+                  chunk_size: int = _CHUNK_SIZE, max_items: Optional[int] = None,
+                  encoding: str = "utf-8", delimiter: str = ",") -> Iterator[RowFailure]:
+    """
+    Like 'validate_file', but yield the failing rows in file order as soon as their chunk
+    is checked, so that they are not all kept in memory
+    """
+    chunks = _validate_chunks(path, schema, workers, file_format, chunk_size, max_items, encoding,
+                              delimiter)
+
+    for _, chunk_failures in chunks:
+        yield from chunk_failures
+
+
+def _validate_chunks(path: Union[str, "os.PathLike[str]"], schema: Mapping[str, Any],
+                     workers: Optional[int], file_format: Optional[str], chunk_size: int,
+                     max_items: Optional[int], encoding: str,
+                     delimiter: str) -> Iterator[_ChunkResult]:
+    if workers is not None and workers < 1:
+        raise ValueError(f"'workers' must be a positive integer, not {workers!r}")
+
+    if chunk_size < 1:
+        raise ValueError(f"'chunk_size' must be a positive integer, not {chunk_size!r}")
+
+    path = os.fspath(path)
+    file_format = file_format or _FORMATS.get(os.path.splitext(path)[1].lower())
+
+    if file_format not in ("csv", "jsonl"):
+        raise ValueError(f"Unknown format of {path!r}, 'file_format' must be 'csv' or 'jsonl'")
+
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            start, is_quoted = _skip_byte_order_mark(buffer, encoding), file_format == "csv"
+            if is_quoted:
+                start, columns = _read_header(buffer, start, schema, encoding, delimiter)
+            else:
+                columns = None
+            chunks = list(_split(buffer, start, chunk_size, is_quoted))
+
+    spec = _FileSpec(path, file_format, columns, encoding, delimiter)
+
+    if workers == 1 or len(chunks) <= 1:
+        worker = _Worker(spec, schema, max_items)
+        try:
+            yield from (worker.validate_chunk(*_) for _ in chunks)
+        finally:
+            worker.close()
+
+        return
+
+    # the schema is sent once to each worker, which compiles it in its initializer
+    with ProcessPoolExecutor(workers, initializer=_initialize_worker,
+                             initargs=(spec, schema, max_items)) as executor:
+        yield from executor.map(_validate_chunk, chunks)
+
+
+def _skip_byte_order_mark(buffer: mmap.mmap, encoding: str) -> int:
+    """The offset of the first record of a file, after the byte order mark of UTF-8, if any"""
+    is_utf8 = codecs.lookup(encoding).name in ("utf-8", "utf-8-sig")
+    return len(codecs.BOM_UTF8) if is_utf8 and buffer[:3] == codecs.BOM_UTF8 else 0
+
+
+def _read_header(buffer: mmap.mmap, start: int, schema: Mapping[str, Any], encoding: str,
+                 delimiter: str) -> Tuple[int, Tuple[int, ...]]:
+    """The offset of the first row of a CSV file, and the column of each field of the schema"""
+    end = _find_record_end(buffer, start, start, True)
+    names = next(csv.reader([buffer[start:end].decode(encoding)], delimiter=delimiter), [])
+    missing = [_ for _ in schema if _ not in names]
+
+    if missing:
+        raise ValueError(f"The header of the file does not have the fields {missing!r}")
+
+    return end, tuple(names.index(_) for _ in schema)
+
+
+def _split(buffer: mmap.mmap, start: int, chunk_size: int, is_quoted: bool) -> Iterator[_Chunk]:
+    """
+    Split a file into chunks of about 'chunk_size' bytes that end on record boundaries: the
+    first newline after the size, that is not in a quoted field if records can be quoted
+    """
+    size = len(buffer)
+
+    while start < size:
+        end = _find_record_end(buffer, start, min(start + chunk_size, size), is_quoted)
+        yield start, end
+        start = end
+
+
+def _find_record_end(buffer: mmap.mmap, start: int, position: int, is_quoted: bool) -> int:
+    """
+    The end of the record that includes a position, in a chunk that starts on a record
+    boundary
+    """
+    quotes = _count_quotes(buffer, start, position) if is_quoted else 0
+
+    while position < len(buffer):
+        newline = buffer.find(b"\n", position)
+        if newline == -1:
+            break
+
+        if is_quoted:
+            quotes += _count_quotes(buffer, position, newline)
+
+        position = newline + 1
+
+        if quotes % 2 == 0:  # i.e. the newline is not in a quoted field
+            return position
+
+    return len(buffer)
+
+
+def _count_quotes(buffer: mmap.mmap, start: int, end: int) -> int:
+    return sum(buffer[_:min(_ + _BLOCK_SIZE, end)].count(b'"')
+               for _ in range(start, end, _BLOCK_SIZE))
+
+
+def _iter_records(data: bytes, offset: int, is_quoted: bool) -> Iterator[Tuple[int, bytes]]:
+    """
+    Iterate over the offsets in the file and the contents of the records of a chunk that
+    starts at a given offset, without their trailing newline
+    """
+    start, position, quotes = 0, 0, 0
+
+    for line in data.split(b"\n"):
+        end = position + len(line)
+
+        if is_quoted:
+            quotes += line.count(b'"')
+
+        if quotes % 2 == 0:  # i.e. the newline is not in a quoted field
+            yield offset + start, line if start == position else data[start:end]
+            start, quotes = end + 1, 0
+
+        position = end + 1
+
+    if start < len(data):  # i.e. a quoted field is not closed at the end of the file
+        yield offset + start, data[start:]
+
+
+class _Worker:
+    """The validators of a schema, and the mapping of the file that they check the chunks of"""
+
+    def __init__(self, spec: _FileSpec, schema: Mapping[str, Any], max_items: Optional[int]):
+        self.spec = spec
+        self.fields = tuple(schema)
+        self.validators = tuple(RefinedValidator(_, max_items, strict=False)
+                                for _ in schema.values())
+        self._checks = tuple(_.is_valid for _ in self.validators)
+        self._decode_json = json.JSONDecoder().decode
+        self._file = open(spec.path, "rb")
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        self._buffer.close()
+        self._file.close()
+
+    def validate_chunk(self, start: int, end: int) -> _ChunkResult:
+        rows, failures = 0, []
+        is_quoted = self.spec.file_format == "csv"
+
+        for offset, record in _iter_records(self._buffer[start:end], start, is_quoted):
+            if not record.strip():
+                continue
+
+            rows += 1
+            values = self._parse(record)
+
+            if values is None:
+                failures.append(RowFailure(offset, ()))
+                continue
+
+            if _MISSING not in values:
+                for check, value in zip(self._checks, values):
+                    if not check(value):
+                        break
+                else:  # i.e. the row is valid
+                    continue
+
+            invalid_fields = tuple(
+                field for field, check, value in zip(self.fields, self._checks, values)
+                if value is _MISSING or not check(value)
+            )
+            failures.append(RowFailure(offset, invalid_fields))
+
+        return rows, failures
+
+    def _parse(self, record: bytes) -> Optional[List[Any]]:
+        """The values of the fields of the schema in a record, or None if it can not be parsed"""
+        try:
+            if self.spec.file_format == "jsonl":
+                row = self._decode_json(record.decode(self.spec.encoding))
+                if not isinstance(row, dict):
+                    return None
+
+                return [row.get(_, _MISSING) for _ in self.fields]
+
+            lines = [record.decode(self.spec.encoding)]
+            row = next(csv.reader(lines, delimiter=self.spec.delimiter))
+            return [row[_] if _ < len(row) else _MISSING for _ in self.spec.columns]
+        except (ValueError, csv.Error, StopIteration):  # i.e. invalid JSON, text or CSV
+            return None
+
+
+_worker: Optional[_Worker] = None
+
+
+def _initialize_worker(spec: _FileSpec, schema: Mapping[str, Any], max_items: Optional[int]):
+    global _worker
+    _worker = _Worker(spec, schema, max_items)
+
+
+def _validate_chunk(chunk: _Chunk) -> _ChunkResult:
+    return _worker.validate_chunk(*chunk)
@@ -0,0 +1,107 @@
+"""
+Validation of many values against the same refined type at once.
+
+The values of a numeric NumPy array are checked as values of the type that is refined, even
+if their dtype is another one: an integer array is checked as floats against 'Positive[float]',
+while a float array can not be checked against 'Positive[int]' without losing precision.
+"""
+
+import sys
+from typing import TYPE_CHECKING, Any, Iterable, List, Union
+
+from refined.validator import RefinedValidator
+
+if TYPE_CHECKING:
+    import numpy as np
+
+__all__ = ['validate_many']
+
+# dtype kinds of the NumPy arrays whose items are converted to the given Python type
+_DTYPE_KINDS = {
+    bool: "b",
+    int: "iu",
+    float: "f",
+    complex: "c",
+}
+
+# dtypes that the numeric NumPy arrays are cast to, to be checked against the given Python type
+_DTYPES = {
+    bool: "bool",
+    int: "int64",
+    float: "float64",
+    complex: "complex128",
+}
+
+
+def validate_many(refined_type: Union[Any, RefinedValidator], values: Iterable[Any],
+                  return_indices: bool = False) -> Union[List[bool], List[int], "np.ndarray"]:
+    """
+    Check many values against a refined type, or a validator for it. It returns a mask that
+    is True for the valid values or, if 'return_indices' is set, the indices of the invalid
+    values.
+
+    The predicates of the refined type are compiled once for all the values. NumPy arrays
+    whose dtype matches the refined type are checked in a single vectorized pass, when all
+    the predicates implement 'vectorized_type_guard'; in that case, a NumPy array is returned.
+    Numeric arrays of another dtype are cast to the one of the refined type first, and a
+    TypeError is raised if they can not be cast without losing precision
+    """
+    validator = refined_type if isinstance(refined_type, RefinedValidator) else \
+        RefinedValidator(refined_type)
+
+    # numpy is an optional dependency, only needed for the vectorized fast path, and the values
+    # can only be an array if it is already imported
+    numpy = sys.modules.get("numpy")
+
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        mask = _validate_array(validator, values)
+        return numpy.flatnonzero(~mask) if return_indices else mask
+
+    mask = [validator.is_valid(_) for _ in values]
+    if return_indices:
+        return [index for index, is_valid in enumerate(mask) if not is_valid]
+
+    return mask
+
+
+def _validate_array(validator: RefinedValidator, values: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    predicates, annotated_type = validator.predicates, validator.annotated_type
+
+    if not predicates:
+        return np.ones(values.shape, dtype=bool)
+
+    dtype_kinds = _DTYPE_KINDS.get(annotated_type, "") if isinstance(annotated_type, type) else ""
+
+    if dtype_kinds and values.dtype.kind not in dtype_kinds and values.dtype.kind in "biufc":
+        values = _cast_array(values, annotated_type)
+
+    is_vectorized = all(_.vectorized_type_guard is not None for _ in predicates)
+
+    if values.dtype.kind not in dtype_kinds or not is_vectorized:
+        # the items are converted to Python objects, as they would be seen by the decorator
+        mask = [validator.is_valid(_) for _ in values.ravel().tolist()]
+        return np.array(mask, dtype=bool).reshape(values.shape)
+
+    if not all(_.accepts(annotated_type) for _ in predicates):
+        return np.zeros(values.shape, dtype=bool)
+
+    mask = np.ones(values.shape, dtype=bool)
+    for predicate in predicates:
+        np.logical_and(mask, predicate.vectorized_type_guard(values), out=mask)
+
+    return mask
+
+
+def _cast_array(values: "np.ndarray", annotated_type: type) -> "np.ndarray":
+    """Cast a numeric array to the dtype of a refined type, as integers for 'Positive[float]'"""
+    import numpy as np
+
+    dtype = np.dtype(_DTYPES[annotated_type])
+
+    if not np.can_cast(values.dtype, dtype, casting="safe"):
+        raise TypeError(f"An array of {values.dtype} can not be checked as "
+                        f"{annotated_type.__qualname__} values without losing precision")
+
+    return values.astype(dtype)
@@ -0,0 +1,772 @@
+"""
+Generation of specialized wrappers for refined functions.
+
+Instead of a generic '*args, **kwargs' wrapper, the 'refined' decorator generates a wrapper
+with the exact parameter list of the function, in which the type guards of each refined
+parameter are called inline, as 'dataclasses' does for '__init__'. The generated source is
+kept in the '__refined_source__' attribute of the wrapper, and shows up in tracebacks.
+
+The wrapper is of the same kind as the function: a regular function, a coroutine function,
+a generator function or an async generator function. The arguments of generators are
+checked when they start running, that is, on their first iteration. The result of the
+function, which is the return value or each of the yielded items, can be checked too.
+"""
+
+import inspect
+import linecache
+from functools import partial
+from itertools import count
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, Generator, Iterator, List, Mapping, NamedTuple, Optional,
+    Set, Tuple, Union
+)
+
+from typing_extensions import get_args, get_origin
+
+from refined.instrumentation import make_function_recorder
+from refined.predicates import RefinementTypeException, RefinementViolation, EXPENSIVE_COST
+from refined.validator import RefinedValidator
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+__all__ = ['WrapperOptions', 'make_wrapper', 'make_setattr', 'make_schema_check', 'rebuild_wrapper']
+
+_POSITIONAL_KINDS = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+_VARIADIC_KINDS = (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+
+# the default of the refined parameters in the signature of the wrappers, see '_generate_signature'
+_UNSET = object()
+
+
+class WrapperOptions(NamedTuple):
+    """How a generated wrapper checks the arguments of its function"""
+    fail_fast: bool = False
+    sample_every: int = 1  # only one out of every 'sample_every' calls is checked
+    # True for the default executor of the event loop
+    executor: Union["Executor", bool, None] = None
+    # the checked calls are counted and timed, see 'refined.instrumentation'
+    instrument: bool = False
+    # True for the shared pool, see 'refined.parallel'
+    parallel: Union["Executor", bool, None] = None
+    parallel_min_size: int = 4096  # the smaller values are checked inline, instead of in the pool
+
+
+def make_wrapper(function: Callable, plan: Tuple[Any, ...], options: WrapperOptions,
+                 result_validator: Optional[RefinedValidator] = None) -> Callable:
+    """
+    Generate a wrapper that checks the parameters of a validation plan, and calls the
+    function. If a validator for its result is given, the return value of the function is
+    checked, or each of the items it yields if it is a generator function
+    """
+    source, namespace = _generate_source(function, plan, options, result_validator)
+    wrapper = _compile(function, source, namespace)
+    wrapper.__refined_source__ = source
+    return wrapper
+
+
+def rebuild_wrapper(wrapper: Callable, function: Callable, plan: Tuple[Any, ...],
+                    options: WrapperOptions, result_validator: Optional[RefinedValidator] = None):
+    """
+    Replace the code of a generated wrapper with the one for a new validation plan. The
+    wrapper keeps its identity, so the references to it that are already held stay valid
+    """
+    source, namespace = _generate_source(function, plan, options, result_validator)
+    new_wrapper = _compile(function, source, namespace)
+
+    wrapper.__globals__.clear()
+    wrapper.__globals__.update(new_wrapper.__globals__)
+    wrapper.__code__ = new_wrapper.__code__
+    wrapper.__defaults__ = new_wrapper.__defaults__
+    wrapper.__kwdefaults__ = new_wrapper.__kwdefaults__
+    wrapper.__refined_source__ = source
+
+
+def make_setattr(cls: type, plan: Tuple[Any, ...], options: WrapperOptions) -> Callable:
+    """
+    Generate a '__setattr__' method that checks the refined fields of a validation plan
+    when they are assigned, and then assigns them with the '__setattr__' of the class
+    """
+    namespace: Dict[str, Any] = {
+        "__refined_setattr": cls.__setattr__,
+        "__refined_type_of": type,
+        "__refined_violation": _make_violation_builder(plan),
+        "__refined_raise": _raise_violations,
+    }
+    options = options._replace(fail_fast=True)  # i.e. there is a single value to check
+    body = []
+
+    for index, refined_field in enumerate(plan):
+        if refined_field.validator._traversal is not None:
+            check = _generate_delegated_check(index, refined_field, None, namespace, options,
+                                              variable="value")
+        else:
+            check = _generate_check(index, refined_field, None, namespace, True, variable="value")
+
+        body.append(f"{'if' if index == 0 else 'elif'} name == {refined_field.name!r}:")
+        body.extend(f"    {_}" for _ in check or ["pass"])
+
+    body.append("__refined_setattr(self, name, value)")
+
+    source = "def __refined_wrapper(self, name, value):\n" + "".join(f"    {_}\n" for _ in body)
+    setattr_method = _compile(cls, source, namespace)
+    setattr_method.__name__ = "__setattr__"
+    setattr_method.__qualname__ = f"{cls.__qualname__}.__setattr__"
+    setattr_method.__refined_source__ = source
+    return setattr_method
+
+
+def make_schema_check(fields: Tuple[Any, ...], missing: Any, fail_fast: bool) -> Callable:
+    """
+    Generate the check of the fields of a schema, see 'refined.schema', over a mapping. It
+    returns the violations of a payload, or None if there is none, unless it fails fast, in
+    which case it raises at the first violation
+    """
+    plan: List[Any] = []
+    namespace: Dict[str, Any] = {
+        "__refined_type_of": type,
+        "__refined_is_instance": isinstance,
+        "__refined_dict": dict,
+        "__refined_mapping": Mapping,
+        "__refined_missing": missing,
+        # i.e. it reads the plan once it is filled
+        "__refined_violation": _make_violation_builder(plan),
+        "__refined_append": _append_violation,
+        "__refined_raise": _raise_field_violations,
+        "__refined_invalid_payload": _raise_invalid_payload,
+    }
+    options = WrapperOptions(fail_fast=fail_fast)
+
+    is_mapping = "__refined_type_of(payload) is __refined_dict or " \
+                 "__refined_is_instance(payload, __refined_mapping)"
+    body = [
+        f"if not ({is_mapping}):",
+        "    __refined_invalid_payload(payload)",
+        *([] if fail_fast else ["__refined_violations = None"]),
+        *_generate_field_checks(fields, "payload", plan, namespace, options, count()),
+        "return None" if fail_fast else "return __refined_violations",
+    ]
+
+    source = "def __refined_wrapper(payload):\n" + "".join(f"    {_}\n" for _ in body)
+    check = _compile(make_schema_check, source, namespace)
+    check.__refined_source__ = source
+    return check
+
+
+def _generate_field_checks(fields: Tuple[Any, ...], mapping: str, plan: List[Any],
+                           namespace: Dict[str, Any], options: WrapperOptions,
+                           variables: Iterator[int]) -> List[str]:
+    """
+    Generate the checks of the fields of a mapping, read from the variable with the given
+    name. The fields with their own fields are checked if their value is a mapping too, and
+    their other values, but for None if they are optional, are violations
+    """
+    lines = []
+
+    for field in fields:
+        variable = f"__refined_value_{next(variables)}"
+        lines.append(f"{variable} = {mapping}.get({field.key!r}, __refined_missing)")
+
+        if field.validator is None:
+            is_mapping = (f"__refined_type_of({variable}) is __refined_dict or "
+                          f"__refined_is_instance({variable}, __refined_mapping)")
+            nested_checks = _generate_field_checks(field.fields, variable, plan, namespace, options,
+                                                   variables)
+
+            not_mapping_violation = f"__refined_not_mapping_{len(namespace)}"
+            namespace[not_mapping_violation] = partial(RefinementViolation, field.name,
+                                                       field.type_hint, None)
+            # i.e. the missing value of a field that is required is reported before
+            conditions = [] if field.is_required else [f"{variable} is not __refined_missing"]
+            if field.is_optional:
+                conditions.append(f"{variable} is not None")
+
+            check = [
+                f"if {is_mapping}:",
+                *(f"    {_}" for _ in nested_checks),
+                f"elif {' and '.join(conditions)}:" if conditions else "else:",
+                "    " + _generate_field_violation(f"{not_mapping_violation}({variable})",
+                                                   options.fail_fast),
+            ]
+        else:
+            index = len(plan)
+            plan.append(field)
+
+            if field.validator._traversal is not None:
+                check = _generate_items_check(index, field, namespace, options, variable) or \
+                    _generate_delegated_check(index, field, None, namespace, options,
+                                              variable=variable)
+            else:
+                check = _generate_check(index, field, None, namespace, options.fail_fast,
+                                        variable=variable)
+
+        if not field.is_required:  # i.e. the missing value, of its own type, is not checked
+            lines.extend(check)
+            continue
+
+        missing_violation = f"__refined_missing_{len(namespace)}"
+        refined_type = _get_refined_type(field.type_hint)
+        namespace[missing_violation] = RefinementViolation(field.name, refined_type, None,
+                                                           namespace["__refined_missing"])
+        record_violation = _generate_field_violation(missing_violation, options.fail_fast)
+
+        lines.extend([f"if {variable} is __refined_missing:", f"    {record_violation}"])
+        if check:  # i.e. it continues the condition on the missing value, as 'elif'
+            lines.extend([f"el{check[0]}", *check[1:]])
+
+    return lines
+
+
+def _generate_field_violation(violation: str, fail_fast: bool) -> str:
+    """Generate the statement that records the violation of a field, or raises it"""
+    if fail_fast:
+        return f"__refined_raise([{violation}])"
+
+    return f"__refined_violations = __refined_append(__refined_violations, {violation})"
+
+
+def _generate_items_check(index: int, field: Any, namespace: Dict[str, Any],
+                          options: WrapperOptions, variable: str) -> Optional[List[str]]:
+    """
+    Generate the check of a container of refined items, as 'List[Positive[int]]', or of
+    refined values, as 'Dict[str, Positive[int]]', whose items of exactly the refined type are
+    checked inline. From the first item that is not, or that does not hold a predicate, the
+    container is checked by its validator, which reports the path to the violation. It is
+    None if the items can not be checked inline
+    """
+    validator = field.validator
+    item_validator = _get_item_validator(validator)
+
+    if item_validator is None:
+        return None
+
+    items = f"{variable}.values()" if validator.annotated_type is dict else variable
+
+    namespace[f"__refined_type_{index}"] = validator.annotated_type
+    namespace[f"__refined_item_type_{index}"] = item_validator.annotated_type
+    conditions = [f"__refined_type_of(__refined_item) is not __refined_item_type_{index}"]
+
+    for predicate_index, predicate in enumerate(item_validator.predicates):
+        namespace[f"__refined_guard_{index}_{predicate_index}"] = predicate.type_guard
+        conditions.append(f"not __refined_guard_{index}_{predicate_index}(__refined_item)")
+
+    dispatched_condition = _generate_condition(index, field, namespace, variable,
+                                               is_dispatched=True)
+    namespace[f"__refined_validate_{index}"] = validator.first_violation
+    delegation = _generate_delegation(f"__refined_validate_{index}({variable}, {field.name!r})",
+                                      options.fail_fast)
+
+    return [
+        f"if __refined_type_of({variable}) is __refined_type_{index}:",
+        f"    for __refined_item in {items}:",
+        f"        if {' or '.join(conditions)}:",
+        *(f"        {_}" for _ in delegation),
+        "            break",
+        f"elif {dispatched_condition}:",
+        *delegation,
+    ]
+
+
+def _get_item_validator(validator: RefinedValidator) -> Optional[RefinedValidator]:
+    """The validator of the items of a container type hint, if they can be checked inline"""
+    if validator.predicates or validator.max_items is not None:
+        return None
+
+    origin, args = get_origin(validator.refined_type), get_args(validator.refined_type)
+
+    if origin in (list, set, frozenset) and len(args) == 1:
+        item_validator = RefinedValidator(args[0])
+    elif origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+        item_validator = RefinedValidator(args[0])
+    elif origin is dict and len(args) == 2 and not RefinedValidator(args[0]).is_refined:
+        item_validator = RefinedValidator(args[1])
+    else:
+        return None
+
+    is_inline = item_validator.predicates and item_validator._traversal is None and \
+        item_validator._is_compatible
+    return item_validator if is_inline else None
+
+
+def _get_refined_type(type_hint: Any) -> Any:
+    """The type that a type hint refines, as 'str' in 'NonEmptyString', for reports of violations"""
+    return type_hint.__args__[0] if hasattr(type_hint, "__metadata__") else type_hint
+
+
+def _generate_source(function: Callable, plan: Tuple[Any, ...], options: WrapperOptions,
+                     result_validator: Optional[RefinedValidator]) -> Tuple[str, Dict[str, Any]]:
+    signature = inspect.signature(function)
+    parameters = list(signature.parameters.values())
+    is_async = inspect.iscoroutinefunction(function) or inspect.isasyncgenfunction(function)
+
+    namespace: Dict[str, Any] = {
+        "__refined_function": function,
+        "__refined_type_of": type,
+        "__refined_violation": _make_violation_builder(plan),
+        "__refined_append": _append_violation,
+        "__refined_raise": _raise_violations,
+        "__refined_unset": _UNSET,
+    }
+
+    refined_names = {_.name for _ in plan}
+    wrapper_signature, call_arguments = _generate_signature(parameters, namespace, refined_names)
+    checks, substitutions = [], []
+    positions = {_.name: position for position, _ in enumerate(parameters)}
+    concurrent_indices = _get_concurrent_indices(plan, options, is_async)
+
+    for index, refined_parameter in enumerate(plan):
+        position = positions[refined_parameter.name]
+        has_default = parameters[position].default is not inspect.Parameter.empty
+        default_position = position if has_default else None
+
+        if has_default:
+            substitutions.extend(_generate_substitution(refined_parameter.name, position))
+
+        if index in concurrent_indices:
+            # i.e. they are all checked at once, in place of the first one
+            if index == concurrent_indices[0]:
+                checks.extend(_generate_concurrent_check(concurrent_indices, plan, namespace,
+                                                         options))
+                for _ in concurrent_indices:
+                    if parameters[positions[plan[_].name]].default is not inspect.Parameter.empty:
+                        checks.extend(_generate_substitution(plan[_].name, positions[plan[_].name]))
+            continue
+
+        if is_async and options.executor and _is_expensive(refined_parameter.validator):
+            check = _generate_delegated_check(index, refined_parameter, default_position, namespace,
+                                              options, is_offloaded=True)
+        elif parameters[position].kind in _VARIADIC_KINDS:
+            # i.e. the arguments packed in '*args' or '**kwargs', which are checked one by one
+            check = _generate_items_check(index, refined_parameter, namespace, options,
+                                          refined_parameter.name) or \
+                _generate_delegated_check(index, refined_parameter, None, namespace, options)
+        elif refined_parameter.validator._traversal is not None:  # i.e. container items are checked
+            check = _generate_delegated_check(index, refined_parameter, default_position, namespace,
+                                              options)
+        else:
+            check = _generate_check(index, refined_parameter, default_position, namespace,
+                                    options.fail_fast)
+
+        checks.extend(check)
+
+    if checks and not options.fail_fast:
+        checks.insert(0, "__refined_violations = None")
+        checks.append("if __refined_violations is not None:")
+        checks.append("    __refined_raise(__refined_violations)")
+
+    if options.instrument:
+        namespace["__refined_clock"] = perf_counter
+        namespace["__refined_exception"] = RefinementTypeException
+        namespace["__refined_record"] = \
+            make_function_recorder(f"{function.__module__}.{function.__qualname__}")
+        checks = [
+            "__refined_started = __refined_clock()",
+            "try:",
+            *(f"    {_}" for _ in checks or ["pass"]),
+            "except __refined_exception:",
+            "    __refined_record(__refined_started, True)",
+            "    raise",
+            "__refined_record(__refined_started, False)",
+        ]
+
+    if options.sample_every > 1:
+        namespace["__refined_calls"] = count()
+        checks = [
+            f"__refined_is_sampled = next(__refined_calls) % {options.sample_every} == 0",
+            "if __refined_is_sampled:",
+            *(f"    {_}" for _ in checks),
+            *(["else:", *(f"    {_}" for _ in substitutions)] if substitutions else []),
+        ]
+
+    call = f"__refined_function({', '.join(call_arguments)})"
+    check_result = result_validator is not None
+
+    if check_result:
+        namespace["__refined_check_result"] = _make_result_check(function, result_validator)
+
+    def checked(result: str) -> str:
+        """The expression that checks a result of the function, if it is checked in this call"""
+        if not check_result:
+            return result
+        elif options.sample_every > 1:
+            return f"(__refined_check_result({result}) if __refined_is_sampled else {result})"
+        else:
+            return f"__refined_check_result({result})"
+
+    if inspect.isasyncgenfunction(function):
+        delegation = _generate_async_delegation(call, checked("__refined_item"))
+        definition, body = "async def", [*checks, *delegation]
+    elif inspect.iscoroutinefunction(function):
+        definition, body = "async def", [*checks, f"return {checked(f'await {call}')}"]
+    elif inspect.isgeneratorfunction(function):
+        if check_result:
+            namespace["__refined_check_yields"] = _check_yields
+            checked_call = f"__refined_check_yields({call}, __refined_check_result)"
+            call = checked_call if options.sample_every == 1 else \
+                f"({checked_call} if __refined_is_sampled else {call})"
+
+        definition, body = "def", [*checks, f"return (yield from {call})"]
+    else:
+        definition, body = "def", [*checks, f"return {checked(call)}"]
+
+    source = f"{definition} __refined_wrapper({', '.join(wrapper_signature)}):\n"
+    source += "".join(f"    {_}\n" for _ in body)
+    return source, namespace
+
+
+def _generate_signature(parameters: List[inspect.Parameter], namespace: Dict[str, Any],
+                        refined_names: Set[str]) -> Tuple[List[str], List[str]]:
+    """
+    Generate the parameter list of the wrapper, and the arguments to call the function with.
+    The default of a refined parameter is '_UNSET', which its check replaces with the actual
+    default, so that the default value is still checked when it is passed explicitly
+    """
+    signature, call_arguments, needs_keyword_only_marker = [], [], True
+    last_positional_only = max(
+        (position for position, _ in enumerate(parameters)
+         if _.kind is inspect.Parameter.POSITIONAL_ONLY),
+        default=None
+    )
+
+    for position, parameter in enumerate(parameters):
+        name, kind = parameter.name, parameter.kind
+
+        if kind is inspect.Parameter.KEYWORD_ONLY and needs_keyword_only_marker:
+            signature.append("*")
+            needs_keyword_only_marker = False
+
+        if kind is inspect.Parameter.VAR_POSITIONAL:
+            signature.append(f"*{name}")
+            call_arguments.append(f"*{name}")
+            needs_keyword_only_marker = False
+        elif kind is inspect.Parameter.VAR_KEYWORD:
+            signature.append(f"**{name}")
+            call_arguments.append(f"**{name}")
+        else:
+            if parameter.default is not inspect.Parameter.empty:
+                namespace[f"__refined_default_{position}"] = parameter.default
+                default = "__refined_unset" if name in refined_names else \
+                    f"__refined_default_{position}"
+                signature.append(f"{name}={default}")
+            else:
+                signature.append(name)
+
+            call_arguments.append(name if kind in _POSITIONAL_KINDS else f"{name}={name}")
+
+        if position == last_positional_only:
+            signature.append("/")
+
+    return signature, call_arguments
+
+
+def _generate_condition(index: int, refined_parameter: Any, namespace: Dict[str, Any], name: str,
+                        is_dispatched: bool = False) -> Optional[str]:
+    """
+    Generate the condition for an argument to be checked: it has exactly the annotated type.
+    It is None if no argument can have the annotated type, as for a 'Union'. If
+    'is_dispatched' is set, the condition is instead that the type of the argument matches
+    the refined type hint otherwise, as a subclass or a proven value, which its validator
+    checks, see 'refined.matching' and 'refined.proof'
+    """
+    validator = refined_parameter.validator
+
+    if is_dispatched:
+        namespace[f"__refined_is_checked_{index}"] = validator.is_checked
+        condition = f"__refined_is_checked_{index}(__refined_type_of({name}))"
+    elif isinstance(validator.annotated_type, type):
+        namespace[f"__refined_type_{index}"] = validator.annotated_type
+        condition = f"__refined_type_of({name}) is __refined_type_{index}"
+    else:
+        return None
+
+    return condition
+
+
+def _generate_substitution(name: str, position: int) -> List[str]:
+    """Generate the replacement of an argument that is not given with its default value"""
+    return [f"if {name} is __refined_unset:", f"    {name} = __refined_default_{position}"]
+
+
+def _with_substitution(check: List[str], name: str, default_position: Optional[int]) -> List[str]:
+    """
+    Prefix the check of an argument with the replacement of its default value, if it has one,
+    so that only a default value that is not given is left unchecked
+    """
+    if default_position is None:
+        return check
+
+    return [*_generate_substitution(name, default_position), f"el{check[0]}", *check[1:]]
+
+
+def _generate_check(index: int, refined_parameter: Any, default_position: Optional[int],
+                    namespace: Dict[str, Any], fail_fast: bool,
+                    variable: Optional[str] = None) -> List[str]:
+    """
+    Generate the check of a refined parameter: if the argument has exactly the annotated
+    type, its type guards are called in order, and the first one that does not hold is
+    recorded. Default values are only checked when they are passed, and the arguments of the
+    other types that match the refined type hint, as subclasses and proven values, are
+    delegated to the validator. The argument is read from the variable with the name of the
+    parameter, unless another one is given
+    """
+    validator, name = refined_parameter.validator, variable or refined_parameter.name
+    condition = _generate_condition(index, refined_parameter, namespace, name)
+    dispatched_condition = _generate_condition(index, refined_parameter, namespace, name,
+                                               is_dispatched=True)
+    namespace[f"__refined_validate_{index}"] = validator.first_violation
+    delegation = _generate_delegation(
+        f"__refined_validate_{index}({name}, {refined_parameter.name!r})", fail_fast
+    )
+
+    if condition is None:
+        return _with_substitution([f"if {dispatched_condition}:", *delegation], name,
+                                  default_position)
+
+    dispatched_check = [f"elif {dispatched_condition}:", *delegation]
+
+    def record_violation(predicate_index: int, indent: str) -> str:
+        if fail_fast:
+            violation = f"__refined_violation(None, {index}, {predicate_index}, {name})"
+            return f"{indent}__refined_raise({violation})"
+        else:
+            violation = \
+                f"__refined_violation(__refined_violations, {index}, {predicate_index}, {name})"
+            return f"{indent}__refined_violations = {violation}"
+
+    lines = [f"if {condition}:"]
+
+    if not validator._is_compatible:  # i.e. the predicates do not accept the annotated type
+        lines.append(record_violation(0, "    "))
+        return _with_substitution([*lines, *dispatched_check], name, default_position)
+
+    for predicate_index, predicate in enumerate(validator.predicates):
+        namespace[f"__refined_guard_{index}_{predicate_index}"] = predicate.type_guard
+
+        keyword = "if" if predicate_index == 0 else "elif"
+        lines.append(f"    {keyword} not __refined_guard_{index}_{predicate_index}({name}):")
+        lines.append(record_violation(predicate_index, "        "))
+
+    return _with_substitution([*lines, *dispatched_check], name, default_position)
+
+
+def _generate_delegated_check(index: int, refined_parameter: Any, default_position: Optional[int],
+                              namespace: Dict[str, Any], options: WrapperOptions,
+                              is_offloaded: bool = False,
+                              variable: Optional[str] = None) -> List[str]:
+    """
+    Generate the check of a refined parameter that is delegated to its validator, as for
+    containers whose items are checked. If it is offloaded, the validator of a parameter of
+    a coroutine runs in an executor, so that expensive predicates do not block the event loop
+    """
+    validator, parameter = refined_parameter.validator, refined_parameter.name
+    name = variable or parameter
+    condition = _generate_condition(index, refined_parameter, namespace, name)
+    dispatched_condition = _generate_condition(index, refined_parameter, namespace, name,
+                                               is_dispatched=True)
+
+    if is_offloaded:
+        executor = None if options.executor is True else options.executor
+        namespace[f"__refined_validate_{index}"] = partial(_offload_check, executor, validator)
+        find_violation = f"await __refined_validate_{index}({name}, {parameter!r})"
+    else:
+        namespace[f"__refined_validate_{index}"] = validator.first_violation
+        find_violation = f"__refined_validate_{index}({name}, {parameter!r})"
+
+    check = _generate_delegation(find_violation, options.fail_fast)
+
+    conditions = [dispatched_condition] if condition is None else [condition, dispatched_condition]
+    return _with_substitution([f"if {' or '.join(conditions)}:", *check], name, default_position)
+
+
+def _generate_concurrent_check(indices: List[int], plan: Tuple[Any, ...],
+                               namespace: Dict[str, Any], options: WrapperOptions) -> List[str]:
+    """
+    Generate the check of the refined parameters with expensive predicates, whose values are
+    checked at the same time, see 'refined.parallel'
+    """
+    from refined.parallel import ConcurrentCheck
+
+    # the arguments that are not given are '_UNSET', see '_generate_signature'
+    checked_parameters = [(plan[_].name, plan[_].validator, _UNSET) for _ in indices]
+    namespace["__refined_check_concurrently"] = ConcurrentCheck(
+        checked_parameters, options.parallel, options.parallel_min_size, options.fail_fast
+    )
+    namespace["__refined_extend"] = _extend_violations
+
+    if options.fail_fast:
+        record_violations = "__refined_raise(__refined_found)"
+    else:
+        record_violations = \
+            "__refined_violations = __refined_extend(__refined_violations, __refined_found)"
+
+    values = "".join(f"{plan[_].name}, " for _ in indices)
+    return [
+        f"__refined_found = __refined_check_concurrently(({values}))",
+        "if __refined_found is not None:",
+        f"    {record_violations}",
+    ]
+
+
+def _generate_delegation(find_violation: str, fail_fast: bool) -> List[str]:
+    """
+    Generate the body of a check that is delegated to a validator, with the call that finds
+    the violation
+    """
+    if fail_fast:
+        record_violation = "__refined_raise([__refined_found])"
+    else:
+        record_violation = \
+            "__refined_violations = __refined_append(__refined_violations, __refined_found)"
+
+    return [
+        f"    __refined_found = {find_violation}",
+        "    if __refined_found is not None:",
+        f"        {record_violation}",
+    ]
+
+
+def _generate_async_delegation(call: str, item: str) -> List[str]:
+    """
+    Generate the delegation to an async generator, which has no 'yield from': the values
+    sent to the wrapper and the exceptions thrown into it are passed to the generator. The
+    item expression may check each item before it is yielded
+    """
+    return [
+        f"__refined_generator = {call}",
+        "try:",
+        "    __refined_item = await __refined_generator.__anext__()",
+        "    while True:",
+        f"        __refined_item = {item}",
+        "        try:",
+        "            __refined_sent = yield __refined_item",
+        "        except GeneratorExit:",
+        "            raise",
+        "        except BaseException as __refined_exception:",
+        "            __refined_item = await __refined_generator.athrow(__refined_exception)",
+        "        else:",
+        "            __refined_item = await __refined_generator.asend(__refined_sent)",
+        "except StopAsyncIteration:",
+        "    return",
+        "finally:",
+        "    await __refined_generator.aclose()",
+    ]
+
+
+def _is_expensive(validator: RefinedValidator) -> bool:
+    return any(_.cost >= EXPENSIVE_COST for _ in validator.predicates)
+
+
+def _get_concurrent_indices(plan: Tuple[Any, ...], options: WrapperOptions,
+                            is_async: bool) -> List[int]:
+    """
+    The indices in a validation plan of the parameters that are checked at the same time: the
+    ones with expensive predicates, if there are at least two of them. The parameters of
+    coroutines are not, as waiting for the pool would block the event loop: they are
+    offloaded with 'executor' instead
+    """
+    if not options.parallel or is_async:
+        return []
+
+    indices = [index for index, _ in enumerate(plan) if _is_expensive(_.validator)]
+    return indices if len(indices) > 1 else []
+
+
+async def _offload_check(executor: Optional["Executor"], validator: RefinedValidator, value: Any,
+                         name: str) -> Optional[RefinementViolation]:
+    import asyncio  # a coroutine is running, so it is already imported
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, validator.first_violation, value, name)
+
+
+def _make_result_check(function: Callable, validator: RefinedValidator) -> Callable[[Any], Any]:
+    """Make the check of the results of a function: its return value, or the items it yields"""
+    is_generator = inspect.isgeneratorfunction(function) or inspect.isasyncgenfunction(function)
+    name, message = ("yield", "yielded value") if is_generator else ("return", "return value")
+    first_violation = validator.first_violation
+
+    def check_result(value: Any) -> Any:
+        violation = first_violation(value, name)
+
+        if violation is not None:
+            raise RefinementTypeException(f"Conditions do not hold for the {message}:",
+                                          violations=[violation])
+
+        return value
+
+    return check_result
+
+
+def _check_yields(generator: Generator, check: Callable[[Any], Any]) -> Generator:
+    """Delegate to a generator as 'yield from' does, checking each item that it yields"""
+    try:
+        item = next(generator)
+        while True:
+            item = check(item)
+            try:
+                sent = yield item
+            except GeneratorExit:
+                raise
+            except BaseException as exception:
+                item = generator.throw(exception)
+            else:
+                item = generator.send(sent)
+    except StopIteration as stop:
+        return stop.value
+    finally:
+        generator.close()
+
+
+def _make_violation_builder(plan: Tuple[Any, ...]) -> Callable[..., List[RefinementViolation]]:
+    def add_violation(violations: Optional[List[RefinementViolation]], index: int,
+                      predicate_index: int, value: Any) -> List[RefinementViolation]:
+        refined_parameter = plan[index]
+        refined_type = refined_parameter.type_hint.__args__[0]
+        predicate = refined_parameter.validator.predicates[predicate_index].predicate
+        violation = RefinementViolation(refined_parameter.name, refined_type, predicate, value)
+        return _append_violation(violations, violation)
+
+    return add_violation
+
+
+def _append_violation(violations: Optional[List[RefinementViolation]],
+                      violation: RefinementViolation) -> List[RefinementViolation]:
+    if violations is None:
+        return [violation]
+
+    violations.append(violation)
+    return violations
+
+
+def _extend_violations(violations: Optional[List[RefinementViolation]],
+                       found: List[RefinementViolation]) -> List[RefinementViolation]:
+    if violations is None:
+        return found
+
+    violations.extend(found)
+    return violations
+
+
+def _raise_violations(violations: List[RefinementViolation]):
+    raise RefinementTypeException("Conditions do not hold for the following parameters:",
+                                  violations=violations)
+
+
+def _raise_field_violations(violations: List[RefinementViolation]):
+    raise RefinementTypeException("Conditions do not hold for the following fields:",
+                                  violations=violations)
+
+
+def _raise_invalid_payload(payload: Any):
+    raise TypeError(f"A payload must be a mapping, not {type(payload).__qualname__!r}")
+
+
+def _compile(function: Callable, source: str, namespace: Dict[str, Any]) -> Callable:
+    name = f"{function.__module__}.{function.__qualname__}"
+    filename = f"<refined wrapper of {name} at {id(namespace):#x}>"
+    exec(compile(source, filename, "exec"), namespace)
+
+    # registering the source lets tracebacks and debuggers show the generated code
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    return namespace["__refined_wrapper"]
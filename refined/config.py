@@ -0,0 +1,78 @@
+"""
+Configuration of how the 'refined' decorator checks refined types.
+
+The mode is read when a function is decorated, not when it is called, so functions that are
+decorated while checks are disabled have no wrapper at all. It can be set globally with the
+environment variables 'REFINED_MODE' and 'REFINED_SAMPLE_EVERY', or with 'configure', either
+globally or for the functions defined in a given module or package. The same applies to
+instrumentation, set with 'REFINED_INSTRUMENT' or 'configure(instrument=True)'.
+"""
+
+import os
+from enum import Enum
+from typing import Dict, NamedTuple, Optional, Union
+
+__all__ = ['Mode', 'configure']
+
+
+class Mode(Enum):
+    ENABLED = "enabled"  # every call is checked
+    DISABLED = "disabled"  # the decorator returns the function untouched
+    SAMPLING = "sampling"  # one out of every 'sample_every' calls is checked
+
+
+class _Settings(NamedTuple):
+    mode: Mode
+    sample_every: int
+    instrument: bool = False  # see 'refined.instrumentation'
+
+
+def _settings_from_environment() -> _Settings:
+    mode = Mode(os.environ.get("REFINED_MODE", Mode.ENABLED.value).lower())
+    sample_every = int(os.environ.get("REFINED_SAMPLE_EVERY", 1))
+    instrument = os.environ.get("REFINED_INSTRUMENT", "").lower() in ("1", "true", "yes")
+    return _Settings(mode, sample_every, instrument)
+
+
+_global_settings = _settings_from_environment()
+_module_settings: Dict[str, _Settings] = {}
+
+
+def configure(mode: Union[Mode, str, None] = None, sample_every: Optional[int] = None,
+              module: Optional[str] = None, instrument: Optional[bool] = None):
+    """
+    Set the mode of the 'refined' decorator, how often calls are checked when sampling,
+    and whether the checks are instrumented, as read by 'refined.stats'. If a module is
+    given, e.g. 'my_service.handlers', the settings only apply to the functions defined in
+    that module, or in its submodules if it is a package.
+
+    Only the functions decorated after calling 'configure' are affected, so it should be
+    called before the modules with refined functions are imported
+    """
+    global _global_settings
+
+    if sample_every is not None and (not isinstance(sample_every, int) or sample_every < 1):
+        raise ValueError(f"'sample_every' must be a positive integer, not {sample_every!r}")
+
+    current_settings = _global_settings if module is None else get_settings(module)
+    settings = _Settings(
+        Mode(mode) if mode is not None else current_settings.mode,
+        sample_every if sample_every is not None else current_settings.sample_every,
+        instrument if instrument is not None else current_settings.instrument
+    )
+
+    if module is None:
+        _global_settings = settings
+    else:
+        _module_settings[module] = settings
+
+
+def get_settings(module: Optional[str]) -> _Settings:
+    """Get the settings for the functions of a module, falling back to its packages"""
+    while module:
+        if module in _module_settings:
+            return _module_settings[module]
+
+        module, _, _ = module.rpartition(".")
+
+    return _global_settings
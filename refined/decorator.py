@@ -1,23 +1,53 @@
-import os
-from functools import wraps
-
-from typing import Dict, Union, TypeVar, Any, Callable, Tuple
-from typing_extensions import Annotated, TypeGuard
-
-from refined.predicates import RefinementPredicate, RefinementTypeException
+import collections.abc
+import inspect
+from functools import wraps, partial, update_wrapper
+from itertools import count
+from time import perf_counter
+from types import FunctionType
+
+from typing import (
+    TYPE_CHECKING, Dict, FrozenSet, Union, TypeVar, Any, Callable, Tuple, NamedTuple, Optional
+)
+from typing_extensions import get_args, get_origin, get_type_hints
+
+from refined.codegen import (
+    WrapperOptions,
+    make_setattr,
+    make_wrapper,
+    rebuild_wrapper,
+    _make_result_check
+)
+from refined.config import Mode, get_settings
+from refined.instrumentation import make_function_recorder
+from refined.predicates import RefinementTypeException
+from refined.validator import RefinedValidator
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
 # Type variable to annotate decorators that take a function,
 # and return a function with the same signature.
 F = TypeVar("F", bound=Callable)
-_T = TypeVar("_T", bound=Any)
-
-_ANNOTATION_TYPE = type(Annotated[None, Callable[[None], TypeGuard[None]]])
-_TYPEGUARD_TYPE = type(TypeGuard[None])
-
-_ERROR_TEMPLATE = "For parameter {} with refined type {}, {} is not a valid value"
 
-
-def refined(function: F) -> F:
+# origins of the return annotations whose first argument is the type of the yielded items
+_ITERATOR_ORIGINS = (
+    collections.abc.Generator,
+    collections.abc.Iterator,
+    collections.abc.Iterable,
+    collections.abc.AsyncGenerator,
+    collections.abc.AsyncIterator,
+    collections.abc.AsyncIterable,
+)
+
+_POSITIONAL_KINDS = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+_KEYWORD_KINDS = (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+
+
+def refined(function: Optional[F] = None, *, fail_fast: bool = False, validate_return: bool = True,
+            validate_yields: bool = False, max_items: Optional[int] = None,
+            executor: Union["Executor", bool, None] = None,
+            validate_assignment: bool = False, parallel: Union["Executor", bool, None] = None,
+            parallel_min_size: int = 4096) -> Union[F, Callable[[F], F]]:
     """
     A decorator to check if the values for parameters with refined type hints hold the
     conditions.
@@ -25,107 +55,312 @@ def refined(function: F) -> F:
     A refined type hint is of the form 'Annotated[_T, *_Ts]' where '_T' is a type hint,
     and '_Ts' is a sequence of predicates; predicates are generic classes that inherit
     from the RefinementPredicate base class, and have a 'type_guard' method that returns
-    a type guard
+    a type guard.
+
+    The signature of the function is resolved once, at decoration time, into a validation
+    plan that only holds the parameters with refined type hints. If the annotations of
+    the function change afterwards, call 'rebuild_validation_plan' on the decorated
+    function to compile the plan again.
+
+    Refined types nested in containers, as in 'List[Positive[int]]', are checked item by
+    item, and so is the return value, unless 'validate_return' is False. To bound the cost of
+    checking huge containers, 'max_items' limits how many items of each container are
+    checked, as in 'RefinedValidator'.
+
+    By default, every parameter is checked and all the violations are reported. With
+    'fail_fast', as in '@refined(fail_fast=True)', the check stops at the first violation.
+    The message of the exception raised is only formatted when it is converted to a string.
+
+    The wrapper is generated for each function, with its exact parameter list and the type
+    guards of its refined parameters called inline; its source is kept in the
+    '__refined_source__' attribute of the decorated function.
+
+    Coroutine functions, generator functions and async generator functions get a wrapper
+    of the same kind; the arguments of generators are checked on their first iteration.
+    With 'validate_yields', the items yielded by a generator are checked one by one, as
+    they are consumed, against the refined type of its return annotation, e.g.
+    'Iterator[Positive[int]]'. With 'executor', the parameters of coroutines that have
+    expensive predicates (those with a cost of at least 'EXPENSIVE_COST', as 'Xml') are
+    checked in an executor, or in the default one of the event loop if it is True. With
+    'parallel', the parameters of other functions that have expensive predicates are checked
+    at the same time, if there are at least two of them, in a given executor or in a pool
+    shared by the refined functions if it is True; their values smaller than
+    'parallel_min_size' are checked inline, see 'refined.parallel'.
+
+    Classes can be decorated too, e.g. dataclasses, 'NamedTuple's and classes with '__slots__':
+    the refined type hints of their fields are checked by a wrapper generated for their
+    '__init__' (or '__new__' for named tuples), as if they were its parameters. With
+    'validate_assignment', the fields are checked by a generated '__setattr__' instead, so
+    that assigning them after construction is checked too.
+
+    The mode set with 'refined.configure' for the module of the function is applied here:
+    if checks are disabled, the function is returned untouched, and if they are sampled,
+    only one out of every 'sample_every' calls is checked. So is instrumentation: if it is
+    enabled, the checked calls of the function and its predicates are counted and timed
     """
-    @wraps(function)
-    def with_refined_types(*args, **kwargs):
-        type_hints = function.__annotations__
-        _check_refined_type_hints(type_hints, args, kwargs)
+    if function is None:
+        return partial(refined, fail_fast=fail_fast, validate_return=validate_return,
+                       validate_yields=validate_yields, max_items=max_items, executor=executor,
+                       validate_assignment=validate_assignment, parallel=parallel,
+                       parallel_min_size=parallel_min_size)
+
+    settings = get_settings(getattr(function, "__module__", None))
+
+    if settings.mode is Mode.DISABLED:
+        return function
+
+    instrument = settings.instrument
+    sample_every = settings.sample_every if settings.mode is Mode.SAMPLING else 1
+    options = WrapperOptions(fail_fast, sample_every, executor, instrument, parallel,
+                             parallel_min_size)
+
+    if inspect.isclass(function):
+        return _refine_class(function, options, max_items, validate_assignment)
+
+    plan = _compile_validation_plan(function, max_items, instrument)
+    result_validator = _compile_result_validator(function, validate_return, validate_yields,
+                                                 max_items, instrument)
+    record_call = make_function_recorder(_get_qualified_name(function)) if instrument else None
+    check_result = None
+
+    if not inspect.isfunction(function):  # i.e. its signature can not be reproduced
+        calls = count()
+        check_result = _get_result_check(function, result_validator)
+
+        @wraps(function)
+        def with_refined_types(*args, **kwargs):
+            if next(calls) % sample_every != 0:
+                return function(*args, **kwargs)
+
+            if plan:
+                if record_call is None:
+                    _check_refined_type_hints(plan, args, kwargs, fail_fast)
+                else:
+                    _check_instrumented(record_call, plan, args, kwargs, fail_fast)
+
+            result = function(*args, **kwargs)
+            return result if check_result is None else check_result(result)
+    else:
+        wrapper = make_wrapper(function, plan, options, result_validator)
+        with_refined_types = update_wrapper(wrapper, function)
+
+    def rebuild_validation_plan() -> Tuple["_RefinedParameter", ...]:
+        nonlocal plan, result_validator, check_result
+        plan = _compile_validation_plan(function, max_items, instrument)
+        result_validator = _compile_result_validator(function, validate_return, validate_yields,
+                                                     max_items, instrument)
+        with_refined_types.__refined_plan__ = plan
+
+        if hasattr(with_refined_types, "__refined_source__"):
+            rebuild_wrapper(with_refined_types, function, plan, options, result_validator)
+        else:
+            check_result = _get_result_check(function, result_validator)
+
+        return plan
+
+    with_refined_types.__refined_plan__ = plan
+    with_refined_types.rebuild_validation_plan = rebuild_validation_plan
+    return with_refined_types
 
-        return function(*args, **kwargs)
 
-    return with_refined_types
+class _RefinedParameter(NamedTuple):
+    """A parameter with a refined type hint, as compiled in a validation plan"""
+    name: str
+    position: Optional[int]  # index in the positional arguments, if any, or the first of '*args'
+    type_hint: Any
+    validator: RefinedValidator
+    kind: Any = inspect.Parameter.POSITIONAL_OR_KEYWORD
+    # for '**kwargs', the names of the keyword arguments that are not packed in it
+    keywords: FrozenSet[str] = frozenset()
 
 
-def _check_refined_type_hints(type_hints: Dict[str, Any], args: Tuple[Any, ...],
-                              kwargs: Dict[str, Any]):
-    """Check if the given arguments for the refined type hints fulfill the conditions"""
+def _compile_validation_plan(function: Callable, max_items: Optional[int] = None,
+                             instrument: bool = False) -> Tuple[_RefinedParameter, ...]:
+    """
+    Resolve the signature of a function and keep only the parameters that have a
+    refined type hint, or a container type hint with refined items, along with a
+    compiled validator for each one. The type hints of '*args' and '**kwargs' apply to each
+    of their arguments, so they are checked as the tuple and the dict that pack them
+    """
+    plan = []
+    parameters = inspect.signature(function).parameters.values()
+    keywords = frozenset(_.name for _ in parameters if _.kind in _KEYWORD_KINDS)
 
-    num_args, errors, parameters_with_types = len(args), [], list(type_hints.items())
-    # assuming that parameters are in order
-    args_parameters = parameters_with_types[:num_args]
+    for position, parameter in enumerate(parameters):
+        type_hint, kind = parameter.annotation, parameter.kind
 
-    for argument, (argument_parameter, type_hint) in zip(args, args_parameters):
-        if _is_invalid_type(argument, type_hint):
-            refined_type = type_hint.__args__[0]
-            errors.append(
-                _ERROR_TEMPLATE.format(argument_parameter, refined_type, argument)
-            )
+        if type_hint is inspect.Parameter.empty:
+            continue
 
-    for parameter, type_hint in parameters_with_types[num_args:]:
-        if parameter in kwargs and _is_invalid_type(kwargs[parameter], type_hint):
-            refined_type = type_hint.__args__[0]
-            errors.append(
-                _ERROR_TEMPLATE.format(parameter, refined_type, kwargs[parameter])
-            )
+        if kind is inspect.Parameter.VAR_POSITIONAL:
+            type_hint = Tuple[type_hint, ...]
+        elif kind is inspect.Parameter.VAR_KEYWORD:
+            type_hint = Dict[str, type_hint]
 
-    if errors:
-        error_message = "Conditions do not hold for the following parameters:"
-        errors_as_str = os.linesep.join([os.linesep, *errors])
-        raise RefinementTypeException(error_message + errors_as_str)
+        validator = RefinedValidator(type_hint, max_items, instrument, strict=False)
+        if validator.is_refined:
+            is_positional = kind in _POSITIONAL_KINDS or kind is inspect.Parameter.VAR_POSITIONAL
+            index = position if is_positional else None
+            other_keywords = keywords if kind is inspect.Parameter.VAR_KEYWORD else frozenset()
+            plan.append(_RefinedParameter(parameter.name, index, type_hint, validator, kind,
+                                          other_keywords))
 
+    return tuple(plan)
 
-def _is_invalid_type(argument: _T, type_hint: Union[_ANNOTATION_TYPE, Any]) -> TypeGuard[_ANNOTATION_TYPE]:
+
+def _refine_class(cls: type, options: WrapperOptions, max_items: Optional[int],
+                  validate_assignment: bool) -> type:
     """
-    The type of an argument is invalid if the argument has a refinement type hint, and
-    at least one type guard condition holds false. Predicates are evaluated in order
+    Install the checks of the refined fields of a class: in a wrapper of its constructor
+    that has the field type hints as parameter annotations or, if assignments are validated,
+    in its '__setattr__'. The class itself is returned, as for 'dataclass'
     """
-    if _is_annotated_with_type(argument, type_hint):
-        for predicate in (_ for _ in type_hint.__metadata__ if _is_refinement_predicate(_)):
-            return _is_invalid_predicate(argument, predicate)
+    field_type_hints = _get_field_type_hints(cls)
+    is_named_tuple = issubclass(cls, tuple) and hasattr(cls, "_fields")
+    dataclass_params = getattr(cls, "__dataclass_params__", None)
+    is_frozen = is_named_tuple or getattr(dataclass_params, "frozen", False)
+    plan: Tuple[_RefinedParameter, ...] = ()
+
+    if validate_assignment and not is_frozen:
+        fields = (_compile_field(name, type_hint, max_items, options.instrument)
+                  for name, type_hint in field_type_hints.items())
+        plan = tuple(_ for _ in fields if _ is not None)
+
+        if plan:
+            cls.__setattr__ = make_setattr(cls, plan, options)
+    else:
+        constructor_name = "__new__" if is_named_tuple else "__init__"
+        constructor = getattr(cls, constructor_name)
+
+        # i.e. not the constructor of 'object' or of a built-in type
+        if inspect.isfunction(constructor):
+            annotated_constructor = _with_field_annotations(constructor, field_type_hints)
+            plan = _compile_validation_plan(annotated_constructor, max_items, options.instrument)
+
+            if plan:
+                wrapper = make_wrapper(annotated_constructor, plan, options)
+                setattr(cls, constructor_name, update_wrapper(wrapper, constructor))
 
-    return False
+    cls.__refined_plan__ = plan
+    return cls
 
 
-def _is_annotated_with_type(argument: _T, type_hint: Union[_ANNOTATION_TYPE, Any]) -> TypeGuard[_ANNOTATION_TYPE]:
+def _compile_field(name: str, type_hint: Any, max_items: Optional[int],
+                   instrument: bool) -> Optional[_RefinedParameter]:
+    validator = RefinedValidator(type_hint, max_items, instrument, strict=False)
+    return _RefinedParameter(name, None, type_hint, validator) if validator.is_refined else None
+
+
+def _get_field_type_hints(cls: type) -> Dict[str, Any]:
+    """The type hints of the fields of a class and its bases, resolving forward references"""
+    try:
+        return get_type_hints(cls, include_extras=True)
+    except Exception:  # i.e. unresolvable forward references
+        return {}
+
+
+def _with_field_annotations(constructor: Callable, field_type_hints: Dict[str, Any]) -> Callable:
     """
-    An argument is correctly annotated if it has an 'Annotated' type hint whose first
-    argument is of type '_T'
+    Copy a constructor with the type hints of the fields as the annotations of the parameters
+    with the same names, unless they have their own annotations
     """
-    if type(type_hint) is _ANNOTATION_TYPE and len(type_hint.__args__) > 0:
-        argument_type, type_hint_input = type(argument), type_hint.__args__[0]
+    try:
+        parameter_type_hints = get_type_hints(constructor, include_extras=True)
+    except Exception:
+        parameter_type_hints = {}
+
+    parameters = list(inspect.signature(constructor).parameters)
+    annotations = {
+        name: parameter_type_hints.get(name, field_type_hints.get(name))
+        for name in parameters if name in parameter_type_hints or name in field_type_hints
+    }
+
+    copy = FunctionType(constructor.__code__, constructor.__globals__, constructor.__name__,
+                        constructor.__defaults__, constructor.__closure__)
+    copy.__kwdefaults__, copy.__annotations__ = constructor.__kwdefaults__, annotations
+    copy.__module__, copy.__qualname__ = constructor.__module__, constructor.__qualname__
+    return copy
+
+
+def _compile_result_validator(function: Callable, validate_return: bool, validate_yields: bool,
+                              max_items: Optional[int] = None,
+                              instrument: bool = False) -> Optional[RefinedValidator]:
+    """
+    Compile the validator for the results of a function, if they have a refined type: its
+    return value, or the items it yields if it is a generator function, as annotated with
+    e.g. 'Iterator[Positive[int]]'
+    """
+    try:
+        return_annotation = inspect.signature(function).return_annotation
+    except (TypeError, ValueError):  # i.e. the callable has no signature
+        return None
 
-        if hasattr(type_hint_input, "__origin__"):  # i.e. a generic collection type (List, Tuple, etc.)
-            return argument_type is type_hint_input.__origin__
-        elif isinstance(type_hint_input, (list, dict, tuple, set)):  # i.e. a built-in collection type
-            return argument_type is type_hint_input
-        else:  # i.e. a raw type (str, int, float, bytes, ...)
-            return argument_type is type_hint_input
+    if inspect.isgeneratorfunction(function) or inspect.isasyncgenfunction(function):
+        if not validate_yields or get_origin(return_annotation) not in _ITERATOR_ORIGINS:
+            return None
 
+        result_type = get_args(return_annotation)[0] if get_args(return_annotation) else None
+    elif validate_return and return_annotation is not inspect.Signature.empty:
+        result_type = return_annotation
+    else:
+        return None
 
-def _is_refinement_predicate(metadata: Any) -> TypeGuard[RefinementPredicate]:
-    return hasattr(metadata, "type_guard")
+    validator = RefinedValidator(result_type, max_items, instrument, strict=False)
+    return validator if validator.is_refined else None
 
 
-def _is_invalid_predicate(argument: _T, predicate: RefinementPredicate) -> bool:
-    return not (_does_predicate_inherit_from_base(argument, predicate) and
-                _condition_holds(argument, predicate))
+def _get_result_check(function: Callable,
+                      result_validator: Optional[RefinedValidator]) -> Optional[Callable]:
+    return None if result_validator is None else _make_result_check(function, result_validator)
 
 
-def _does_predicate_inherit_from_base(argument: _T,
-                                      predicate: RefinementPredicate) -> TypeGuard[_TYPEGUARD_TYPE]:
-    """
-    Check if a refinement predicate is a class that inherits from the
-    RefinementPredicate base class, with a bounded type '_B', and for its 'type_guard' method:
+def _get_qualified_name(function: Callable) -> str:
+    module = getattr(function, "__module__", None)
+    name = getattr(function, "__qualname__", None) or type(function).__qualname__
+    return f"{module}.{name}" if module else name
 
-     * Its inputs are a bounded by '_B'
-     * Its output is a type guard of type '_B'
-    """
-    argument_type = type(argument)
-    parameter_types = predicate.type_guard.__annotations__
-    return_type = parameter_types.pop("return", None)
-    input_type = parameter_types.pop("value", None)
 
-    if return_type and type(return_type) is _TYPEGUARD_TYPE and hasattr(return_type.__args__[0], "__bound__"):
-        type_guard_bound = return_type.__args__[0].__bound__
+def _check_instrumented(record_call: Callable[[float, bool], None],
+                        plan: Tuple[_RefinedParameter, ...], args: Tuple[Any, ...],
+                        kwargs: Dict[str, Any], fail_fast: bool = False):
+    started = perf_counter()
+
+    try:
+        _check_refined_type_hints(plan, args, kwargs, fail_fast)
+    except RefinementTypeException:
+        record_call(started, True)
+        raise
+
+    record_call(started, False)
+
+
+def _check_refined_type_hints(plan: Tuple[_RefinedParameter, ...], args: Tuple[Any, ...],
+                              kwargs: Dict[str, Any], fail_fast: bool = False):
+    """Check if the given arguments for the refined type hints fulfill the conditions"""
+
+    num_args, violations = len(args), []
+
+    for parameter in plan:
+        position = parameter.position
 
-        if issubclass(argument_type, type_guard_bound) and input_type and hasattr(input_type, "__bound__"):
-            type_guard_input_bound = input_type.__bound__
-            return issubclass(argument_type, type_guard_input_bound)
+        if parameter.kind is inspect.Parameter.VAR_POSITIONAL:
+            argument = args[position:]
+        elif parameter.kind is inspect.Parameter.VAR_KEYWORD:
+            argument = {_: kwargs[_] for _ in kwargs if _ not in parameter.keywords}
+        elif position is not None and position < num_args:
+            argument = args[position]
+        elif parameter.name in kwargs:
+            argument = kwargs[parameter.name]
+        else:  # i.e. the default value is used
+            continue
 
-    return False
+        violation = parameter.validator.first_violation(argument, parameter.name)
+        if violation is not None:
+            violations.append(violation)
 
+            if fail_fast:
+                break
 
-def _condition_holds(argument: _T, predicate: RefinementPredicate) -> TypeGuard[_T]:
-    """Checks if the type predicate is true"""
-    return predicate.type_guard(argument)
+    if violations:
+        raise RefinementTypeException("Conditions do not hold for the following parameters:",
+                                      violations=violations)
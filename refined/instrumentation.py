@@ -0,0 +1,148 @@
+"""
+Instrumentation of refined functions and predicates.
+
+When instrumentation is enabled with 'refined.configure(instrument=True)', the functions
+decorated afterwards count their checked calls, how many of them are rejected, and how long
+their checks take; so do the predicates of their refined types, which are named after their
+class, e.g. 'refined.predicates.numeric.PositivePredicate'.
+
+The counters are read with 'stats', and every measurement can also be forwarded to a callback
+set with 'set_stats_callback', e.g. to export it to a metrics system. Functions decorated while
+instrumentation is disabled are not instrumented at all, so they do not pay for it.
+"""
+
+from collections import deque
+from time import perf_counter
+from typing import Any, Callable, Deque, Dict, NamedTuple, Optional
+from typing_extensions import get_origin
+
+from refined.predicates import BoundPredicate
+
+__all__ = ['Stats', 'stats', 'reset_stats', 'set_stats_callback']
+
+# the number of most recent durations kept to estimate the percentiles of each counter
+_SAMPLE_SIZE = 1024
+
+StatsCallback = Callable[[str, str, float, bool], None]
+
+
+class Stats(NamedTuple):
+    """A snapshot of the counters of a function or a predicate. Times are in seconds"""
+    calls: int
+    failures: int
+    failure_rate: float
+    total_time: float
+    p50: float
+    p90: float
+    p99: float
+
+
+class _Counters:
+    __slots__ = ('calls', 'failures', 'total_time', 'durations')
+
+    def __init__(self):
+        self.calls, self.failures, self.total_time = 0, 0, 0.0
+        self.durations: Deque[float] = deque(maxlen=_SAMPLE_SIZE)
+
+    def record(self, duration: float, failed: bool):
+        self.calls += 1
+        self.failures += failed
+        self.total_time += duration
+        self.durations.append(duration)
+
+    def snapshot(self) -> Stats:
+        durations = sorted(self.durations)
+        p50, p90, p99 = (_percentile(durations, _) for _ in (0.5, 0.9, 0.99))
+        failure_rate = self.failures / self.calls if self.calls else 0.0
+        return Stats(self.calls, self.failures, failure_rate, self.total_time, p50, p90, p99)
+
+
+_function_counters: Dict[str, _Counters] = {}
+_predicate_counters: Dict[str, _Counters] = {}
+_callback: Optional[StatsCallback] = None
+
+
+def stats() -> Dict[str, Dict[str, Stats]]:
+    """
+    Take a snapshot of the counters of the instrumented functions and predicates that have
+    been called since they were reset, as in '{"functions": {"my_module.handler": Stats(...)},
+    "predicates": {"refined.predicates.numeric.PositivePredicate": Stats(...)}}'
+    """
+    return {
+        "functions": {
+            name: _.snapshot() for name, _ in list(_function_counters.items()) if _.calls
+        },
+        "predicates": {
+            name: _.snapshot() for name, _ in list(_predicate_counters.items()) if _.calls
+        },
+    }
+
+
+def reset_stats():
+    """Reset the counters of every instrumented function and predicate to zero"""
+    for counters in [*_function_counters.values(), *_predicate_counters.values()]:
+        counters.__init__()
+
+
+def set_stats_callback(callback: Optional[StatsCallback]):
+    """
+    Set a callback that receives every measurement, as 'callback(kind, name, duration,
+    failed)', where 'kind' is either 'function' or 'predicate'. It is called synchronously,
+    so it should only hand the measurement over, e.g. to a metrics client
+    """
+    global _callback
+    _callback = callback
+
+
+def instrument_type_guard(predicate: Any, type_guard: Callable[..., bool]) -> Callable[..., bool]:
+    """Wrap a type guard so that its calls, failures and time are counted for its predicate"""
+    name = _get_predicate_name(predicate)
+    counters = _predicate_counters.setdefault(name, _Counters())
+
+    def instrumented_type_guard(value: Any, *args: Any, **kwargs: Any) -> bool:
+        started = perf_counter()
+        result = type_guard(value, *args, **kwargs)
+        _record(counters, "predicate", name, perf_counter() - started, not result)
+        return result
+
+    return instrumented_type_guard
+
+
+def make_function_recorder(name: str) -> Callable[[float, bool], None]:
+    """Make the function that records a checked call of an instrumented function"""
+    counters = _function_counters.setdefault(name, _Counters())
+
+    def record_call(started: float, failed: bool):
+        _record(counters, "function", name, perf_counter() - started, failed)
+
+    return record_call
+
+
+def _record(counters: _Counters, kind: str, name: str, duration: float, failed: bool):
+    counters.record(duration, failed)
+
+    if _callback is not None:
+        _callback(kind, name, duration, failed)
+
+
+def _get_predicate_name(predicate: Any) -> str:
+    """
+    The name of a predicate class, e.g. 'refined.predicates.numeric.PositivePredicate', without
+    its type parameters, which are not resolved in refined type aliases. Bound predicates keep
+    their parameters, as in 'refined.predicates.numeric.Greater[10]'
+    """
+    if isinstance(predicate, BoundPredicate):
+        return repr(predicate)
+
+    predicate_class = get_origin(predicate) or predicate
+    if not isinstance(predicate_class, type):
+        return repr(predicate)
+
+    return f"{predicate_class.__module__}.{predicate_class.__qualname__}"
+
+
+def _percentile(sorted_durations: list, fraction: float) -> float:
+    if not sorted_durations:
+        return 0.0
+
+    return sorted_durations[min(len(sorted_durations) - 1, int(fraction * len(sorted_durations)))]
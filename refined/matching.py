@@ -0,0 +1,67 @@
+"""
+Matching of the types of values with the types that refined type hints refine.
+
+A refined type hint applies to the values of its type and of the subclasses of that type,
+e.g. 'bool' for 'int' or 'OrderedDict' for 'Dict[str, int]'. The type can also be an abstract
+base class, as 'Sequence[int]', 'Mapping[str, int]' or 'numbers.Real', a 'Union' or an
+'Optional' of types, a type variable, which matches its bound or its constraints, or 'Any'.
+
+The verdict for each pair of a value type and a type hint is memoized in a bounded cache, so
+that matching a value costs a dictionary lookup once its type has been seen.
+"""
+
+import types
+from functools import lru_cache
+from typing import Any, TypeVar, Union
+from typing_extensions import Annotated, get_args, get_origin
+
+__all__ = ['is_matching_type']
+
+# the number of pairs of a value type and a type hint whose verdicts are kept
+MATCH_CACHE_SIZE = 1024
+
+# the origin of unions written as 'int | None', since Python 3.10
+_UNION_TYPE = getattr(types, "UnionType", Union)
+
+
+def is_matching_type(value_type: type, type_hint: Any) -> bool:
+    """Check if the values of a type are instances of a type hint, e.g. 'bool' of 'Optional[int]'"""
+    try:
+        return _is_matching_type(value_type, type_hint)
+    except TypeError:  # i.e. the type hint is not hashable, as a 'Literal' of a list
+        return _match(value_type, type_hint)
+
+
+@lru_cache(maxsize=MATCH_CACHE_SIZE)
+def _is_matching_type(value_type: type, type_hint: Any) -> bool:
+    return _match(value_type, type_hint)
+
+
+def _match(value_type: type, type_hint: Any) -> bool:
+    if type_hint is Any or type_hint is object:
+        return True
+
+    if isinstance(type_hint, TypeVar):
+        if type_hint.__constraints__:
+            return any(_match(value_type, _) for _ in type_hint.__constraints__)
+
+        return type_hint.__bound__ is None or _match(value_type, type_hint.__bound__)
+
+    if type_hint is None:
+        return value_type is type(None)
+
+    origin = get_origin(type_hint)
+    if origin is Union or origin is _UNION_TYPE:
+        return any(_match(value_type, _) for _ in get_args(type_hint))
+    elif origin is Annotated:  # i.e. a refined type, as in 'Optional[Positive[int]]'
+        return _match(value_type, type_hint.__origin__)
+    elif origin is not None:  # i.e. a generic type, as 'List[int]' or 'Sequence[str]'
+        type_hint = origin
+
+    if not isinstance(type_hint, type):  # i.e. a special form that no type matches, as 'Literal'
+        return False
+
+    try:
+        return issubclass(value_type, type_hint)
+    except TypeError:  # i.e. a protocol that can not be checked at runtime
+        return False
@@ -0,0 +1,154 @@
+"""
+Concurrent checks of the parameters of a function that have expensive predicates.
+
+With '@refined(parallel=True)', or with an executor, the parameters whose predicates have a
+cost of at least 'EXPENSIVE_COST', as two 'XmlString' and a 'CsvString', are checked at the
+same time: all of their values but one are checked in a pool, while the caller checks the
+last one. The values smaller than 'parallel_min_size', as measured by 'len', are checked by
+the caller, as the pool would cost more than the check itself, and so are all of them if
+fewer than two values are large enough.
+
+The default pool is a thread pool shared by all the refined functions, bounded as the
+default 'ThreadPoolExecutor'. Threads only check values at the same time if the predicates
+release the GIL, or on a free-threaded build of Python; for pure Python predicates, a
+'ProcessPoolExecutor' can be given instead, to which the refined types and the values are
+pickled. With 'fail_fast', the checks that have not started yet are cancelled as soon as a
+violation is found.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from refined.predicates import RefinementViolation
+from refined.validator import RefinedValidator
+
+__all__ = ['ConcurrentCheck', 'get_shared_pool']
+
+_shared_pool: Optional[ThreadPoolExecutor] = None
+_shared_pool_lock = Lock()
+
+# a parameter that is checked concurrently: its name, validator, and the value that its
+# argument has when it is not given, which is not checked
+_Parameter = Tuple[str, RefinedValidator, Any]
+
+
+def get_shared_pool() -> ThreadPoolExecutor:
+    """The thread pool shared by the refined functions whose parameters are checked concurrently"""
+    global _shared_pool
+
+    if _shared_pool is None:
+        with _shared_pool_lock:
+            if _shared_pool is None:
+                _shared_pool = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4),
+                                                  thread_name_prefix="refined")
+
+    return _shared_pool
+
+
+class ConcurrentCheck:
+    """
+    The check of the values of some parameters of a function, at the same time. It returns
+    the violations that are found, in the order of the parameters, or None if there is none
+    """
+    __slots__ = ('parameters', 'executor', 'min_size', 'fail_fast')
+
+    def __init__(self, parameters: Sequence[_Parameter], executor: Union[Executor, bool],
+                 min_size: int, fail_fast: bool):
+        self.parameters, self.executor = tuple(parameters), executor
+        self.min_size, self.fail_fast = min_size, fail_fast
+
+    def __call__(self, values: Tuple[Any, ...]) -> Optional[List[RefinementViolation]]:
+        inline, offloaded = [], []
+
+        for position, value in enumerate(values):
+            _, validator, unset = self.parameters[position]
+
+            if value is unset or not validator.is_checked(type(value)):
+                continue
+
+            (offloaded if _is_large(value, self.min_size) else inline).append(position)
+
+        if len(offloaded) < 2:
+            found = self._check_inline(sorted(inline + offloaded), values)
+            return [violation for _, violation in found] or None
+
+        # the caller checks the last large value itself, instead of waiting idle
+        inline.append(offloaded.pop())
+        futures = {self._submit(position, values[position]): position for position in offloaded}
+
+        try:
+            found = self._check_inline(inline, values)
+            if not (self.fail_fast and found):
+                found.extend(_gather(futures, self.fail_fast))
+        finally:
+            for future in futures:
+                future.cancel()  # i.e. the checks that have not started yet, after a violation
+
+        violations = [violation for _, violation in sorted(found, key=lambda _: _[0])]
+        return (violations[:1] if self.fail_fast else violations) or None
+
+    def _check_inline(self, positions: List[int],
+                      values: Tuple[Any, ...]) -> List[Tuple[int, RefinementViolation]]:
+        found = []
+
+        for position in positions:
+            name, validator, _ = self.parameters[position]
+            violation = validator.first_violation(values[position], name)
+
+            if violation is not None:
+                found.append((position, violation))
+                if self.fail_fast:
+                    break
+
+        return found
+
+    def _submit(self, position: int, value: Any) -> Future:
+        name, validator, _ = self.parameters[position]
+        executor = get_shared_pool() if self.executor is True else self.executor
+
+        if isinstance(executor, ThreadPoolExecutor):
+            return executor.submit(validator.first_violation, value, name)
+
+        # i.e. a process pool, to which the refined type is sent instead of its compiled validator
+        return executor.submit(_find_violation, validator.refined_type, validator.max_items, value,
+                               name)
+
+
+def _is_large(value: Any, min_size: int) -> bool:
+    try:
+        return len(value) >= min_size
+    except TypeError:  # i.e. a value without a size, which is checked inline
+        return False
+
+
+def _gather(futures: Dict[Future, int], fail_fast: bool) -> List[Tuple[int, RefinementViolation]]:
+    """The violations found by the checks in a pool, stopping at the first one with 'fail_fast'"""
+    found = []
+    pending = set(futures)
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            violation = future.result()
+            if violation is not None:
+                found.append((futures[future], violation))
+
+        if fail_fast and found:
+            break
+
+    return found
+
+
+@lru_cache(maxsize=256)
+def _get_validator(refined_type: Any, max_items: Optional[int]) -> RefinedValidator:
+    return RefinedValidator(refined_type, max_items, strict=False)
+
+
+def _find_violation(refined_type: Any, max_items: Optional[int], value: Any,
+                    name: str) -> Optional[RefinementViolation]:
+    """Check a value in a worker process, with a validator compiled once per process"""
+    return _get_validator(refined_type, max_items).first_violation(value, name)
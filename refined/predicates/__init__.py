@@ -1,12 +1,104 @@
-from .base import RefinementPredicate, RefinementTypeException
-from .numeric import PositivePredicate, NegativePredicate
-from .collection import EmptyPredicate, NonEmptyPredicate
-from .string import (
-    ValidIntPredicate,
-    ValidFloatPredicate,
-    XmlPredicate,
-    CsvPredicate,
-    IPv4Predicate,
-    IPv6Predicate,
-    TrimmedPredicate,
+"""
+The predicates are imported lazily, on first use (PEP 562), so that the dependencies of the
+string predicates, as 'csv' and 'xml', are only loaded when those predicates are used.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+from .base import (
+    RefinementPredicate,
+    RefinementTypeException,
+    RefinementViolation,
+    BoundPredicate,
+    EXPENSIVE_COST
 )
+
+if TYPE_CHECKING:
+    from .cache import ResultCache, cache_results
+    from .algebra import And, Or, Not, CompositePredicate
+    from .array import (
+        Elementwise,
+        PositiveArrayPredicate,
+        NegativeArrayPredicate,
+        NonNanArrayPredicate,
+    )
+    from .numeric import PositivePredicate, NegativePredicate
+    from .collection import EmptyPredicate, NonEmptyPredicate
+    from .string import (
+        ValidIntPredicate,
+        ValidFloatPredicate,
+        XmlPredicate,
+        CsvPredicate,
+        IPv4Predicate,
+        IPv6Predicate,
+        TrimmedPredicate,
+    )
+
+__all__ = [
+    'RefinementPredicate',
+    'RefinementTypeException',
+    'RefinementViolation',
+    'BoundPredicate',
+    'EXPENSIVE_COST',
+    'ResultCache',
+    'cache_results',
+    'And',
+    'Or',
+    'Not',
+    'CompositePredicate',
+    'Elementwise',
+    'PositiveArrayPredicate',
+    'NegativeArrayPredicate',
+    'NonNanArrayPredicate',
+    'PositivePredicate',
+    'NegativePredicate',
+    'EmptyPredicate',
+    'NonEmptyPredicate',
+    'ValidIntPredicate',
+    'ValidFloatPredicate',
+    'XmlPredicate',
+    'CsvPredicate',
+    'IPv4Predicate',
+    'IPv6Predicate',
+    'TrimmedPredicate',
+]
+
+# the module of each predicate, and of the other names that are imported lazily
+_LAZY_ATTRIBUTES = {
+    'ResultCache': '.cache',
+    'cache_results': '.cache',
+    'And': '.algebra',
+    'Or': '.algebra',
+    'Not': '.algebra',
+    'CompositePredicate': '.algebra',
+    'Elementwise': '.array',
+    'PositiveArrayPredicate': '.array',
+    'NegativeArrayPredicate': '.array',
+    'NonNanArrayPredicate': '.array',
+    'PositivePredicate': '.numeric',
+    'NegativePredicate': '.numeric',
+    'EmptyPredicate': '.collection',
+    'NonEmptyPredicate': '.collection',
+    'ValidIntPredicate': '.string',
+    'ValidFloatPredicate': '.string',
+    'XmlPredicate': '.string',
+    'CsvPredicate': '.string',
+    'IPv4Predicate': '.string',
+    'IPv6Predicate': '.string',
+    'TrimmedPredicate': '.string',
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = globals()[name] = getattr(import_module(module, __name__), name)
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,266 @@
+"""
+Combinators of predicates: `And`, `Or` and `Not`.
+
+Predicates are combined by subscripting the combinators, as in `And[Greater[0], Less[100]]`
+or `Or[EmptyPredicate[str], XmlPredicate[str]]`, and bound predicates also combine with the
+`&`, `|` and `~` operators, as in `Greater[0] & Less[100]`. The aliases of generic predicates,
+as `PositivePredicate[int]`, must be combined by subscripting: their `|` makes a `Union`. A
+combination is a predicate itself, that can be used in a refined type or combined again.
+
+The whole tree of a combination is fused into a single function when it is created: nested
+combinators of the same kind are flattened, double negations cancel out, the comparisons of
+the predicates with an `interval`, as `Greater` or `PositivePredicate`, are inlined, and the
+intervals of an `And` are intersected, so `Greater[0] & Less[100]` is checked as
+`0 < value < 100`, at the cost of a hand-written condition. The source of the fused function
+is kept in the `__refined_source__` attribute of the `type_guard` of the combination.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+from typing_extensions import TypeGuard, get_origin
+
+from .base import RefinementPredicate, BoundPredicate
+from .registry import get_predicate_metadata
+
+__all__ = ['And', 'Or', 'Not', 'CompositePredicate']
+
+_T = TypeVar("_T")
+
+_Interval = Tuple[Any, bool, Any, bool]
+
+
+class CompositePredicate(BoundPredicate):
+    """
+    A combination of predicates, e.g. `And[Greater[0], Less[100]]`, whose `type_guard` is the
+    fused function of its whole tree. It accepts the values that all its operands accept, and
+    it costs as much as all of them
+    """
+    __slots__ = ('cost',)
+
+    def __init__(self, predicate: Any, parameters: Tuple[Any, ...]):
+        super().__init__(predicate, parameters)
+        self.vectorized_type_guard = _fuse(predicate, parameters, vectorized=True)
+        self.cost = sum(get_predicate_metadata(_).cost for _ in parameters)
+
+    @property
+    def operands(self) -> Tuple[Any, ...]:
+        return self.parameters
+
+
+def _combine(cls: Any, operands: Any) -> CompositePredicate:
+    """Subscript a combinator with its operands, which are never type parameters"""
+    operands = operands if isinstance(operands, tuple) else (operands,)
+
+    if cls is Not and len(operands) != 1:
+        raise TypeError(f"'Not' takes a single predicate, not {len(operands)}")
+
+    return CompositePredicate(cls, operands)
+
+
+class And(RefinementPredicate):
+    """Predicate that holds if all its operands hold, e.g. `And[Greater[0], Less[100]]`"""
+
+    @staticmethod
+    def type_guard(value: _T, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_T]:
+        return all(get_predicate_metadata(_).type_guard(value) for _ in args)
+
+    @staticmethod
+    def bind(*operands: Any) -> Callable[[Any], bool]:
+        return _fuse(And, operands)
+
+    __class_getitem__ = classmethod(_combine)
+
+
+class Or(RefinementPredicate):
+    """Predicate that holds if any of its operands holds, e.g. `Or[Less[0], Greater[100]]`"""
+
+    @staticmethod
+    def type_guard(value: _T, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_T]:
+        return any(get_predicate_metadata(_).type_guard(value) for _ in args)
+
+    @staticmethod
+    def bind(*operands: Any) -> Callable[[Any], bool]:
+        return _fuse(Or, operands)
+
+    __class_getitem__ = classmethod(_combine)
+
+
+class Not(RefinementPredicate):
+    """Predicate that holds if its operand does not hold, e.g. `Not[EmptyPredicate[str]]`"""
+
+    @staticmethod
+    def type_guard(value: _T, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_T]:
+        return not get_predicate_metadata(args[0]).type_guard(value)
+
+    @staticmethod
+    def bind(operand: Any) -> Callable[[Any], bool]:
+        return _fuse(Not, (operand,))
+
+    __class_getitem__ = classmethod(_combine)
+
+
+def _fuse(combinator: Any, operands: Tuple[Any, ...],
+          vectorized: bool = False) -> Optional[Callable[[Any], Any]]:
+    """
+    Compile a combination into a single function. The vectorized function, which checks an
+    array of values, is None if any of the operands does not have a 'vectorized_type_guard'
+    """
+    namespace: Dict[str, Any] = {}
+    expression = _compile_combination(combinator, operands, namespace, vectorized)
+
+    if expression is None:
+        return None
+
+    source = f"def __refined_fused(value):\n    return {expression}\n"
+    exec(compile(source, f"<refined {combinator.__name__} predicate>", "exec"), namespace)
+
+    fused = namespace["__refined_fused"]
+    fused.__refined_source__ = source
+    return fused
+
+
+def _compile_combination(combinator: Any, operands: Tuple[Any, ...], namespace: Dict[str, Any],
+                         vectorized: bool) -> Optional[str]:
+    if combinator is Not:
+        operand = operands[0]
+
+        if _is_combination(operand, Not):  # i.e. a double negation
+            return _compile_operand(operand.operands[0], namespace, vectorized)
+
+        expression = _compile_operand(operand, namespace, vectorized)
+        return None if expression is None else f"{'~' if vectorized else 'not '}{expression}"
+
+    operands = tuple(_flatten(combinator, operands))
+    intervals = [_ for _ in map(_get_interval, operands) if _ is not None]
+    expressions: List[Optional[str]] = []
+
+    if combinator is And and len(intervals) > 1:
+        intersection = _intersect(intervals)
+        if intersection is not None:
+            expressions.append(_compile_interval(intersection, namespace, vectorized))
+            operands = tuple(_ for _ in operands if _get_interval(_) is None)
+
+    # as for the predicates of a refined type, the cheapest operands are evaluated first
+    operands = sorted(operands, key=lambda _: 0 if _get_interval(_) is not None else
+                      get_predicate_metadata(_).cost)
+    expressions.extend(_compile_operand(_, namespace, vectorized) for _ in operands)
+
+    if None in expressions:
+        return None
+
+    if vectorized:
+        separator = " & " if combinator is And else " | "
+    else:
+        separator = " and " if combinator is And else " or "
+
+    return expressions[0] if len(expressions) == 1 else f"({separator.join(expressions)})"
+
+
+def _compile_operand(operand: Any, namespace: Dict[str, Any], vectorized: bool) -> Optional[str]:
+    if isinstance(operand, CompositePredicate):
+        return _compile_combination(operand.predicate, operand.operands, namespace, vectorized)
+
+    interval = _get_interval(operand)
+    if interval is not None:
+        return _compile_interval(interval, namespace, vectorized)
+
+    metadata = get_predicate_metadata(operand)
+    type_guard = metadata.vectorized_type_guard if vectorized else metadata.type_guard
+
+    if type_guard is None:
+        return None
+
+    name = f"__refined_guard_{len(namespace)}"
+    namespace[name] = type_guard
+    return f"{name}(value)"
+
+
+def _compile_interval(interval: _Interval, namespace: Dict[str, Any], vectorized: bool) -> str:
+    """Compile an interval into a chained comparison, as '0 < value <= 100'"""
+    lower, lower_inclusive, upper, upper_inclusive = interval
+    comparisons = []
+
+    if lower is not None:
+        name = _add_constant(lower, namespace)
+        comparisons.append(f"{name} {'<=' if lower_inclusive else '<'} value")
+
+    if upper is not None:
+        name = _add_constant(upper, namespace)
+        comparisons.append(f"value {'<=' if upper_inclusive else '<'} {name}")
+
+    if vectorized:
+        return f"({' & '.join(f'({_})' for _ in comparisons)})"
+
+    # i.e. 'lower < value' and 'value < upper' chain into 'lower < value < upper'
+    return f"({comparisons[0]}{comparisons[1][len('value'):] if len(comparisons) > 1 else ''})"
+
+
+def _add_constant(value: Any, namespace: Dict[str, Any]) -> str:
+    name = f"__refined_constant_{len(namespace)}"
+    namespace[name] = value
+    return name
+
+
+def _flatten(combinator: Any, operands: Tuple[Any, ...]) -> List[Any]:
+    """The operands of a combination, with the ones of its nested combinations of the same kind"""
+    flattened = []
+
+    for operand in operands:
+        if _is_combination(operand, combinator):
+            flattened.extend(_flatten(combinator, operand.operands))
+        else:
+            flattened.append(operand)
+
+    return flattened
+
+
+def _is_combination(operand: Any, combinator: Any) -> bool:
+    return isinstance(operand, CompositePredicate) and operand.predicate is combinator
+
+
+def _get_interval(operand: Any) -> Optional[_Interval]:
+    """The interval of the values for which a predicate holds, if it has one"""
+    if isinstance(operand, CompositePredicate):
+        return None
+
+    if isinstance(operand, BoundPredicate):
+        predicate, parameters = operand.predicate, operand.parameters
+    else:
+        predicate, parameters = get_origin(operand) or operand, ()
+
+    interval = getattr(predicate, "interval", None)
+
+    if interval is None:
+        return None
+
+    try:
+        lower, lower_inclusive, upper, upper_inclusive = interval(*parameters)
+    except TypeError:  # i.e. the parameters of the predicate are not bound
+        return None
+
+    if lower is None and upper is None:
+        return None
+
+    return lower, lower_inclusive, upper, upper_inclusive
+
+
+def _intersect(intervals: List[_Interval]) -> Optional[_Interval]:
+    """The intersection of intervals, or None if their bounds can not be compared"""
+    lower, lower_inclusive, upper, upper_inclusive = None, True, None, True
+
+    try:
+        for other_lower, other_lower_inclusive, other_upper, other_upper_inclusive in intervals:
+            if other_lower is not None:
+                if lower is None or other_lower > lower:
+                    lower, lower_inclusive = other_lower, other_lower_inclusive
+                elif other_lower == lower:
+                    lower_inclusive = lower_inclusive and other_lower_inclusive
+
+            if other_upper is not None:
+                if upper is None or other_upper < upper:
+                    upper, upper_inclusive = other_upper, other_upper_inclusive
+                elif other_upper == upper:
+                    upper_inclusive = upper_inclusive and other_upper_inclusive
+    except TypeError:
+        return None
+
+    return lower, lower_inclusive, upper, upper_inclusive
@@ -0,0 +1,156 @@
+"""
+Refined array types.
+
+The array predicates check that all the values of a NumPy array, a pandas Series, Index or
+DataFrame, or a pyarrow Array or ChunkedArray hold a predicate, e.g. `PositiveArrayPredicate`,
+or `Elementwise[InRange[0, 1]]` for any predicate. They call the `vectorized_type_guard` of
+the predicate once per array, or per column or chunk, on a NumPy view of its buffer, so that
+no value is converted to a Python object; the buffers of pyarrow arrays and of the pandas
+objects backed by NumPy are not copied either.
+
+Null values, as in pyarrow arrays or pandas nullable columns, do not hold any predicate. The
+values of other iterables, as lists, and of arrays whose predicate is not vectorized, are
+checked one by one. None of the array libraries is a dependency: they are only used if the
+checked values come from them, in which case they are already imported.
+"""
+
+import sys
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+from typing_extensions import TypeGuard
+
+from .base import RefinementPredicate, BoundPredicate
+from .numeric import PositivePredicate, NegativePredicate, NonNan
+from .registry import PredicateMetadata, get_predicate_metadata
+
+__all__ = [
+    'Elementwise',
+    'PositiveArrayPredicate',
+    'NegativeArrayPredicate',
+    'NonNanArrayPredicate',
+]
+
+_A = TypeVar("_A")
+
+
+def _elementwise(cls: Any, predicate: Any) -> BoundPredicate:
+    """Subscript 'Elementwise' with a predicate, which is never a type parameter"""
+    return BoundPredicate(cls, (predicate,))
+
+
+class Elementwise(RefinementPredicate):
+    """
+    Predicate that checks if all the values of an array hold a predicate, e.g.
+    `Elementwise[InRange[0, 1]]` or `Elementwise[Greater[0] & Less[1]]`
+    """
+    cost = 10
+
+    @staticmethod
+    def type_guard(values: _A, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_A]:
+        return _all_hold(values, get_predicate_metadata(args[0]))
+
+    @staticmethod
+    def bind(predicate: Any) -> Callable[[Any], bool]:
+        metadata = get_predicate_metadata(predicate)
+
+        def type_guard(values: Any) -> bool:
+            return _all_hold(values, metadata)
+
+        return type_guard
+
+    __class_getitem__ = classmethod(_elementwise)
+
+
+class PositiveArrayPredicate(Generic[_A], RefinementPredicate):
+    """Predicate that checks if all the values of an array are positive"""
+    cost = 10
+
+    @staticmethod
+    def type_guard(values: _A, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_A]:
+        return _all_hold(values, get_predicate_metadata(PositivePredicate))
+
+
+class NegativeArrayPredicate(Generic[_A], RefinementPredicate):
+    """Predicate that checks if all the values of an array are negative"""
+    cost = 10
+
+    @staticmethod
+    def type_guard(values: _A, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_A]:
+        return _all_hold(values, get_predicate_metadata(NegativePredicate))
+
+
+class NonNanArrayPredicate(Generic[_A], RefinementPredicate):
+    """Predicate that checks if no value of an array is NaN"""
+    cost = 10
+
+    @staticmethod
+    def type_guard(values: _A, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_A]:
+        return _all_hold(values, get_predicate_metadata(NonNan))
+
+
+def _all_hold(values: Any, metadata: PredicateMetadata) -> bool:
+    arrays = _as_arrays(values)
+
+    if arrays is None:  # i.e. not an array, e.g. a list
+        return _all_values_hold(values, metadata)
+
+    for array in arrays:
+        if array is None:  # i.e. it has null values
+            return False
+
+        if metadata.vectorized_type_guard is not None and array.dtype.kind in "biufc":
+            if not metadata.vectorized_type_guard(array).all():
+                return False
+        elif not _all_values_hold(array.ravel().tolist(), metadata):
+            return False
+
+    return True
+
+
+def _all_values_hold(values: Any, metadata: PredicateMetadata) -> bool:
+    """Check the values one by one, as the predicate of a refined type would"""
+    return all(metadata.accepts(type(_)) and metadata.type_guard(_) for _ in values)
+
+
+def _as_arrays(values: Any) -> Optional[List[Any]]:
+    """
+    The NumPy arrays with the values of an array, one per column of a DataFrame and per chunk
+    of a ChunkedArray, or None if it is not an array. An array is None if it has null values
+    """
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return [values]
+
+    pandas = sys.modules.get("pandas")
+    if pandas is not None and isinstance(values, pandas.DataFrame):
+        return [_pandas_array(column, numpy) for _, column in values.items()]
+    elif pandas is not None and isinstance(values, (pandas.Series, pandas.Index)):
+        return [_pandas_array(values, numpy)]
+
+    pyarrow = sys.modules.get("pyarrow")
+    if pyarrow is not None and isinstance(values, pyarrow.ChunkedArray):
+        return [_arrow_array(_, pyarrow) for _ in values.chunks]
+    elif pyarrow is not None and isinstance(values, pyarrow.Array):
+        return [_arrow_array(values, pyarrow)]
+
+    return None
+
+
+def _pandas_array(values: Any, numpy: Any) -> Optional[Any]:
+    if isinstance(values.dtype, numpy.dtype):  # i.e. backed by a NumPy array, which is not copied
+        return values.to_numpy(copy=False)
+
+    if values.hasnans:  # i.e. an extension array, as nullable integers, with null values
+        return None
+
+    numpy_dtype = getattr(values.dtype, "numpy_dtype", None)
+    return values.to_numpy() if numpy_dtype is None else values.to_numpy(dtype=numpy_dtype)
+
+
+def _arrow_array(values: Any, pyarrow: Any) -> Optional[Any]:
+    if values.null_count:
+        return None
+
+    try:
+        return values.to_numpy(zero_copy_only=True)
+    except pyarrow.ArrowInvalid:  # i.e. its buffer can not be viewed as a NumPy array, e.g. strings
+        return values.to_numpy(zero_copy_only=False)
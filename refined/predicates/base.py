@@ -1,23 +1,201 @@
+import os
 from abc import ABC, abstractmethod
+from functools import update_wrapper
 
-from typing import TypeVar, Any, Tuple, Dict
-from typing_extensions import TypeGuard
+from typing import Generic, TypeVar, Any, Callable, Tuple, Dict, NamedTuple, Optional, Iterable
+from typing_extensions import Literal, TypeGuard, get_args, get_origin
 
 _T = TypeVar("_T")
 
 
-__all__ = ['RefinementPredicate', 'RefinementTypeException']
+__all__ = [
+    'RefinementPredicate',
+    'RefinementTypeException',
+    'RefinementViolation',
+    'BoundPredicate',
+    'EXPENSIVE_COST'
+]
+
+# The cost from which a predicate is considered expensive, e.g. one that parses a whole document.
+# Coroutines can run the expensive predicates of their parameters in an executor
+EXPENSIVE_COST = 100
+
+_PARAMETER_ERROR_TEMPLATE = "For parameter {} with refined type {}, {} is not a valid value"
+_VALUE_ERROR_TEMPLATE = "For refined type {}, {} does not hold the predicate {}"
+_TYPE_ERROR_TEMPLATE = "For refined type {}, {} is not of that type"
+
+
+class RefinementViolation(NamedTuple):
+    """
+    A record of a value that does not hold a predicate of its refined type. Its message is
+    only rendered when it is converted to a string
+    """
+    parameter: Optional[str]  # None if the value is not bound to a parameter
+    refined_type: Any
+    predicate: Any  # None if the value is missing, or is not of the refined type
+    value: Any
+
+    def __str__(self) -> str:
+        if self.parameter is None and self.predicate is None:
+            return _TYPE_ERROR_TEMPLATE.format(self.refined_type, self.value)
+        elif self.parameter is None:
+            return _VALUE_ERROR_TEMPLATE.format(self.refined_type, self.value, self.predicate)
+
+        return _PARAMETER_ERROR_TEMPLATE.format(self.parameter, self.refined_type, self.value)
 
 
 class RefinementTypeException(Exception):
-    pass
+    """
+    An exception for values that do not hold the conditions of their refined types. The
+    violations it is raised with are only rendered into its message when it is converted
+    to a string, so rejecting a large value does not pay for formatting it
+    """
+
+    def __init__(self, *args: Any, violations: Iterable[RefinementViolation] = ()):
+        super().__init__(*args)
+        self.violations = tuple(violations)
+        self._message = None
+
+    def __str__(self) -> str:
+        if self._message is None:
+            message = super().__str__()
+
+            if self.violations:
+                message += os.linesep.join([os.linesep, *(str(_) for _ in self.violations)])
+
+            self._message = message
+
+        return self._message
 
 
 class RefinementPredicate(ABC):
     """An abstract representation of a refinement predicate"""
 
+    # A hint of how expensive the 'type_guard' method is, relative to other predicates. The
+    # predicates of a refined type are evaluated from the cheapest to the most expensive,
+    # so that most invalid values are rejected before any expensive predicate runs
+    cost = 1
+
+    # An optional counterpart of 'type_guard' that checks a whole array of values at once,
+    # returning a boolean mask. Predicates without it are checked value by value
+    vectorized_type_guard = None
+
+    # An optional 'ResultCache' that memoizes the results of 'type_guard' for immutable
+    # values, see 'refined.predicates.cache.cache_results'
+    result_cache = None
+
+    # An optional static method that binds the parameters of the predicate, e.g. the threshold
+    # of 'Greater', into a type guard that only takes the value. Predicates with it can be
+    # subscripted with their parameters, as in 'Greater[10]' or 'Greater[Literal[10]]'
+    bind = None
+
+    # An optional static method that gives the interval of the values for which the predicate
+    # holds, given its parameters, as '(lower, lower_inclusive, upper, upper_inclusive)', where
+    # a bound is None if there is none. Combinations of such predicates, as
+    # 'And[Greater[0], Less[100]]', are fused into a single comparison
+    interval = None
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+
+        has_bind = "bind" in cls.__dict__ and cls.bind is not None
+        if has_bind and "__class_getitem__" not in cls.__dict__:
+            cls.__class_getitem__ = classmethod(_parameterize)
+
     @staticmethod
     @abstractmethod
     def type_guard(value: _T, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_T]:
         """An user-defined type guard for a type '_T'"""
         raise NotImplementedError(f"Type guard for type {type(value)} is not implemented")
+
+
+class BoundPredicate:
+    """
+    A predicate with its parameters bound, as created by subscripting it, e.g. 'Greater[10]'.
+    Its 'type_guard' is the closure returned by the 'bind' method of the predicate, so the
+    parameters are resolved once, and not every time a value is checked. Other attributes,
+    such as 'cost', are the ones of the predicate
+    """
+    __slots__ = ('predicate', 'parameters', 'type_guard', 'vectorized_type_guard')
+
+    def __init__(self, predicate: Any, parameters: Tuple[Any, ...]):
+        self.predicate, self.parameters = predicate, parameters
+
+        # the bound type guard keeps the annotations of the unbound one, which bound its input
+        self.type_guard = update_wrapper(predicate.bind(*parameters), predicate.type_guard)
+        self.vectorized_type_guard = _bind_vectorized_type_guard(predicate.vectorized_type_guard,
+                                                                 parameters)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.predicate, name)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, BoundPredicate) and \
+            (self.predicate, self.parameters) == (other.predicate, other.parameters)
+
+    def __hash__(self) -> int:
+        return hash((self.predicate, self.parameters))
+
+    def __reduce__(self) -> Tuple[type, Tuple[Any, Tuple[Any, ...]]]:
+        # the bound type guards are closures, so the predicate is bound again when unpickled
+        return type(self), (self.predicate, self.parameters)
+
+    def __and__(self, other: Any) -> "BoundPredicate":
+        from .algebra import And
+        return And[self, other]
+
+    def __rand__(self, other: Any) -> "BoundPredicate":
+        from .algebra import And
+        return And[other, self]
+
+    def __or__(self, other: Any) -> "BoundPredicate":
+        from .algebra import Or
+        return Or[self, other]
+
+    def __ror__(self, other: Any) -> "BoundPredicate":
+        from .algebra import Or
+        return Or[other, self]
+
+    def __invert__(self) -> "BoundPredicate":
+        from .algebra import Not
+        return Not[self]
+
+    def __repr__(self) -> str:
+        parameters = ", ".join(repr(_) for _ in self.parameters)
+        return f"{self.predicate.__module__}.{self.predicate.__qualname__}[{parameters}]"
+
+
+def _literal_value(parameter: Any) -> Any:
+    """The value of a parameter that may be given as a literal type, e.g. 'Literal[10]'"""
+    return get_args(parameter)[0] if get_origin(parameter) is Literal else parameter
+
+
+def _parameterize(cls: Any, parameters: Any) -> Any:
+    """
+    Subscript a predicate that has a 'bind' method: type parameters, as in 'Greater[int]',
+    make a generic alias as usual, while any other parameters are bound to the predicate
+    """
+    parameters = parameters if isinstance(parameters, tuple) else (parameters,)
+
+    if all(_is_type_parameter(_) for _ in parameters):
+        return Generic.__dict__["__class_getitem__"].__get__(None, cls)(parameters)
+
+    return BoundPredicate(cls, tuple(_literal_value(_) for _ in parameters))
+
+
+def _is_type_parameter(parameter: Any) -> bool:
+    if isinstance(parameter, (type, TypeVar)) or parameter is Any:
+        return True
+
+    return get_origin(parameter) not in (None, Literal)
+
+
+def _bind_vectorized_type_guard(vectorized_type_guard: Optional[Callable[..., Any]],
+                                parameters: Tuple[Any, ...]) -> Optional[Callable[[Any], Any]]:
+    if vectorized_type_guard is None:
+        return None
+
+    def bound_vectorized_type_guard(values: Any) -> Any:
+        return vectorized_type_guard(values, *parameters)
+
+    return bound_vectorized_type_guard
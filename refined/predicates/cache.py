@@ -0,0 +1,134 @@
+"""
+Memoization of the results of expensive predicates.
+
+A predicate with a 'result_cache' remembers whether the values it has checked hold it, so
+checking the same value again, e.g. the same XML template or IP address, costs a dictionary
+lookup. Only values of immutable types are cached, keyed by their type and value, and the
+cache evicts its least recently used entries when it exceeds its number of entries or, for
+strings and bytes, its total size.
+
+Caches are opt-in, and they are read when the metadata of a predicate is resolved, so they
+only apply to the functions and validators created after they are set.
+"""
+
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, Hashable, NamedTuple, Optional
+
+from .registry import clear_predicate_registry
+
+__all__ = ['ResultCache', 'CacheInfo', 'cache_results']
+
+# types whose values can not change once created, so the result of a predicate for them
+# can not change either
+_IMMUTABLE_TYPES = frozenset({str, bytes, int, float, complex, bool, frozenset})
+
+_SIZED_TYPES = (str, bytes)
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+    max_bytes: Optional[int]
+    nbytes: int  # the total size of the cached strings and bytes
+
+
+class ResultCache:
+    """
+    A bounded LRU cache of the results of a predicate. It holds at most 'maxsize' entries
+    and, if 'max_bytes' is set, strings and bytes whose total length is at most 'max_bytes';
+    values longer than 'max_bytes' are never cached. It can be shared by several predicates
+    """
+
+    def __init__(self, maxsize: int = 1024, max_bytes: Optional[int] = None):
+        if maxsize < 1:
+            raise ValueError(f"'maxsize' must be a positive integer, not {maxsize!r}")
+
+        self.maxsize, self.max_bytes = maxsize, max_bytes
+        self.hits, self.misses, self.nbytes = 0, 0, 0
+        self._results: "OrderedDict[Hashable, bool]" = OrderedDict()
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(maxsize={self.maxsize}, max_bytes={self.max_bytes})"
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._results), self.max_bytes,
+                         self.nbytes)
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self.hits, self.misses, self.nbytes = 0, 0, 0
+
+    def wrap(self, type_guard: Callable[..., bool]) -> Callable[..., bool]:
+        """Wrap a 'type_guard' method so that its results for immutable values are cached"""
+        results, lock = self._results, self._lock
+
+        @wraps(type_guard)
+        def cached_type_guard(value: Any, *args: Any, **kwargs: Any) -> bool:
+            value_type = type(value)
+
+            if value_type not in _IMMUTABLE_TYPES:
+                return type_guard(value, *args, **kwargs)
+
+            if args or kwargs:
+                key = (type_guard, value_type, value, args, tuple(kwargs.items()))
+            else:
+                key = (type_guard, value_type, value)
+
+            try:
+                with lock:
+                    result = results[key]
+                    results.move_to_end(key)
+                    self.hits += 1
+
+                return result
+            except KeyError:
+                pass
+            except TypeError:  # i.e. unhashable arguments
+                return type_guard(value, *args, **kwargs)
+
+            result = type_guard(value, *args, **kwargs)
+            self._store(key, len(value) if value_type in _SIZED_TYPES else 0, result)
+            return result
+
+        cached_type_guard.result_cache = self
+        return cached_type_guard
+
+    def _store(self, key: Hashable, size: int, result: bool):
+        with self._lock:
+            self.misses += 1
+
+            if (self.max_bytes is not None and size > self.max_bytes) or key in self._results:
+                return
+
+            self._results[key] = result
+            self.nbytes += size
+
+            while len(self._results) > self.maxsize or \
+                    (self.max_bytes is not None and self.nbytes > self.max_bytes):
+                evicted_key, _ = self._results.popitem(last=False)
+                self.nbytes -= _size_of(evicted_key)
+
+
+def cache_results(predicate: Any, maxsize: int = 1024,
+                  max_bytes: Optional[int] = None) -> Optional[ResultCache]:
+    """
+    Enable the result cache of a predicate class, e.g. 'cache_results(XmlPredicate)', and
+    return it to read its counters, or disable it with a 'maxsize' of 0. The cache applies
+    to every alias of the predicate, as 'XmlPredicate[str]', in the functions and validators
+    created afterwards
+    """
+    cache = ResultCache(maxsize, max_bytes) if maxsize else None
+    predicate.result_cache = cache
+    clear_predicate_registry()
+    return cache
+
+
+def _size_of(key: Hashable) -> int:
+    value = key[2]
+    return len(value) if type(value) in _SIZED_TYPES else 0
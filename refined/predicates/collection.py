@@ -25,4 +25,4 @@ class NonEmptyPredicate(Generic[_C], RefinementPredicate):
 
     @staticmethod
     def type_guard(value: _C, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_C]:
-        return not EmptyPredicate.type_guard(value)
+        return len(value) > 0
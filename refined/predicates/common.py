@@ -4,7 +4,7 @@ These predicates do not strictly fall into one of the other categories because t
 abstractions. For example, `ValueRangePredicate` applies for iterables of numeric type.
 """
 
-from typing import Generic, TypeVar, Tuple, Any, Dict, Iterable
+from typing import Callable, Generic, TypeVar, Tuple, Any, Dict, Iterable
 from typing_extensions import TypeGuard
 from numbers import Real
 
@@ -19,8 +19,20 @@ __all__ = [
 
 
 class ValueRangePredicate(Generic[_I], RefinementPredicate):
-    """Predicate that checks if all the values in an iterable of `Real` are in a range"""
+    """
+    Predicate that checks if all the values in an iterable of `Real` are in a range, which
+    can be bound by subscripting it, e.g. `ValueRangePredicate[0, 100]`
+    """
+    cost = 10
+
     @staticmethod
     def type_guard(iterable: _I, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_I]:
         lower_cap, upper_cap = args[:2]
-        return all(lower_cap >= value <= upper_cap for value in iterable)
+        return all(lower_cap <= value <= upper_cap for value in iterable)
+
+    @staticmethod
+    def bind(lower_cap: Any, upper_cap: Any) -> Callable[[Any], bool]:
+        def type_guard(iterable: Any) -> bool:
+            return all(lower_cap <= value <= upper_cap for value in iterable)
+
+        return type_guard
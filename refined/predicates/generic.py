@@ -1,6 +1,8 @@
 """Refined generic types."""
 
-from typing import Generic, TypeVar, Tuple, Any, Dict
+import operator
+from functools import partial
+from typing import Callable, Generic, TypeVar, Tuple, Any, Dict
 from typing_extensions import TypeGuard
 
 from .base import RefinementPredicate
@@ -12,9 +14,16 @@ __all__ = ['EqualPredicate']
 
 
 class EqualPredicate(Generic[_G], RefinementPredicate):
-    """Predicate that checks if a value is equal to another value"""
+    """
+    Predicate that checks if a value is equal to another value, which can be bound by
+    subscripting it, e.g. `EqualPredicate["yes"]`
+    """
 
     @staticmethod
     def type_guard(value: _G, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_G]:
         other_value = args[0]
         return value == other_value
+
+    @staticmethod
+    def bind(other_value: Any) -> Callable[[Any], bool]:
+        return partial(operator.eq, other_value)
@@ -1,15 +1,21 @@
-"""Refined numeric types"""
+"""
+Refined numeric types.
+
+The parameterized predicates (`Greater`, `Less`, `Modulo`, `Divisible` and `InRange`) are
+bound to their parameters by subscripting them, as in `Greater[10]`, `Greater[Literal[10]]`
+or `InRange[0, 100]`, so that checking a value is a single comparison.
+"""
 
 import math
-from typing import Generic, TypeVar, Tuple, Any, Dict
-from typing_extensions import TypeGuard, Literal, get_args
+import operator
+from functools import partial
+from typing import Callable, Generic, TypeVar, Tuple, Any, Dict
+from typing_extensions import TypeGuard
 from numbers import Real
 
-from .base import RefinementPredicate
+from .base import RefinementPredicate, _literal_value
 
 _R = TypeVar("_R", bound=Real)
-_0 = Literal[0]
-_2 = Literal[2]
 
 
 __all__ = [
@@ -17,6 +23,7 @@ __all__ = [
     'Less',
     'Modulo',
     'NonNan',
+    'InRange',
     'PositivePredicate',
     'NegativePredicate',
     'Divisible'
@@ -24,58 +31,136 @@ __all__ = [
 
 
 class Greater(Generic[_R], RefinementPredicate):
+    """Predicate that checks if a number is greater than a threshold, e.g. `Greater[0]`"""
 
     @staticmethod
     def type_guard(value: _R, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_R]:
-        threshold = args[0]
-        threshold_value = get_args(threshold)[0]
+        return value > _literal_value(args[0])
+
+    @staticmethod
+    def bind(threshold: Any) -> Callable[[Any], bool]:
+        return partial(operator.lt, threshold)  # i.e. 'threshold < value'
+
+    @staticmethod
+    def interval(threshold: Any) -> Tuple[Any, bool, Any, bool]:
+        return threshold, False, None, False
 
-        return value > threshold_value
+    @staticmethod
+    def vectorized_type_guard(values: Any, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
+        return values > _literal_value(args[0])
 
 
 class Less(Generic[_R], RefinementPredicate):
+    """Predicate that checks if a number is less than a threshold, e.g. `Less[0]`"""
 
     @staticmethod
     def type_guard(value: _R, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_R]:
-        threshold = args[0]
-        threshold_value = get_args(threshold)[0]
+        return value < _literal_value(args[0])
 
-        return value < threshold_value
+    @staticmethod
+    def bind(threshold: Any) -> Callable[[Any], bool]:
+        return partial(operator.gt, threshold)  # i.e. 'threshold > value'
+
+    @staticmethod
+    def interval(threshold: Any) -> Tuple[Any, bool, Any, bool]:
+        return None, False, threshold, False
+
+    @staticmethod
+    def vectorized_type_guard(values: Any, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
+        return values < _literal_value(args[0])
 
 
 class Modulo(Generic[_R], RefinementPredicate):
+    """Predicate that checks if a number is a multiple of a divisor, e.g. `Modulo[2]`"""
 
     @staticmethod
     def type_guard(value: _R, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_R]:
-        divisor = args[0]
-        divisor_value = get_args(divisor)[0]
+        return value % _literal_value(args[0]) == 0
+
+    @staticmethod
+    def bind(divisor: Any) -> Callable[[Any], bool]:
+        def type_guard(value: Any) -> bool:
+            return value % divisor == 0
 
-        return value % divisor_value == 0
+        return type_guard
+
+    @staticmethod
+    def vectorized_type_guard(values: Any, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
+        return values % _literal_value(args[0]) == 0
 
 
 class NonNan(Generic[_R], RefinementPredicate):
 
     @staticmethod
     def type_guard(value: _R, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_R]:
-        return math.isnan(value)
+        return not math.isnan(value)
+
+    @staticmethod
+    def vectorized_type_guard(values: Any, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
+        return values == values  # NaN is the only value that is not equal to itself
+
+
+class InRange(Generic[_R], RefinementPredicate):
+    """Predicate that checks if a number is in a closed range, e.g. `InRange[0, 100]`"""
+
+    @staticmethod
+    def type_guard(value: _R, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_R]:
+        lower_cap, upper_cap = (_literal_value(_) for _ in args[:2])
+        return lower_cap <= value <= upper_cap
+
+    @staticmethod
+    def bind(lower_cap: Any, upper_cap: Any) -> Callable[[Any], bool]:
+        def type_guard(value: Any) -> bool:
+            return lower_cap <= value <= upper_cap
+
+        return type_guard
+
+    @staticmethod
+    def interval(lower_cap: Any, upper_cap: Any) -> Tuple[Any, bool, Any, bool]:
+        return lower_cap, True, upper_cap, True
+
+    @staticmethod
+    def vectorized_type_guard(values: Any, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
+        lower_cap, upper_cap = (_literal_value(_) for _ in args[:2])
+        return (lower_cap <= values) & (values <= upper_cap)
 
 
 class PositivePredicate(Generic[_R], RefinementPredicate):
 
     @staticmethod
     def type_guard(value: _R, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_R]:
-        return Greater[_R].type_guard(value, _0)
+        return value > 0
+
+    @staticmethod
+    def interval() -> Tuple[Any, bool, Any, bool]:
+        return 0, False, None, False
+
+    @staticmethod
+    def vectorized_type_guard(values: Any, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
+        return values > 0
 
 
 class NegativePredicate(Generic[_R], RefinementPredicate):
 
     @staticmethod
     def type_guard(value: _R, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_R]:
-        return Less[_R].type_guard(value, _0)
+        return value < 0
+
+    @staticmethod
+    def interval() -> Tuple[Any, bool, Any, bool]:
+        return None, False, 0, False
+
+    @staticmethod
+    def vectorized_type_guard(values: Any, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
+        return values < 0
 
 
 class Divisible(Generic[_R], RefinementPredicate):
+    """Predicate that checks if a number is divisible by a divisor, e.g. `Divisible[3]`"""
 
     @staticmethod
     def type_guard(value: _R, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_R]:
-        return Modulo[_R].type_guard(value, _0)
+        return Modulo.type_guard(value, *args)
+
+    bind = staticmethod(Modulo.bind)
+    vectorized_type_guard = staticmethod(Modulo.vectorized_type_guard)
@@ -0,0 +1,143 @@
+"""
+Registry of refinement predicate metadata.
+
+The bounds of a predicate's 'type_guard' method only depend on its definition, so they
+are resolved once per predicate. The verdict of whether an argument type is compatible
+with a predicate is memoized per '(argument type, predicate)' pair, so that checking it
+costs a single dictionary lookup.
+"""
+
+import inspect
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple, TypeVar, Union
+from typing_extensions import TypeGuard, get_args, get_origin
+
+__all__ = [
+    'PredicateMetadata',
+    'get_predicate_metadata',
+    'is_predicate_compatible',
+    'clear_predicate_registry'
+]
+
+_TYPEGUARD_TYPE = type(TypeGuard[None])
+
+# A class, or a tuple of classes, as accepted by 'issubclass'
+_Bound = Union[type, Tuple[type, ...]]
+
+
+class PredicateMetadata(NamedTuple):
+    """The resolved 'type_guard' method of a predicate, and the bounds of its input and output"""
+    predicate: Any
+    type_guard: Callable[..., bool]
+    input_bound: Optional[_Bound]
+    type_guard_bound: Optional[_Bound]
+    vectorized_type_guard: Optional[Callable[..., Any]] = None
+    cost: float = 1
+    # the predicates that a composite predicate is made of
+    operands: Tuple["PredicateMetadata", ...] = ()
+
+    def accepts(self, argument_type: type) -> bool:
+        """
+        Check if the predicate accepts arguments of a given type, that is, if the type is
+        bounded by both the input of the 'type_guard' method, and the type guard it returns
+        """
+        key = (argument_type, self.type_guard)
+        try:
+            return _COMPATIBILITY[key]
+        except KeyError:
+            verdict = _COMPATIBILITY[key] = _is_compatible(argument_type, self)
+            return verdict
+
+
+_METADATA: Dict[Any, PredicateMetadata] = {}
+_COMPATIBILITY: Dict[Tuple[type, Callable[..., bool]], bool] = {}
+
+
+def get_predicate_metadata(predicate: Any) -> PredicateMetadata:
+    """Get the metadata of a predicate, resolving it the first time the predicate is seen"""
+    try:
+        return _METADATA[predicate]
+    except KeyError:
+        metadata = _METADATA[predicate] = _resolve_metadata(predicate)
+        return metadata
+    except TypeError:  # i.e. an unhashable predicate
+        return _resolve_metadata(predicate)
+
+
+def is_predicate_compatible(argument_type: type, predicate: Any) -> bool:
+    """Check if a predicate accepts arguments of a given type"""
+    return get_predicate_metadata(predicate).accepts(argument_type)
+
+
+def clear_predicate_registry():
+    """Forget every resolved predicate, e.g. after redefining a custom predicate"""
+    _METADATA.clear()
+    _COMPATIBILITY.clear()
+
+
+def _resolve_metadata(predicate: Any) -> PredicateMetadata:
+    type_guard = predicate.type_guard
+    # annotations are read, never popped, as they are shared by every alias of the predicate
+    annotations = getattr(type_guard, "__annotations__", {})
+    return_type = annotations.get("return", None)
+
+    input_bound, type_guard_bound = None, None
+
+    if type(return_type) is _TYPEGUARD_TYPE:
+        type_guard_bound = _resolve_bound(return_type.__args__[0])
+
+        input_parameter = _get_input_parameter(type_guard)
+        if input_parameter in annotations:
+            input_bound = _resolve_bound(annotations[input_parameter])
+
+    # the cache wraps the type guard once its bounds are resolved from the original one
+    result_cache = getattr(predicate, "result_cache", None)
+    if result_cache is not None:
+        type_guard = result_cache.wrap(type_guard)
+
+    vectorized_type_guard = getattr(predicate, "vectorized_type_guard", None)
+    cost = getattr(predicate, "cost", 1)
+    operands = tuple(get_predicate_metadata(_) for _ in getattr(predicate, "operands", ()))
+    return PredicateMetadata(predicate, type_guard, input_bound, type_guard_bound,
+                             vectorized_type_guard, cost, operands)
+
+
+def _get_input_parameter(type_guard: Callable[..., bool]) -> Optional[str]:
+    """The input of a type guard is its first parameter, e.g. 'value'"""
+    try:
+        parameters = inspect.signature(type_guard).parameters
+    except (TypeError, ValueError):
+        return None
+
+    return next(iter(parameters), None)
+
+
+def _resolve_bound(type_hint: Any) -> Optional[_Bound]:
+    """
+    Resolve a type hint into a class that can be used with 'issubclass'. Type variables
+    are resolved into their bound (or 'object' if unbounded), generic aliases into their
+    origin, e.g. 'Iterable[Real]' into 'collections.abc.Iterable', and unions into a tuple
+    of classes
+    """
+    if isinstance(type_hint, TypeVar):
+        type_hint = type_hint.__bound__ if type_hint.__bound__ is not None else object
+
+    origin = get_origin(type_hint)
+    if origin is Union:
+        bounds = tuple(_resolve_bound(_) for _ in get_args(type_hint))
+        return None if None in bounds else bounds
+    elif origin is not None:
+        type_hint = origin
+
+    return type_hint if isinstance(type_hint, type) else None
+
+
+def _is_compatible(argument_type: type, metadata: PredicateMetadata) -> bool:
+    # i.e. a composite predicate accepts the arguments that all its operands accept
+    if metadata.operands:
+        return all(_.accepts(argument_type) for _ in metadata.operands)
+
+    if metadata.input_bound is None or metadata.type_guard_bound is None:
+        return False
+
+    return issubclass(argument_type, metadata.type_guard_bound) and \
+        issubclass(argument_type, metadata.input_bound)
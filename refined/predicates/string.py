@@ -3,18 +3,72 @@ Refined string types.
 
 Note that most of the predicates defined `collection` also work for strings, by treating
 them as a sequence of characters.
+
+The document predicates (`XmlPredicate` and `CsvPredicate`) also accept bytes, memory-mapped
+files and file objects, and validate them incrementally, so their peak memory does not
+depend on the size of the document. A file object is read from its current position, which
+is restored once it is checked, so it must be seekable: checking one that is not raises a
+ValueError. Their limits are bound by
+subscripting them, e.g. `XmlPredicate[2 ** 20, 32]` for documents of at most 1 MiB with at
+most 32 levels of nested elements.
+
+The document and IP address predicates are the most expensive ones to evaluate; when the
+same values are checked repeatedly, their results can be memoized per predicate class with
+'refined.predicates.cache_results', e.g. 'cache_results(XmlPredicate, max_bytes=2 ** 20)',
+where 'max_bytes' bounds the size of the cache rather than the one of the documents.
 """
 
-from typing import Generic, TypeVar, Tuple, Any, Dict
+import re
+from typing import Callable, Generic, TypeVar, Tuple, Any, Dict, Iterator, Optional, Union, AnyStr
 from typing_extensions import TypeGuard
-from csv import reader as CsvReader
-from ipaddress import ip_address
-from xml.etree import ElementTree
-from io import StringIO
+from contextlib import contextmanager
+from csv import Error as CsvError, reader as CsvReader
+from xml.parsers import expat
+from mmap import mmap
+from io import IOBase
 
-from .base import RefinementPredicate
+from .base import RefinementPredicate, EXPENSIVE_COST
 
 _S = TypeVar("_S", bound=str)
+_D = TypeVar("_D", bound=Union[str, bytes, bytearray, memoryview, mmap, IOBase])
+
+_CHUNK_SIZE = 64 * 1024
+_TEXT_LINE = re.compile(r"[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+")
+_BYTES_LINE = re.compile(rb"[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+")
+
+
+def _ipv6_pattern(hextet: str, ipv4: str) -> str:
+    """
+    Build a pattern for IPv6 addresses. An address has 8 groups of hextets, where the last
+    two may be written as an IPv4 address, and '::' may replace one or more groups once
+    """
+    full_addresses = [f"(?:{hextet}:){{7}}{hextet}", f"(?:{hextet}:){{6}}{ipv4}"]
+    compressed_addresses = []
+
+    for num_left_groups in range(8):
+        left = f"(?:{hextet}:){{{num_left_groups - 1}}}{hextet}" if num_left_groups else ""
+        max_right_groups = 7 - num_left_groups
+
+        right = []
+        if max_right_groups >= 1:
+            right.append(f"(?:{hextet}:){{0,{max_right_groups - 1}}}{hextet}")
+        if max_right_groups >= 2:
+            right.append(f"(?:{hextet}:){{0,{max_right_groups - 2}}}{ipv4}")
+
+        compressed_addresses.append(f"{left}::(?:{'|'.join(right)})?" if right else f"{left}::")
+
+    # an address may have a non-empty scope id, as in 'fe80::1%eth0'
+    return f"(?:{'|'.join(full_addresses + compressed_addresses)})(?:%[^%]+)?"
+
+
+# Scanners that decide if a `str` is valid with the same grammar as `int` and `ipaddress`,
+# without converting it, and without raising for invalid values
+_DIGITS = r"\d+(?:_\d+)*"
+_INT = re.compile(rf"\s*[+-]?{_DIGITS}\s*")
+_OCTET = r"(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])"
+_IPV4_ADDRESS = rf"(?:{_OCTET}\.){{3}}{_OCTET}"
+_IPV4 = re.compile(_IPV4_ADDRESS)
+_IPV6 = re.compile(_ipv6_pattern(r"[0-9a-fA-F]{1,4}", _IPV4_ADDRESS))
 
 
 __all__ = [
@@ -30,6 +84,7 @@ __all__ = [
 
 class TrimmedPredicate(Generic[_S], RefinementPredicate):
     """Predicate that checks if a `str` has no leading or trailing whitespace"""
+    cost = 2
 
     @staticmethod
     def type_guard(value: _S, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_S]:
@@ -38,81 +93,202 @@ class TrimmedPredicate(Generic[_S], RefinementPredicate):
 
 class ValidIntPredicate(Generic[_S], RefinementPredicate):
     """Predicate that checks if a `str` is a parsable `int`"""
+    cost = 5
 
     @staticmethod
     def type_guard(value: _S, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_S]:
-        try:
-            _ = int(value)
-            return True
-        except:
-            return False
+        return value.isdecimal() or _INT.fullmatch(value) is not None
 
 
 class ValidFloatPredicate(Generic[_S], RefinementPredicate):
     """Predicate that checks if a `str` is a parsable `float`"""
+    cost = 5
 
     @staticmethod
     def type_guard(value: _S, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_S]:
+        # the conversion is faster than any scanner for this grammar, even for invalid values
         try:
             _ = float(value)
             return True
-        except:
+        except ValueError:
             return False
 
 
-class XmlPredicate(Generic[_S], RefinementPredicate):
-    """Predicate that checks if a `str` is well-formed XML"""
+class XmlPredicate(Generic[_D], RefinementPredicate):
+    """
+    Predicate that checks if a `str` is well-formed XML. The document is parsed in chunks,
+    without building a tree. It accepts the optional limits 'max_bytes' (the size of the
+    document) and 'max_depth' (the nesting of its elements), which can be bound by
+    subscripting it, e.g. `XmlPredicate[2 ** 20, 32]` or `XmlPredicate[None, 32]`
+    """
+    cost = EXPENSIVE_COST
 
     @staticmethod
-    def type_guard(value: _S, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_S]:
-        try:
-            with StringIO(value) as f:
-                _ = ElementTree.parse(f)
-            return True
-        except:
-            return False
+    def type_guard(value: _D, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_D]:
+        return _is_xml(value, kwargs.get("max_bytes"), kwargs.get("max_depth"))
 
+    @staticmethod
+    def bind(max_bytes: Optional[int] = None,
+             max_depth: Optional[int] = None) -> Callable[[Any], bool]:
+        def type_guard(value: Any) -> bool:
+            return _is_xml(value, max_bytes, max_depth)
 
-class CsvPredicate(Generic[_S], RefinementPredicate):
+        return type_guard
+
+
+class CsvPredicate(Generic[_D], RefinementPredicate):
     """
     Predicate that checks if a `str` is well-formed CSV. It uses a custom separator,
-    which by default is ','
+    which by default is ',' and can be bound by subscripting it, e.g. `CsvPredicate[';']`.
+    The document is read line by line, and it accepts the optional limit 'max_bytes' (the
+    size of the document)
     """
+    cost = EXPENSIVE_COST
 
     @staticmethod
-    def type_guard(value: _S, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_S]:
+    def type_guard(value: _D, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_D]:
         try:
             separator = args[0]
         except IndexError:
             separator = ","
 
-        try:
-            with StringIO(value) as f:
-                for _ in CsvReader(f, delimiter=separator):
-                    pass
+        return _is_csv(value, separator, kwargs.get("max_bytes"))
 
-            return True
-        except:
-            return False
+    @staticmethod
+    def bind(separator: str = ",", max_bytes: Optional[int] = None) -> Callable[[Any], bool]:
+        def type_guard(value: Any) -> bool:
+            return _is_csv(value, separator, max_bytes)
+
+        return type_guard
 
 
 class IPv4Predicate(Generic[_S], RefinementPredicate):
     """Predicate that checks if a `str` is a valid IPv4"""
+    cost = 5
 
     @staticmethod
     def type_guard(value: _S, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_S]:
-        try:
-            return ip_address(value).version == 4
-        except:
-            return False
+        return _IPV4.fullmatch(value) is not None
 
 
 class IPv6Predicate(Generic[_S], RefinementPredicate):
     """Predicate that checks if a `str` is a valid IPv6"""
+    cost = 5
 
     @staticmethod
     def type_guard(value: _S, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_S]:
-        try:
-            return ip_address(value).version == 6
-        except:
-            return False
+        return _IPV6.fullmatch(value) is not None
+
+
+def _is_xml(value: Any, max_bytes: Optional[int], max_depth: Optional[int]) -> bool:
+    parser = expat.ParserCreate()
+
+    if max_depth is not None:  # element handlers are only needed to track the depth
+        depth = [0]
+
+        def start_element(*_):
+            depth[0] += 1
+            if depth[0] > max_depth:
+                raise _LimitExceeded()
+
+        def end_element(*_):
+            depth[0] -= 1
+
+        parser.StartElementHandler, parser.EndElementHandler = start_element, end_element
+
+    try:
+        with _restoring_position(value):
+            for chunk in _iter_chunks(value, max_bytes):
+                parser.Parse(chunk, False)
+
+        parser.Parse(b"", True)
+        return True
+    except (expat.ExpatError, UnicodeError, _LimitExceeded):
+        return False
+
+
+def _is_csv(value: Any, separator: str, max_bytes: Optional[int]) -> bool:
+    try:
+        with _restoring_position(value):
+            for _ in CsvReader(_iter_lines(value, max_bytes), delimiter=separator):
+                pass
+
+        return True
+    except (CsvError, UnicodeError, _LimitExceeded):
+        return False
+
+
+class _LimitExceeded(Exception):
+    """A document is larger or deeper than the limits of a predicate"""
+
+
+class _NotSeekable(ValueError):
+    """A document is a file object whose position can not be restored once it is read"""
+
+
+@contextmanager
+def _restoring_position(value: Any) -> Iterator[None]:
+    """Restore the position of a file object once it is read, as it is still to be used"""
+    if not isinstance(value, IOBase):
+        yield
+        return
+
+    if not value.seekable():
+        raise _NotSeekable(f"A document must be a seekable file object, not {value!r}")
+
+    position = value.tell()
+    try:
+        yield
+    finally:
+        value.seek(position)
+
+
+def _iter_chunks(value: Any, max_bytes: Optional[int] = None) -> Iterator[AnyStr]:
+    """
+    Split a document into chunks of bounded size. The document may be a `str`, a bytes-like
+    object (`bytes`, `bytearray`, `memoryview` or `mmap`), or a file object
+    """
+    if isinstance(value, IOBase):
+        chunks = iter(lambda: value.read(_CHUNK_SIZE), value.read(0))
+    elif isinstance(value, str):
+        chunks = (value[_:_ + _CHUNK_SIZE] for _ in range(0, len(value), _CHUNK_SIZE))
+    else:
+        chunks = _iter_buffer_chunks(value)
+
+    return _limit_size(chunks, max_bytes)
+
+
+def _iter_buffer_chunks(value: Any) -> Iterator[bytes]:
+    with memoryview(value) as view:
+        for start in range(0, len(view), _CHUNK_SIZE):
+            yield view[start:start + _CHUNK_SIZE].tobytes()
+
+
+def _iter_lines(value: Any, max_bytes: Optional[int] = None) -> Iterator[str]:
+    """
+    Split a document into lines, keeping their line endings, as expected by a CSV reader.
+    Lines of bytes-like documents and binary files are decoded as UTF-8
+    """
+    if isinstance(value, IOBase):
+        lines = iter(value)
+    elif isinstance(value, str):
+        lines = (_.group() for _ in _TEXT_LINE.finditer(value))
+    else:
+        lines = (_.group() for _ in _BYTES_LINE.finditer(value))
+
+    for line in _limit_size(lines, max_bytes):
+        yield line if isinstance(line, str) else line.decode("utf-8")
+
+
+def _limit_size(chunks: Iterator[AnyStr], max_bytes: Optional[int]) -> Iterator[AnyStr]:
+    if max_bytes is None:
+        yield from chunks
+        return
+
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        if size > max_bytes:
+            raise _LimitExceeded()
+
+        yield chunk
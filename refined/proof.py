@@ -0,0 +1,115 @@
+"""
+Proven values, which carry the predicates that they are known to hold.
+
+'refined.refine(value, RefinedType)' checks a value once and returns it as an instance of a
+subclass of its type, e.g. a 'str', which records the predicates of 'RefinedType'. Refined
+functions and validators only check the predicates that a proven value does not carry yet,
+so a value that is parsed as an 'XmlString' at the boundary of a service is not parsed again
+by every refined function that it flows through.
+
+Only values of immutable types can carry a proof, as a mutable value could stop holding its
+predicates after being checked. The proof is lost by any operation that makes a new value,
+as 'proven + "suffix"', and by pickling, so it is never trusted across processes.
+"""
+
+from threading import Lock
+from typing import Any, Dict, FrozenSet, Hashable, Optional, Tuple
+
+from typing_extensions import get_origin
+
+from refined.matching import is_matching_type
+from refined.predicates import BoundPredicate
+
+__all__ = ['ProvenValue']
+
+# the types whose values can carry a proof: they can not change once created, and they can be
+# subclassed
+_PROVABLE_TYPES = frozenset({str, bytes, int, float, complex, frozenset})
+
+
+class ProvenValue:
+    """
+    The base of the types of proven values, e.g. 'ProvenStr', which inherit from both this
+    class and the type of the value. The type records the type of the original value in
+    '__refined_base__', and the predicates that its values hold in '__refined_proof__'
+    """
+    __slots__ = ()
+
+    __refined_base__: type = object
+    __refined_proof__: FrozenSet[Hashable] = frozenset()
+
+    def __reduce__(self) -> Tuple[type, Tuple[Any]]:
+        return self.__refined_base__, (self.__refined_base__(self),)
+
+
+_proven_types: Dict[Tuple[type, FrozenSet[Hashable]], type] = {}
+_proven_types_lock = Lock()
+
+
+def prove(value: Any, predicates: Tuple[Any, ...]) -> Any:
+    """
+    Make a proven value that carries the given predicates, in addition to the ones that the
+    value already carries, if any. Values of other types than the provable ones are returned
+    as they are
+    """
+    value_type = type(value)
+
+    if isinstance(value, ProvenValue):
+        base, proof = value_type.__refined_base__, value_type.__refined_proof__
+    elif value_type in _PROVABLE_TYPES:
+        base, proof = value_type, frozenset()
+    else:
+        return value
+
+    proof = proof.union(proof_key(_) for _ in predicates)
+    proven_type = _get_proven_type(base, proof)
+    return value if proven_type is value_type else proven_type(value)
+
+
+def proof_key(predicate: Any) -> Hashable:
+    """
+    The key of a predicate in a proof. The type parameters of generic predicates are not part
+    of it, as a proof only applies to values of its base type, as in 'NonEmptyPredicate' for
+    'NonEmptyPredicate[str]', while bound predicates keep their parameters, as in 'Greater[10]'
+    """
+    if isinstance(predicate, BoundPredicate):
+        return predicate
+
+    return get_origin(predicate) or predicate
+
+
+def get_unproven_predicates(value_type: type, type_hint: Any,
+                            predicates: Tuple[Any, ...]) -> Optional[Tuple[Any, ...]]:
+    """
+    The predicates, as 'PredicateMetadata', that values of a proven type must still be checked
+    for. It is None if the type is not proven, or if the type of its original value does not
+    match the type that the refined type hint refines, as 'str' in 'NonEmptyString', in which
+    case its values are not checked at all, as any other value of another type
+    """
+    if not issubclass(value_type, ProvenValue) or \
+            not is_matching_type(value_type.__refined_base__, type_hint):
+        return None
+
+    proof = value_type.__refined_proof__
+    return tuple(_ for _ in predicates if proof_key(_.predicate) not in proof)
+
+
+def _get_proven_type(base: type, proof: FrozenSet[Hashable]) -> type:
+    key = (base, proof)
+
+    try:
+        return _proven_types[key]
+    except KeyError:
+        pass
+
+    with _proven_types_lock:
+        if key not in _proven_types:
+            name = f"Proven{base.__name__.capitalize()}"
+            _proven_types[key] = type(name, (base, ProvenValue), {
+                "__slots__": (),
+                "__module__": __name__,
+                "__refined_base__": base,
+                "__refined_proof__": proof,
+            })
+
+        return _proven_types[key]
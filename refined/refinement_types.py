@@ -1,19 +1,30 @@
+"""
+Refined type aliases. Each alias is built on first use (PEP 562), so that only the predicates
+it needs, and their dependencies, are imported.
+"""
+
+from typing import TYPE_CHECKING, Any, TypeVar, List, Set, Dict
 from typing_extensions import Annotated, TypeGuard
-from typing import TypeVar, List, Set, Dict
-
-from refined.predicates import (
-    PositivePredicate,
-    NegativePredicate,
-    ValidIntPredicate,
-    ValidFloatPredicate,
-    EmptyPredicate,
-    NonEmptyPredicate,
-    TrimmedPredicate,
-    IPv4Predicate,
-    IPv6Predicate,
-    XmlPredicate,
-    CsvPredicate
-)
+
+from refined import predicates
+
+if TYPE_CHECKING:
+    from refined.predicates import (
+        PositivePredicate,
+        NegativePredicate,
+        ValidIntPredicate,
+        ValidFloatPredicate,
+        EmptyPredicate,
+        NonEmptyPredicate,
+        TrimmedPredicate,
+        IPv4Predicate,
+        IPv6Predicate,
+        XmlPredicate,
+        CsvPredicate,
+        PositiveArrayPredicate,
+        NegativeArrayPredicate,
+        NonNanArrayPredicate
+    )
 
 __all__ = [
     # numeric types
@@ -38,26 +49,78 @@ __all__ = [
     'NonEmptyList',
     'NonEmptySet',
     'NonEmptyDict',
+
+    # array types, e.g. 'PositiveArray[np.ndarray]' or 'PositiveArray[pd.Series]'
+    'PositiveArray',
+    'NegativeArray',
+    'NonNanArray',
 ]
 
 _T1 = TypeVar("_T1")
 _T2 = TypeVar("_T2")
 
-Positive = Annotated[_T1, PositivePredicate[_T1]]
-Negative = Annotated[_T1, NegativePredicate[_T1]]
+if TYPE_CHECKING:
+    Positive = Annotated[_T1, PositivePredicate[_T1]]
+    Negative = Annotated[_T1, NegativePredicate[_T1]]
+
+    TrimmedString = Annotated[str, TrimmedPredicate[str]]
+    ValidIntString = Annotated[str, ValidIntPredicate[str]]
+    ValidFloatString = Annotated[str, ValidFloatPredicate[str]]
+    XmlString = Annotated[str, XmlPredicate[str]]
+    CsvString = Annotated[str, CsvPredicate[str]]
+    IPv4String = Annotated[str, IPv4Predicate[str]]
+    IPv6String = Annotated[str, IPv6Predicate[str]]
+
+    Empty = Annotated[_T1, EmptyPredicate[_T1]]
+    NonEmpty = Annotated[_T1, NonEmptyPredicate[_T1]]
+
+    NonEmptyString = Annotated[str, NonEmptyPredicate[str]]
+    NonEmptyList = Annotated[List[_T1], NonEmptyPredicate[List[_T1]]]
+    NonEmptySet = Annotated[Set[_T1], NonEmptyPredicate[Set[_T1]]]
+    NonEmptyDict = Annotated[Dict[_T1, _T2], NonEmptyPredicate[Dict[_T1, _T2]]]
+
+    PositiveArray = Annotated[_T1, PositiveArrayPredicate[_T1]]
+    NegativeArray = Annotated[_T1, NegativeArrayPredicate[_T1]]
+    NonNanArray = Annotated[_T1, NonNanArrayPredicate[_T1]]
+
+# the predicate of each alias, and the type that it refines, as in
+# 'Annotated[str, TrimmedPredicate[str]]'
+_ALIASES = {
+    'Positive': ('PositivePredicate', _T1),
+    'Negative': ('NegativePredicate', _T1),
+
+    'TrimmedString': ('TrimmedPredicate', str),
+    'ValidIntString': ('ValidIntPredicate', str),
+    'ValidFloatString': ('ValidFloatPredicate', str),
+    'XmlString': ('XmlPredicate', str),
+    'CsvString': ('CsvPredicate', str),
+    'IPv4String': ('IPv4Predicate', str),
+    'IPv6String': ('IPv6Predicate', str),
+
+    'Empty': ('EmptyPredicate', _T1),
+    'NonEmpty': ('NonEmptyPredicate', _T1),
+
+    'NonEmptyString': ('NonEmptyPredicate', str),
+    'NonEmptyList': ('NonEmptyPredicate', List[_T1]),
+    'NonEmptySet': ('NonEmptyPredicate', Set[_T1]),
+    'NonEmptyDict': ('NonEmptyPredicate', Dict[_T1, _T2]),
+
+    'PositiveArray': ('PositiveArrayPredicate', _T1),
+    'NegativeArray': ('NegativeArrayPredicate', _T1),
+    'NonNanArray': ('NonNanArrayPredicate', _T1),
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        predicate_name, refined_type = _ALIASES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
 
-TrimmedString = Annotated[str, TrimmedPredicate[str]]
-ValidIntString = Annotated[str, ValidIntPredicate[str]]
-ValidFloatString = Annotated[str, ValidFloatPredicate[str]]
-XmlString = Annotated[str, XmlPredicate[str]]
-CsvString = Annotated[str, CsvPredicate[str]]
-IPv4String = Annotated[str, IPv4Predicate[str]]
-IPv6String = Annotated[str, IPv6Predicate[str]]
+    predicate = getattr(predicates, predicate_name)
+    alias = globals()[name] = Annotated[refined_type, predicate[refined_type]]
+    return alias
 
-Empty = Annotated[_T1, EmptyPredicate[_T1]]
-NonEmpty = Annotated[_T1, NonEmptyPredicate[_T1]]
 
-NonEmptyString = Annotated[str, NonEmptyPredicate[str]]
-NonEmptyList = Annotated[List[_T1], NonEmptyPredicate[List[_T1]]]
-NonEmptySet = Annotated[Set[_T1], NonEmptyPredicate[Set[_T1]]]
-NonEmptyDict = Annotated[Dict[_T1, _T2], NonEmptyPredicate[Dict[_T1, _T2]]]
+def __dir__() -> List[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,200 @@
+"""
+Validation of parsed payloads, as JSON objects, against a schema of refined fields.
+
+'compile_schema' takes a 'TypedDict', a dataclass, or a mapping of field names to type hints,
+as '{"id": Positive[int], "email": NonEmptyString}', and compiles the checks of all its
+refined fields into a single function over dictionaries, as for the wrappers of refined
+functions: the type guards of the fields are called inline, on the values read from the
+payload, so no intermediate object is made for a valid payload. The fields whose type is
+itself a 'TypedDict' or a dataclass with refined fields are checked in the same function,
+and reported by their path, as "address['zip']"; their values must be mappings too, or None
+if they are optional.
+
+As for the parameters of refined functions, a value of another type than the one of its
+refined type is not checked. The required fields that are missing are reported, with the
+'MISSING' value: all the fields of a mapping, the fields of a 'TypedDict' unless they are
+'NotRequired' or it is not total, and the fields of a dataclass without a default value.
+"""
+
+import dataclasses
+import types
+import typing
+from typing import Any, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+from typing_extensions import NotRequired, Required, get_args, get_origin, get_type_hints
+
+from refined.codegen import make_schema_check
+from refined.predicates import RefinementTypeException, RefinementViolation
+from refined.validator import RefinedValidator
+
+__all__ = ['SchemaValidator', 'compile_schema', 'MISSING']
+
+# the origins of 'Optional[int]', and of 'int | None' since Python 3.10
+_UNION_ORIGINS = (Union, getattr(types, "UnionType", Union))
+
+# the markers of the fields of a 'TypedDict', from 'typing' since Python 3.11 or 'typing_extensions'
+_REQUIRED_ORIGINS = (Required, getattr(typing, "Required", Required))
+_NOT_REQUIRED_ORIGINS = (NotRequired, getattr(typing, "NotRequired", NotRequired))
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+MISSING = _Missing()
+
+
+class _SchemaField(NamedTuple):
+    """A refined field of a schema, or a field whose own fields are refined, if it has any"""
+    name: str  # the path to the field in the payload, as "address['zip']"
+    key: str
+    type_hint: Any
+    validator: Optional[RefinedValidator]  # None for a field with its own fields
+    is_required: bool
+    fields: Tuple["_SchemaField", ...] = ()
+    is_optional: bool = False  # i.e. the value of a field with its own fields can be None
+
+
+class SchemaValidator:
+    """
+    A validator for the payloads of a schema, e.g. 'compile_schema(Order)'. The checks of its
+    fields are compiled once, when the validator is created, into a function that reports all
+    the violations of a payload, and one that stops at the first one, for 'is_valid'. With
+    'fail_fast', 'check' also stops at the first violation
+    """
+    __slots__ = ('schema', 'fields', 'fail_fast', '_find_violations', '_check_first')
+
+    def __init__(self, schema: Union[type, Mapping[str, Any]], max_items: Optional[int] = None,
+                 fail_fast: bool = False):
+        self.schema, self.fail_fast = schema, fail_fast
+        self.fields = _compile_fields(schema, max_items, "")
+        self._find_violations = make_schema_check(self.fields, MISSING, fail_fast=False)
+        self._check_first = make_schema_check(self.fields, MISSING, fail_fast=True)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({getattr(self.schema, '__qualname__', self.schema)!r})"
+
+    def is_valid(self, payload: Mapping[str, Any]) -> bool:
+        """
+        Check if a payload holds the conditions of all the refined fields of the schema. A
+        payload that is not a mapping is not valid
+        """
+        if type(payload) is not dict and not isinstance(payload, Mapping):
+            return False
+
+        try:
+            self._check_first(payload)
+        except RefinementTypeException:
+            return False
+
+        return True
+
+    def errors(self, payload: Mapping[str, Any]) -> List[RefinementViolation]:
+        """Get the records of the first predicate that each field of a payload does not hold"""
+        return self._find_violations(payload) or []
+
+    def check(self, payload: Mapping[str, Any]) -> Mapping[str, Any]:
+        """Return a payload if it holds the conditions of the schema, or raise otherwise"""
+        if self.fail_fast:
+            self._check_first(payload)
+            return payload
+
+        violations = self._find_violations(payload)
+
+        if violations is not None:
+            raise RefinementTypeException("Conditions do not hold for the following fields:",
+                                          violations=violations)
+
+        return payload
+
+
+def compile_schema(schema: Union[type, Mapping[str, Any]], max_items: Optional[int] = None,
+                   fail_fast: bool = False) -> SchemaValidator:
+    """
+    Compile a 'TypedDict', a dataclass or a mapping of field names to type hints into a
+    validator for payloads with those fields. 'max_items' applies to the containers in the
+    payloads, as in 'RefinedValidator'
+    """
+    return SchemaValidator(schema, max_items, fail_fast)
+
+
+def _compile_fields(schema: Any, max_items: Optional[int], path: str) -> Tuple[_SchemaField, ...]:
+    """The refined fields of a schema, and the fields with their own refined fields"""
+    fields = []
+
+    for key, type_hint, is_required in _iter_fields(schema):
+        name = f"{path}[{key!r}]" if path else key
+        unwrapped_type_hint = _unwrap_optional(type_hint)
+        is_optional, type_hint = unwrapped_type_hint is not type_hint, unwrapped_type_hint
+
+        if _is_schema(type_hint):
+            nested_fields = _compile_fields(type_hint, max_items, name)
+            if nested_fields:
+                fields.append(_SchemaField(name, key, type_hint, None, is_required, nested_fields,
+                                           is_optional))
+            continue
+
+        validator = RefinedValidator(type_hint, max_items, strict=False)
+        if validator.is_refined:
+            fields.append(_SchemaField(name, key, type_hint, validator, is_required))
+
+    return tuple(fields)
+
+
+def _iter_fields(schema: Any) -> Iterator[Tuple[str, Any, bool]]:
+    """The name, type hint, and whether it is required, of each field of a schema"""
+    if isinstance(schema, Mapping):
+        yield from ((key, type_hint, True) for key, type_hint in schema.items())
+    elif _is_typed_dict(schema):
+        required_keys = getattr(schema, "__required_keys__", None)
+        for key, type_hint in get_type_hints(schema, include_extras=True).items():
+            is_required = schema.__total__ if required_keys is None else key in required_keys
+            yield (key, *_unwrap_required(type_hint, is_required))
+    elif dataclasses.is_dataclass(schema) and isinstance(schema, type):
+        type_hints = get_type_hints(schema, include_extras=True)
+        for field in dataclasses.fields(schema):
+            is_required = field.default is dataclasses.MISSING and \
+                field.default_factory is dataclasses.MISSING
+            yield field.name, type_hints[field.name], is_required
+    else:
+        raise TypeError(f"A schema must be a TypedDict, a dataclass or a mapping, not {schema!r}")
+
+
+def _is_schema(type_hint: Any) -> bool:
+    return _is_typed_dict(type_hint) or \
+        (dataclasses.is_dataclass(type_hint) and isinstance(type_hint, type))
+
+
+def _is_typed_dict(type_hint: Any) -> bool:
+    return isinstance(type_hint, type) and issubclass(type_hint, dict) and \
+        hasattr(type_hint, "__total__")
+
+
+def _unwrap_required(type_hint: Any, is_required: bool) -> Tuple[Any, bool]:
+    """
+    The type of a field of a 'TypedDict' marked as 'Required' or 'NotRequired', and whether
+    it is required
+    """
+    origin = get_origin(type_hint)
+
+    if origin in _REQUIRED_ORIGINS:
+        return get_args(type_hint)[0], True
+    elif origin in _NOT_REQUIRED_ORIGINS:
+        return get_args(type_hint)[0], False
+
+    return type_hint, is_required
+
+
+def _unwrap_optional(type_hint: Any) -> Any:
+    """
+    The type of an optional field, as 'NonEmptyString' for 'Optional[NonEmptyString]', whose
+    None is not checked
+    """
+    if get_origin(type_hint) in _UNION_ORIGINS:
+        args = [_ for _ in get_args(type_hint) if _ is not type(None)]
+        if len(args) == 1:
+            return args[0]
+
+    return type_hint
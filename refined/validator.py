@@ -0,0 +1,422 @@
+"""A compiled validator for a single refined type, usable outside the decorator"""
+
+import types
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, Union
+from typing_extensions import Annotated, TypeGuard, get_args, get_origin
+
+from refined.instrumentation import instrument_type_guard
+from refined.matching import is_matching_type
+from refined.predicates import RefinementPredicate, RefinementTypeException, RefinementViolation
+from refined.predicates.registry import PredicateMetadata, get_predicate_metadata
+from refined.proof import ProvenValue, get_unproven_predicates, prove
+
+__all__ = ['RefinedValidator', 'refine']
+
+_T = TypeVar("_T")
+
+_ANNOTATION_TYPE = type(Annotated[None, Callable[[None], TypeGuard[None]]])
+
+# containers whose items are checked by index, and those whose items are checked in iteration order
+_SEQUENCE_TYPES = (list, tuple)
+_ITERABLE_TYPES = (set, frozenset, deque)
+
+# the origins of 'Optional[int]', and of 'int | None' since Python 3.10
+_UNION_ORIGINS = (Union, getattr(types, "UnionType", Union))
+
+_Traversal = Callable[[Any], Optional[RefinementViolation]]
+
+# a member type of a union, and the validator of its refined type, if it has one
+_UnionMember = Tuple[Any, Optional["RefinedValidator"]]
+
+# the predicates to check for the values of a type, and whether they all accept that type
+_Dispatch = Tuple[Tuple[PredicateMetadata, ...], bool]
+
+# the number of value types whose dispatch each validator keeps
+_MAX_DISPATCH_TYPES = 64
+
+
+class RefinedValidator:
+    """
+    A validator for a refined type hint, e.g. 'Positive[int]' or 'Annotated[str, ...]'.
+    The predicate chain of the refined type is compiled once, when the validator is created,
+    so the same validator can be reused to check any number of values.
+
+    Refined types nested in containers, as in 'List[Positive[int]]', 'Dict[str, NonEmptyString]'
+    or 'Tuple[Positive[int], ...]', are compiled into a traversal of the container that checks
+    its items, and so are the ones in unions, as 'Optional[Positive[int]]', whose values are
+    checked against the first member type that they match. With 'max_items', at most that
+    many items of each container are checked: they are spread evenly over lists and tuples,
+    and are the first ones of sets, deques and dicts.
+
+    With 'instrument', the calls, failures and time of each predicate are counted, as read
+    by 'refined.stats'.
+
+    Values whose type does not match the type of the refined type hint, as 'int' for
+    'NonEmptyString', are not valid, and neither are such items of containers. Without
+    'strict', they are not checked instead, as in the 'refined' decorator, whose parameters
+    already have a type. Subclasses, abstract base classes, as 'Sequence[int]', and unions
+    match, see 'refined.matching', and proven values, made by 'refine', are only checked for
+    the predicates that they do not carry yet
+    """
+    __slots__ = ('refined_type', 'annotated_type', 'predicates', 'max_items', 'strict',
+                 '_is_compatible', '_type_guards', '_traversal', '_matched_type', '_dispatches')
+
+    def __init__(self, refined_type: Any, max_items: Optional[int] = None,
+                 instrument: bool = False, strict: bool = True):
+        if max_items is not None and max_items < 1:
+            raise ValueError(f"'max_items' must be a positive integer, not {max_items!r}")
+
+        self.refined_type, self.max_items, self.strict = refined_type, max_items, strict
+
+        if _is_refined_type_hint(refined_type):
+            self.annotated_type = _get_annotated_type(refined_type)
+            self.predicates = _compile_predicates(refined_type)
+            self._traversal = _compile_traversal(refined_type.__args__[0], max_items, instrument,
+                                                 strict)
+            self._matched_type = refined_type.__args__[0]
+        else:
+            self.predicates = ()
+            self._traversal = _compile_traversal(refined_type, max_items, instrument, strict)
+            self.annotated_type = get_origin(refined_type) if self._traversal is not None else None
+            self._matched_type = refined_type
+
+        # the compatibility of the predicates with the annotated type itself is known in
+        # advance, and the one with the other value types when they are first dispatched
+        self._is_compatible = isinstance(self.annotated_type, type) and \
+            all(_.accepts(self.annotated_type) for _ in self.predicates)
+
+        if instrument:
+            self.predicates = tuple(
+                _._replace(type_guard=instrument_type_guard(_.predicate, _.type_guard))
+                for _ in self.predicates
+            )
+
+        self._type_guards = tuple(_.type_guard for _ in self.predicates)
+        self._dispatches: Dict[type, Optional[_Dispatch]] = {}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.refined_type!r})"
+
+    @property
+    def is_refined(self) -> bool:
+        """Whether the type hint has any condition to check, in itself or in its items"""
+        return bool(self.predicates) or self._traversal is not None
+
+    def is_valid(self, value: Any) -> bool:
+        """
+        Check if a value holds all the conditions of the refined type. Predicates are
+        evaluated from the cheapest to the most expensive, and the evaluation stops at the
+        first one that does not hold
+        """
+        if type(value) is self.annotated_type:
+            if self._type_guards:
+                if not self._is_compatible:
+                    return False
+
+                for type_guard in self._type_guards:
+                    if not type_guard(value):
+                        return False
+
+            if self._traversal is not None:
+                return self._traversal(value) is None
+
+            return True
+
+        return self._find_violation(value) is None
+
+    def first_violation(self, value: Any,
+                        parameter: Optional[str] = None) -> Optional[RefinementViolation]:
+        """
+        Get a record of the first predicate of the refined type that a value does not hold,
+        if any, attributed to a given parameter. For the items of containers, the parameter
+        is followed by the path to the item, as in 'values[3]'
+        """
+        violation = self._find_violation(value)
+
+        if violation is None:
+            return None
+
+        path = None if parameter is None else parameter + violation.parameter
+        return violation._replace(parameter=path)
+
+    def errors(self, value: Any) -> List[RefinementViolation]:
+        """
+        Get the records of all the predicates of the refined type that a value does not
+        hold. Unlike 'is_valid', every predicate is evaluated, although only the first
+        invalid item of a container is reported, with the path to it, as '[3]'
+        """
+        dispatch = self._dispatch(type(value))
+
+        if dispatch is None:
+            violation = self._find_violation(value)
+            return [] if violation is None else [violation._replace(parameter=None)]
+
+        predicates, is_compatible = dispatch
+        errors = [
+            RefinementViolation(None, self.refined_type.__args__[0], _.predicate, value)
+            for _ in predicates if not (is_compatible and _.type_guard(value))
+        ]
+
+        if self._traversal is not None:
+            violation = self._traversal(value)
+            if violation is not None:
+                errors.append(violation)
+
+        return errors
+
+    def check(self, value: _T) -> _T:
+        """Return a value if it holds the conditions of the refined type, or raise otherwise"""
+        violation = self.first_violation(value)
+
+        if violation is not None:
+            raise RefinementTypeException("Conditions do not hold for the following value:",
+                                          violations=[violation])
+
+        return value
+
+    def _find_violation(self, value: Any) -> Optional[RefinementViolation]:
+        """The first violation of a value, whose parameter is the path to it, '' for the value"""
+        dispatch = self._dispatch(type(value))
+
+        if dispatch is None and self.strict:  # i.e. a value of another type
+            return RefinementViolation("", self._matched_type, None, value)
+        elif dispatch is None:
+            return None
+
+        predicates, is_compatible = dispatch
+        for predicate in predicates:
+            if not (is_compatible and predicate.type_guard(value)):
+                return RefinementViolation("", self.refined_type.__args__[0], predicate.predicate,
+                                           value)
+
+        if self._traversal is not None:
+            return self._traversal(value)
+
+        return None
+
+    def is_checked(self, value_type: type) -> bool:
+        """
+        Whether the values of a type are checked, that is, if it matches the type of the
+        refined type hint
+        """
+        return self._dispatch(value_type) is not None
+
+    def _dispatch(self, value_type: type) -> Optional[_Dispatch]:
+        """
+        The predicates to check for a value of a given type, and whether they all accept it,
+        or None if it is not checked. The dispatch of the last value types is memoized
+        """
+        if value_type is self.annotated_type:
+            return self.predicates, self._is_compatible
+
+        try:
+            return self._dispatches[value_type]
+        except KeyError:
+            pass
+
+        if issubclass(value_type, ProvenValue):
+            predicates = get_unproven_predicates(value_type, self._matched_type, self.predicates)
+        elif self._matched_type is not None and is_matching_type(value_type, self._matched_type):
+            predicates = self.predicates
+        else:
+            predicates = None
+
+        if predicates is None:
+            dispatch = None
+        else:
+            dispatch = predicates, all(_.accepts(value_type) for _ in predicates)
+
+        if len(self._dispatches) >= _MAX_DISPATCH_TYPES:
+            self._dispatches.clear()
+
+        self._dispatches[value_type] = dispatch
+        return dispatch
+
+
+def refine(value: _T, refined_type: Any) -> _T:
+    """
+    Check that a value holds the conditions of a refined type, or raise otherwise, and return
+    it as a proven value that carries the predicates of the refined type, e.g.
+    'refine(document, XmlString)'. Refined functions and validators do not check those
+    predicates again for the proven value. Values of mutable types, as lists, are checked but
+    returned as they are, as they can not carry a proof; the items of containers are always
+    checked again
+    """
+    validator = refined_type if isinstance(refined_type, RefinedValidator) else \
+        _get_validator(refined_type)
+
+    if not validator.is_checked(type(value)):
+        raise TypeError(f"Can not refine a value of type {type(value).__qualname__!r} "
+                        f"as {validator.refined_type!r}")
+
+    return prove(validator.check(value), tuple(_.predicate for _ in validator.predicates))
+
+
+@lru_cache(maxsize=256)
+def _get_validator(refined_type: Any) -> RefinedValidator:
+    return RefinedValidator(refined_type)
+
+
+def _is_refined_type_hint(type_hint: Any) -> TypeGuard[_ANNOTATION_TYPE]:
+    return type(type_hint) is _ANNOTATION_TYPE and len(type_hint.__args__) > 0
+
+
+def _get_annotated_type(type_hint: _ANNOTATION_TYPE) -> Any:
+    """The type that an argument must have for a refined type hint to apply"""
+    type_hint_input = type_hint.__args__[0]
+
+    if hasattr(type_hint_input, "__origin__"):  # i.e. a generic collection type (List, Tuple, etc.)
+        return type_hint_input.__origin__
+    else:  # i.e. a raw type (str, int, float, bytes, ...) or a built-in collection type
+        return type_hint_input
+
+
+def _compile_predicates(type_hint: _ANNOTATION_TYPE) -> Tuple[PredicateMetadata, ...]:
+    """
+    Resolve the metadata of the refinement predicates of a refined type hint, sorted by
+    their cost. Predicates with the same cost keep the order in which they are declared
+    """
+    predicates = (get_predicate_metadata(_) for _ in type_hint.__metadata__
+                  if _is_refinement_predicate(_))
+    return tuple(sorted(predicates, key=lambda _: _.cost))
+
+
+def _is_refinement_predicate(metadata: Any) -> TypeGuard[RefinementPredicate]:
+    return hasattr(metadata, "type_guard")
+
+
+def _compile_traversal(type_hint: Any, max_items: Optional[int], instrument: bool = False,
+                       strict: bool = True) -> Optional[_Traversal]:
+    """
+    Compile the check of the items of a container type hint, e.g. 'List[Positive[int]]', into
+    a function that returns the first violation among them. It is None if no item has a
+    refined type, so containers of plain types are not traversed at all. The members of a
+    union, as 'Optional[Positive[int]]', are checked in the same way
+    """
+    origin, args = get_origin(type_hint), get_args(type_hint)
+
+    if origin in _UNION_ORIGINS:
+        members = tuple((_, _compile_item_validator(_, max_items, instrument, strict))
+                        for _ in args)
+        if all(validator is None for _, validator in members):
+            return None
+
+        return _make_union_traversal(members)
+
+    if not isinstance(origin, type) or not args:
+        return None
+
+    if issubclass(origin, dict) and len(args) == 2:
+        key_validator, value_validator = (
+            _compile_item_validator(_, max_items, instrument, strict) for _ in args
+        )
+        if key_validator is None and value_validator is None:
+            return None
+
+        return _make_mapping_traversal(key_validator, value_validator, max_items)
+
+    if origin is tuple and not (len(args) == 2 and args[1] is Ellipsis):
+        validators = tuple(_compile_item_validator(_, max_items, instrument, strict)
+                           for _ in args)
+        if all(_ is None for _ in validators) or args == ((),):
+            return None
+
+        return _make_fixed_tuple_traversal(validators)
+
+    if origin in _SEQUENCE_TYPES or origin in _ITERABLE_TYPES:
+        validator = _compile_item_validator(args[0], max_items, instrument, strict)
+        if validator is None:
+            return None
+
+        return _make_items_traversal(validator, origin in _SEQUENCE_TYPES, max_items)
+
+    return None
+
+
+def _compile_item_validator(type_hint: Any, max_items: Optional[int], instrument: bool = False,
+                            strict: bool = True) -> Optional[RefinedValidator]:
+    validator = RefinedValidator(type_hint, max_items, instrument, strict)
+    return validator if validator.is_refined else None
+
+
+def _iter_items(value: Any, is_sequence: bool,
+                max_items: Optional[int]) -> Iterator[Tuple[Any, Any]]:
+    """Iterate over the indices and items of a container to check, or a sample of them"""
+    if max_items is None or len(value) <= max_items:
+        return enumerate(value)
+
+    if is_sequence:  # the sample is spread evenly over the whole sequence
+        step = -(-len(value) // max_items)
+        return ((index, value[index]) for index in range(0, len(value), step))
+
+    return islice(enumerate(value), max_items)
+
+
+def _make_items_traversal(validator: RefinedValidator, is_sequence: bool,
+                          max_items: Optional[int]) -> _Traversal:
+    find_violation = validator._find_violation
+
+    def traverse(value: Any) -> Optional[RefinementViolation]:
+        for index, item in _iter_items(value, is_sequence, max_items):
+            violation = find_violation(item)
+            if violation is not None:
+                path = f"[{index}]" if is_sequence else ""
+                return violation._replace(parameter=path + violation.parameter)
+
+        return None
+
+    return traverse
+
+
+def _make_fixed_tuple_traversal(validators: Tuple[Optional[RefinedValidator], ...]) -> _Traversal:
+    checked_items = tuple((index, _) for index, _ in enumerate(validators) if _ is not None)
+
+    def traverse(value: Any) -> Optional[RefinementViolation]:
+        for index, validator in checked_items:
+            if index < len(value):
+                violation = validator._find_violation(value[index])
+                if violation is not None:
+                    return violation._replace(parameter=f"[{index}]{violation.parameter}")
+
+        return None
+
+    return traverse
+
+
+def _make_union_traversal(members: Tuple[_UnionMember, ...]) -> _Traversal:
+    def traverse(value: Any) -> Optional[RefinementViolation]:
+        value_type = type(value)
+
+        for type_hint, validator in members:
+            if is_matching_type(value_type, type_hint):
+                return None if validator is None else validator._find_violation(value)
+
+        return None
+
+    return traverse
+
+
+def _make_mapping_traversal(key_validator: Optional[RefinedValidator],
+                            value_validator: Optional[RefinedValidator],
+                            max_items: Optional[int]) -> _Traversal:
+    def traverse(value: Any) -> Optional[RefinementViolation]:
+        items = value.items() if max_items is None else islice(value.items(), max_items)
+
+        for key, item in items:
+            if key_validator is not None:
+                violation = key_validator._find_violation(key)
+                # i.e. reported at the path of the item, with the key as the value
+                if violation is not None:
+                    return violation._replace(parameter=f"[{key!r}]{violation.parameter}")
+
+            if value_validator is not None:
+                violation = value_validator._find_violation(item)
+                if violation is not None:
+                    return violation._replace(parameter=f"[{key!r}]{violation.parameter}")
+
+        return None
+
+    return traverse
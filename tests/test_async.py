@@ -0,0 +1,115 @@
+import asyncio
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Generator, Iterator
+from unittest import TestCase
+
+from refined import refined, RefinementTypeException
+from refined.refinement_types import NonEmpty, Positive, XmlString
+
+
+class TestAsync(TestCase):
+
+    def test_coroutine_function_is_checked_when_called(self):
+        @refined
+        async def hello(name: NonEmpty[str]) -> str:
+            await asyncio.sleep(0)
+            return f"Hello {name}!"
+
+        self.assertTrue(inspect.iscoroutinefunction(hello))
+        self.assertEqual(asyncio.run(hello("peter")), "Hello peter!")
+
+        with self.assertRaises(RefinementTypeException) as e:
+            asyncio.run(hello(""))
+
+        self.assertEqual(["name"], [_.parameter for _ in e.exception.violations])
+
+    def test_generator_function_is_checked_on_first_iteration(self):
+        @refined
+        def countdown(start: Positive[int]) -> Generator[int, int, str]:
+            while start > 0:
+                start -= (yield start) or 1
+
+            return "done"
+
+        self.assertTrue(inspect.isgeneratorfunction(countdown))
+        generator = countdown(-1)
+
+        with self.assertRaises(RefinementTypeException):
+            next(generator)
+
+        generator = countdown(10)
+        self.assertEqual([next(generator), generator.send(3), generator.send(5)], [10, 7, 2])
+
+        with self.assertRaises(StopIteration) as e:
+            generator.send(2)
+
+        self.assertEqual(e.exception.value, "done")
+
+    def test_yielded_items_are_checked_lazily(self):
+        consumed = []
+
+        @refined(validate_yields=True)
+        def decrement(values: NonEmpty[list]) -> Iterator[Positive[int]]:
+            for value in values:
+                consumed.append(value)
+                yield value - 1
+
+        self.assertEqual(list(decrement([3, 2])), [2, 1])
+
+        generator = decrement([3, 1, 5])
+        self.assertEqual(next(generator), 2)
+
+        with self.assertRaises(RefinementTypeException) as e:
+            next(generator)
+
+        self.assertEqual([0], [_.value for _ in e.exception.violations])
+        self.assertEqual(consumed, [3, 2, 3, 1])
+
+        @refined
+        def unchecked_decrement(values: list) -> Iterator[Positive[int]]:
+            yield from (_ - 1 for _ in values)
+
+        self.assertEqual(list(unchecked_decrement([1])), [0])
+
+    def test_async_generator_function(self):
+        @refined(validate_yields=True)
+        async def decrement(values: NonEmpty[list]) -> AsyncIterator[Positive[int]]:
+            for value in values:
+                await asyncio.sleep(0)
+                yield value - 1
+
+        async def collect(values):
+            return [_ async for _ in decrement(values)]
+
+        self.assertTrue(inspect.isasyncgenfunction(decrement))
+        self.assertEqual(asyncio.run(collect([3, 2])), [2, 1])
+
+        for values in ([], [2, 1]):
+            with self.assertRaises(RefinementTypeException):
+                asyncio.run(collect(values))
+
+    def test_expensive_predicates_run_in_executor(self):
+        submitted = []
+
+        class RecordingExecutor(ThreadPoolExecutor):
+            def submit(self, function, *args, **kwargs):
+                submitted.append(args[0])
+                return super().submit(function, *args, **kwargs)
+
+        with RecordingExecutor(max_workers=1) as executor:
+            @refined(executor=executor)
+            async def parse(document: XmlString, tag: NonEmpty[str]) -> str:
+                return tag
+
+            self.assertIn("await __refined_validate_0(document, 'document')",
+                          parse.__refined_source__)
+            self.assertIn("__refined_guard_1_0(tag)", parse.__refined_source__)
+            self.assertNotIn("await __refined_validate_1", parse.__refined_source__)
+            self.assertEqual(asyncio.run(parse("<a></a>", "a")), "a")
+
+            with self.assertRaises(RefinementTypeException) as e:
+                asyncio.run(parse("<a>", ""))
+
+            self.assertEqual(["document", "tag"], [_.parameter for _ in e.exception.violations])
+            self.assertEqual(submitted, ["<a></a>", "<a>"])
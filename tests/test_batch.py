@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from typing_extensions import Annotated
+
+from refined.batch import RowFailure, iter_failures, validate_file
+from refined.predicates.numeric import Greater
+from refined.refinement_types import IPv4String, NonEmptyString, Positive, ValidIntString
+
+CSV_SCHEMA = {"id": ValidIntString, "name": NonEmptyString}
+JSONL_SCHEMA = {"id": Positive[int], "ip": IPv4String, "score": Annotated[int, Greater[10]]}
+
+
+class TestBatch(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name: str, content: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", newline="") as file:
+            file.write(content)
+
+        return path
+
+    def write_jsonl(self, rows) -> str:
+        return self.write("rows.jsonl", "".join(f"{json.dumps(_)}\n" for _ in rows))
+
+    def test_csv_file(self):
+        content = 'name,id,other\nada,1,x\n"multi\nline",2,y\n,x,z\n'
+        path = self.write("rows.csv", content)
+
+        report = validate_file(path, CSV_SCHEMA, workers=1)
+
+        self.assertEqual(report.rows, 3)
+        self.assertFalse(report.is_valid)
+        self.assertEqual(report.failures, [RowFailure(content.index(",x,z"), ("id", "name"))])
+
+    def test_files_with_byte_order_mark(self):
+        content = "\ufeffid,name\n1,ada\nx,bob\n"
+        path = self.write("rows.csv", content)
+
+        self.assertEqual(validate_file(path, CSV_SCHEMA, workers=1).failures,
+                         [RowFailure(len(content.encode()) - len("x,bob\n"), ("id",))])
+
+        path = self.write("rows.jsonl", '\ufeff{"id": 1, "ip": "10.0.0.1", "score": 11}\n')
+        self.assertTrue(validate_file(path, JSONL_SCHEMA, workers=1).is_valid)
+
+    def test_csv_chunks_do_not_split_quoted_fields(self):
+        rows = [f'"name\n{_}",{_}\n' if _ % 2 else f"name {_},{-_ if _ % 7 == 0 else _}\n"
+                for _ in range(1, 200)]
+        content = "name,id\n" + "".join(rows)
+        path = self.write("rows.csv", content)
+
+        expected = validate_file(path, CSV_SCHEMA, workers=1)
+
+        for chunk_size in (1, 7, 100):
+            report = validate_file(path, CSV_SCHEMA, workers=1, chunk_size=chunk_size)
+            self.assertEqual(report, expected)
+
+        self.assertEqual(expected.rows, 199)
+        self.assertTrue(expected.is_valid)
+
+    def test_jsonl_file_with_several_workers(self):
+        rows = [{"id": _, "ip": "10.0.0.1", "score": 20} for _ in range(1, 500)]
+        rows[10]["id"] = -1
+        rows[20]["ip"] = "10.0.0"
+        rows[30]["score"] = 5
+        del rows[40]["ip"]
+        path = self.write_jsonl(rows)
+
+        report = validate_file(path, JSONL_SCHEMA, workers=2, chunk_size=1024)
+
+        self.assertEqual(report.rows, 499)
+        self.assertEqual([_.fields for _ in report.failures],
+                         [("id",), ("ip",), ("score",), ("ip",)])
+        self.assertEqual(report, validate_file(path, JSONL_SCHEMA, workers=1))
+
+        with open(path, "rb") as file:
+            content = file.read()
+
+        for failure in report.failures:
+            self.assertEqual(content[failure.offset - 1:failure.offset], b"\n")
+
+    def test_malformed_rows(self):
+        content = '{"id": 1, "ip": "10.0.0.1", "score": 11}\n{"id": \n[1]\n\n'
+        path = self.write("rows.jsonl", content)
+
+        self.assertEqual(list(iter_failures(path, JSONL_SCHEMA)),
+                         [RowFailure(41, ()), RowFailure(49, ())])
+
+    def test_invalid_arguments(self):
+        path = self.write("rows.csv", "name\nada\n")
+
+        with self.assertRaises(ValueError):
+            validate_file(path, CSV_SCHEMA)  # i.e. the 'id' field is not in the header
+
+        with self.assertRaises(ValueError):
+            validate_file(self.write("rows.txt", "ada\n"), CSV_SCHEMA)
+
+        with self.assertRaises(ValueError):
+            validate_file(path, {"name": NonEmptyString}, workers=0)
+
+    def test_empty_file(self):
+        self.assertEqual(validate_file(self.write("rows.csv", ""), CSV_SCHEMA).rows, 0)
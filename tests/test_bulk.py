@@ -0,0 +1,57 @@
+from unittest import TestCase, skipIf
+
+from refined import RefinedValidator, validate_many
+from refined.refinement_types import Positive, Negative, NonEmptyString, IPv4String
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestBulk(TestCase):
+
+    def test_validate_many_mask(self):
+        self.assertEqual(validate_many(NonEmptyString, ["a", "", "bc"]), [True, False, True])
+        self.assertEqual(validate_many(IPv4String, ["10.0.0.1", "10.0.0"]), [True, False])
+
+    def test_validate_many_indices(self):
+        values = [1.5, -2.0, 0.0, 3.0]
+        self.assertEqual(validate_many(Positive[float], values, return_indices=True), [1, 2])
+
+    def test_validate_many_rejects_values_of_other_types(self):
+        self.assertEqual(validate_many(Positive[float], [1, 1.0]), [False, True])
+
+        validator = RefinedValidator(Positive[float], strict=False)
+        self.assertEqual(validate_many(validator, [-1, -1.0]), [True, False])
+
+    @skipIf(np is None, "numpy is not installed")
+    def test_validate_many_numpy_array(self):
+        values = np.array([1.5, -2.0, 0.0, np.nan, 3.0])
+
+        mask = validate_many(Positive[float], values)
+        self.assertIsInstance(mask, np.ndarray)
+        self.assertEqual(mask.tolist(), [True, False, False, False, True])
+
+        indices = validate_many(Negative[float], values, return_indices=True)
+        self.assertEqual(indices.tolist(), [0, 2, 3, 4])
+
+    @skipIf(np is None, "numpy is not installed")
+    def test_validate_many_numpy_array_matches_iterable(self):
+        values = np.array([3, -1, 0, 7])
+
+        self.assertEqual(validate_many(Positive[int], values).tolist(),
+                         validate_many(Positive[int], values.tolist()))
+
+    @skipIf(np is None, "numpy is not installed")
+    def test_validate_many_numpy_array_of_other_numeric_dtype(self):
+        values = np.array([3, -1, 0, 7])
+
+        # the items of an integer array are checked as floats
+        self.assertEqual(validate_many(Positive[float], values).tolist(),
+                         [True, False, False, True])
+        self.assertEqual(validate_many(Positive[int], np.array([True, False])).tolist(),
+                         [True, False])
+
+        with self.assertRaises(TypeError):
+            validate_many(Positive[int], np.array([1.5, -2.0]))
@@ -0,0 +1,90 @@
+from dataclasses import dataclass, field
+from typing import List, NamedTuple
+from unittest import TestCase
+
+from refined import refined, RefinementTypeException
+from refined.refinement_types import NonEmpty, NonEmptyString, Positive
+
+
+class TestClasses(TestCase):
+
+    def test_refine_dataclass(self):
+        @refined
+        @dataclass
+        class Payment:
+            payer: NonEmptyString
+            amount: Positive[int]
+            items: List[Positive[int]] = field(default_factory=list)
+
+        self.assertEqual(Payment("peter", 10, [1]).amount, 10)
+        self.assertIn("__refined_guard_0_0(payer)", Payment.__init__.__refined_source__)
+
+        with self.assertRaises(RefinementTypeException) as e:
+            Payment("", -10, [1, -1])
+
+        self.assertEqual(["payer", "amount", "items[1]"],
+                         [_.parameter for _ in e.exception.violations])
+
+        payment = Payment("peter", 10)
+        payment.amount = -10  # i.e. assignments are not checked by default
+        self.assertEqual(payment.amount, -10)
+
+    def test_refine_frozen_dataclass_with_validate_assignment(self):
+        @refined(validate_assignment=True)
+        @dataclass(frozen=True)
+        class Point:
+            x: Positive[int]
+
+        with self.assertRaises(RefinementTypeException):
+            Point(-1)
+
+    def test_refine_named_tuple(self):
+        @refined
+        class Point(NamedTuple):
+            x: Positive[int]
+            y: Positive[int] = 1
+
+        self.assertEqual(Point(1, 2), (1, 2))
+        self.assertEqual(Point(1), (1, 1))
+
+        with self.assertRaises(RefinementTypeException) as e:
+            Point(x=1, y=-2)
+
+        self.assertEqual(["y"], [_.parameter for _ in e.exception.violations])
+
+    def test_refine_slots_class_with_validate_assignment(self):
+        @refined(validate_assignment=True)
+        class User:
+            __slots__ = ("name", "roles")
+
+            name: NonEmptyString
+            roles: NonEmpty[list]
+
+            def __init__(self, name, roles):
+                self.name = name
+                self.roles = roles
+
+        user = User("peter", ["admin"])
+        self.assertEqual(User.__setattr__.__name__, "__setattr__")
+
+        with self.assertRaises(RefinementTypeException) as e:
+            user.name = ""
+
+        self.assertEqual(["name"], [_.parameter for _ in e.exception.violations])
+        self.assertEqual(user.name, "peter")
+
+        with self.assertRaises(RefinementTypeException):
+            User("peter", [])
+
+    def test_refine_class_with_annotated_init(self):
+        @refined
+        class Counter:
+            def __init__(self, start: Positive[int], step=1):
+                self.value, self.step = start, step
+
+        self.assertEqual(Counter(1).value, 1)
+
+        with self.assertRaises(RefinementTypeException):
+            Counter(0)
+
+        self.assertEqual(1, len(Counter.__refined_plan__))
@@ -0,0 +1,105 @@
+import inspect
+import traceback
+from unittest import TestCase
+
+from refined import refined, RefinementTypeException
+from refined.refinement_types import NonEmpty, Positive
+
+
+class TestCodegen(TestCase):
+
+    def test_wrapper_source_is_inspectable(self):
+        @refined
+        def hello(name: NonEmpty[str]) -> str:
+            return f"Hello {name}!"
+
+        self.assertTrue(hello.__refined_source__.startswith("def __refined_wrapper(name):"))
+        self.assertIn("__refined_guard_0_0(name)", hello.__refined_source__)
+
+    def test_wrapper_keeps_signature(self):
+        @refined
+        def greet(greeting, name: NonEmpty[str], *names: str, punctuation: NonEmpty[str] = "!",
+                  **kwargs):
+            return f"{greeting} {', '.join([name, *names])}{punctuation}{kwargs.get('suffix', '')}"
+
+        self.assertEqual(inspect.signature(greet).parameters.keys(),
+                         {"greeting", "name", "names", "punctuation", "kwargs"})
+        self.assertEqual(greet("Hi", "peter", "paul", suffix="?"), "Hi peter, paul!?")
+
+        with self.assertRaises(RefinementTypeException) as e:
+            greet("Hi", "", "paul", punctuation="")
+
+        self.assertEqual(["name", "punctuation"], [_.parameter for _ in e.exception.violations])
+
+        with self.assertRaises(TypeError):
+            greet("Hi")
+
+    def test_wrapper_does_not_check_default_values(self):
+        @refined
+        def repeat(value: str, times: Positive[int] = 0) -> str:
+            return value * times
+
+        self.assertEqual(repeat("a"), "")
+
+        with self.assertRaises(RefinementTypeException):
+            repeat("a", -1)
+
+    def test_wrapper_checks_default_values_passed_explicitly(self):
+        @refined
+        def repeat(value: NonEmpty[str] = "", times: Positive[int] = -1) -> str:
+            return value * times
+
+        self.assertEqual(repeat(), "")
+
+        with self.assertRaises(RefinementTypeException) as e:
+            repeat("", -1)
+
+        self.assertEqual(["value", "times"], [_.parameter for _ in e.exception.violations])
+
+        with self.assertRaises(RefinementTypeException):
+            repeat(times=-1)
+
+    def test_wrapper_checks_variadic_arguments_in_a_loop(self):
+        @refined(fail_fast=True)
+        def total(*amounts: Positive[int], **extras: Positive[int]) -> int:
+            return sum(amounts) + sum(extras.values())
+
+        self.assertIn("for __refined_item in amounts:", total.__refined_source__)
+        self.assertIn("for __refined_item in extras.values():", total.__refined_source__)
+        self.assertEqual(total(1, True, bonus=2), 4)
+
+        cases = [((1, -2), {}, "amounts[1]"), ((1,), {"bonus": 0}, "extras['bonus']")]
+
+        for args, kwargs, path in cases:
+            with self.assertRaises(RefinementTypeException) as e:
+                total(*args, **kwargs)
+
+            self.assertEqual([path], [_.parameter for _ in e.exception.violations])
+
+    def test_rebuilt_wrapper_keeps_identity(self):
+        @refined
+        def hello(name: str) -> str:
+            return f"Hello {name}!"
+
+        wrapper = hello
+        hello.__annotations__["name"] = NonEmpty[str]
+        hello.rebuild_validation_plan()
+
+        self.assertIs(wrapper, hello)
+        self.assertIn("__refined_guard_0_0(name)", hello.__refined_source__)
+
+        with self.assertRaises(RefinementTypeException):
+            wrapper("")
+
+    def test_traceback_shows_wrapper_source(self):
+        @refined(fail_fast=True)
+        def hello(name: NonEmpty[str]) -> str:
+            return f"Hello {name}!"
+
+        try:
+            hello("")
+        except RefinementTypeException as e:
+            formatted_traceback = "".join(traceback.format_tb(e.__traceback__))
+        else:
+            self.fail("RefinementTypeException not raised")
+        self.assertIn("__refined_raise(__refined_violation(None, 0, 0, name))", formatted_traceback)
@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+from refined import refined, configure, RefinementTypeException
+from refined.config import Mode, get_settings, _module_settings
+from refined.refinement_types import NonEmpty
+
+
+def hello(name: NonEmpty[str]) -> str:
+    return f"Hello {name}!"
+
+
+class TestConfig(TestCase):
+
+    def tearDown(self):
+        configure(mode=Mode.ENABLED, sample_every=1)
+        _module_settings.clear()
+
+    def test_disabled_mode_returns_function_untouched(self):
+        configure(mode="disabled")
+
+        self.assertIs(refined(hello), hello)
+
+    def test_module_mode(self):
+        configure(mode="disabled", module=__name__.rpartition(".")[0])
+
+        self.assertIs(get_settings(__name__).mode, Mode.DISABLED)
+        self.assertIs(get_settings("other_module").mode, Mode.ENABLED)
+        self.assertIs(refined(hello), hello)
+
+        configure(mode="enabled", module=__name__)
+        self.assertIsNot(refined(hello), hello)
+
+    def test_sampling_mode(self):
+        configure(mode="sampling", sample_every=3)
+        refined_hello = refined(hello)
+
+        with self.assertRaises(RefinementTypeException):
+            refined_hello("")
+
+        refined_hello("")
+        refined_hello("")
+
+        with self.assertRaises(RefinementTypeException):
+            refined_hello("")
+
+    def test_sampling_mode_keeps_default_values(self):
+        configure(mode="sampling", sample_every=2)
+
+        @refined
+        def repeat(value: str, times: NonEmpty[str] = "") -> str:
+            return value + times
+
+        self.assertEqual([repeat("a"), repeat("a"), repeat("a")], ["a", "a", "a"])
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            configure(mode="sometimes")
+
+        with self.assertRaises(ValueError):
+            configure(mode="sampling", sample_every=0)
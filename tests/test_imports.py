@@ -0,0 +1,65 @@
+import subprocess
+import sys
+from unittest import TestCase
+from typing import List
+
+# modules that must not be loaded until the names that need them are used
+HEAVY_MODULES = [
+    "numpy", "asyncio", "csv", "xml.parsers.expat", "concurrent.futures", "refined.decorator",
+    "refined.codegen", "refined.bulk", "refined.predicates.string"
+]
+
+# a generous bound on the import time of the package, in microseconds; it is about 1 ms
+MAX_IMPORT_TIME = 50_000
+
+
+def get_loaded_modules(statement: str, modules: List[str]) -> List[str]:
+    """Run a statement in a new interpreter, and get the given modules that it loads"""
+    code = f"import sys\n{statement}\nprint(' '.join(_ for _ in {modules!r} if _ in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            check=True)
+    return result.stdout.split()
+
+
+def get_import_time(module: str) -> int:
+    """
+    The cumulative import time of a module in a new interpreter, in microseconds, from
+    '-X importtime'
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True)
+    times = [_.split("|") for _ in result.stderr.splitlines() if _.startswith("import time:")]
+    return next(int(cumulative) for _, cumulative, name in times if name.strip() == module)
+
+
+class TestImports(TestCase):
+
+    def test_package_import_is_lazy(self):
+        self.assertEqual(get_loaded_modules("import refined", HEAVY_MODULES), [])
+        self.assertLess(get_import_time("refined"), MAX_IMPORT_TIME)
+
+    def test_refinement_types_only_load_their_predicates(self):
+        statement = "from refined.refinement_types import Positive, NonEmptyString"
+        self.assertEqual(get_loaded_modules(statement, HEAVY_MODULES), [])
+
+        statement = "from refined.refinement_types import XmlString"
+        self.assertIn("refined.predicates.string", get_loaded_modules(statement, HEAVY_MODULES))
+
+    def test_decorator_does_not_load_optional_dependencies(self):
+        statement = "from refined import refined, validate_many"
+        optional_modules = ["numpy", "asyncio", "concurrent.futures"]
+        self.assertEqual(get_loaded_modules(statement, optional_modules), [])
+
+    def test_lazy_names(self):
+        import refined
+        import refined.predicates
+        import refined.refinement_types
+
+        self.assertIn("refined", dir(refined))
+        self.assertIn("XmlPredicate", dir(refined.predicates))
+        self.assertIs(refined.refinement_types.NonEmptyString,
+                      refined.refinement_types.NonEmptyString)
+
+        for module in (refined, refined.predicates, refined.refinement_types):
+            with self.assertRaises(AttributeError):
+                getattr(module, "Missing")
@@ -0,0 +1,82 @@
+from functools import partial
+from unittest import TestCase
+
+from refined import (
+    refined,
+    configure,
+    stats,
+    reset_stats,
+    set_stats_callback,
+    RefinementTypeException
+)
+from refined.config import _module_settings
+from refined.refinement_types import NonEmpty, Positive
+
+_POSITIVE = "refined.predicates.numeric.PositivePredicate"
+
+
+def divide(value: Positive[int], divisor: Positive[int]) -> float:
+    return value / divisor
+
+
+class TestInstrumentation(TestCase):
+
+    def setUp(self):
+        reset_stats()
+
+    def tearDown(self):
+        configure(instrument=False)
+        _module_settings.clear()
+        set_stats_callback(None)
+
+    def test_functions_are_not_instrumented_by_default(self):
+        refined_divide = refined(divide)
+        refined_divide(4, 2)
+
+        self.assertNotIn("__refined_record", refined_divide.__refined_source__)
+        self.assertNotIn(f"{__name__}.divide", stats()["functions"])
+
+    def test_function_and_predicate_counters(self):
+        configure(instrument=True, module=__name__)
+        refined_divide = refined(divide)
+
+        refined_divide(4, 2)
+        with self.assertRaises(RefinementTypeException):
+            refined_divide(4, -2)
+
+        function_stats = stats()["functions"][f"{__name__}.divide"]
+        self.assertEqual((2, 1, 0.5), function_stats[:3])
+        self.assertGreater(function_stats.total_time, 0)
+        self.assertLessEqual(function_stats.p50, function_stats.p99)
+
+        predicate_stats = stats()["predicates"][_POSITIVE]
+        self.assertGreaterEqual(predicate_stats.calls, 4)
+        self.assertGreaterEqual(predicate_stats.failures, 1)
+
+        reset_stats()
+        self.assertNotIn(f"{__name__}.divide", stats()["functions"])
+
+    def test_generic_wrapper_is_instrumented(self):
+        configure(instrument=True)
+        refined_divide = refined(partial(divide, 4))
+
+        with self.assertRaises(RefinementTypeException):
+            refined_divide(0)
+
+        function_stats, = [_ for name, _ in stats()["functions"].items()
+                           if name.endswith("partial")]
+        self.assertEqual((1, 1), function_stats[:2])
+
+    def test_stats_callback(self):
+        events = []
+        configure(instrument=True)
+        set_stats_callback(lambda kind, name, duration, failed: events.append((kind, name, failed)))
+
+        @refined
+        def hello(name: NonEmpty[str]) -> str:
+            return f"Hello {name}!"
+
+        hello("peter")
+
+        self.assertEqual([("predicate", "refined.predicates.collection.NonEmptyPredicate", False),
+                          ("function", hello.__module__ + "." + hello.__qualname__, False)], events)
@@ -1,7 +1,9 @@
+from functools import partial
+from typing import Dict, List
 from unittest import TestCase
 
 from refined import refined, RefinementTypeException
-from refined.refinement_types import NonEmpty
+from refined.refinement_types import NonEmpty, Positive
 
 from tests.utils import get_message_lines
 
@@ -40,3 +42,151 @@ class TestMain(TestCase):
         ]
 
         self.assertEqual(expected_message_lines, get_message_lines(str(e.exception)))
+
+    def test_refine_method_with_unannotated_parameters(self):
+        @refined
+        def greet(greeting, name: NonEmpty[str], punctuation="!") -> str:
+            return f"{greeting} {name}{punctuation}"
+
+        self.assertEqual(greet("Hi", "peter"), "Hi peter!")
+        self.assertEqual(greet("Hi", name="peter", punctuation="?"), "Hi peter?")
+
+        with self.assertRaises(RefinementTypeException):
+            greet("Hi", "")
+
+        with self.assertRaises(RefinementTypeException):
+            greet("Hi", name="")
+
+    def test_rebuild_validation_plan(self):
+        @refined
+        def hello(name: str) -> str:
+            return f"Hello {name}!"
+
+        hello("")
+
+        hello.__annotations__["name"] = NonEmpty[str]
+        hello.rebuild_validation_plan()
+
+        with self.assertRaises(RefinementTypeException):
+            hello("")
+
+    def test_refine_method_reports_all_violations(self):
+        @refined
+        def greet(greeting: NonEmpty[str], name: NonEmpty[str]) -> str:
+            return f"{greeting} {name}!"
+
+        with self.assertRaises(RefinementTypeException) as e:
+            greet("", name="")
+
+        self.assertEqual(["greeting", "name"], [_.parameter for _ in e.exception.violations])
+
+    def test_refine_method_fail_fast(self):
+        @refined(fail_fast=True)
+        def greet(greeting: NonEmpty[str], name: NonEmpty[str]) -> str:
+            return f"{greeting} {name}!"
+
+        self.assertEqual(greet("Hi", "peter"), "Hi peter!")
+
+        with self.assertRaises(RefinementTypeException) as e:
+            greet("", name="")
+
+        expected_message_lines = [
+            "Conditions do not hold for the following parameters:",
+            "For parameter greeting with refined type <class 'str'>,  is not a valid value"
+        ]
+
+        self.assertEqual(expected_message_lines, get_message_lines(str(e.exception)))
+
+    def test_refine_method_formats_message_lazily(self):
+        class Name(str):
+            formatted = 0
+
+            def __format__(self, format_spec):
+                Name.formatted += 1
+                return super().__format__(format_spec)
+
+        @refined
+        def hello(name: NonEmpty[Name]) -> str:
+            return f"Hello {name}!"
+
+        with self.assertRaises(RefinementTypeException) as e:
+            hello(Name(""))
+
+        self.assertEqual(Name.formatted, 0)
+        str(e.exception)
+        self.assertEqual(Name.formatted, 1)
+
+    def test_refine_method_checks_container_items(self):
+        @refined
+        def total(amounts: List[Positive[int]], tags: Dict[str, NonEmpty[str]] = None) -> int:
+            return sum(amounts)
+
+        self.assertEqual(total([1, 2, 3], tags={"a": "b"}), 6)
+
+        with self.assertRaises(RefinementTypeException) as e:
+            total([1, -2, 3], {"a": ""})
+
+        self.assertEqual(["amounts[1]", "tags['a']"], [_.parameter for _ in e.exception.violations])
+
+    def test_refine_method_checks_variadic_arguments(self):
+        def total(start: int, *amounts: Positive[int], **extras: Positive[int]) -> int:
+            return start + sum(amounts) + sum(extras.values())
+
+        for refined_total in (refined(total), refined(partial(total))):
+            self.assertEqual(refined_total(-1, 1, 2, start_bonus=3), 5)
+            self.assertEqual(refined_total(start=-1, bonus=3), 2)
+
+            with self.assertRaises(RefinementTypeException) as e:
+                refined_total(1, 2, -3, bonus=-1)
+
+            self.assertEqual(["amounts[1]", "extras['bonus']"],
+                             [_.parameter for _ in e.exception.violations])
+
+    def test_refine_method_checks_sample_of_container_items(self):
+        @refined(max_items=100)
+        def total(amounts: List[Positive[int]]) -> int:
+            return sum(amounts)
+
+        amounts = [1] * 10000
+        amounts[1] = -1
+        self.assertEqual(total(amounts), 9998)
+
+        amounts[0] = -1
+        with self.assertRaises(RefinementTypeException):
+            total(amounts)
+
+    def test_refine_method_checks_return_value(self):
+        @refined
+        def decrement(value: int) -> Positive[int]:
+            return value - 1
+
+        self.assertEqual(decrement(2), 1)
+
+        with self.assertRaises(RefinementTypeException) as e:
+            decrement(1)
+
+        expected_message_lines = [
+            "Conditions do not hold for the return value:",
+            "For parameter return with refined type <class 'int'>, 0 is not a valid value"
+        ]
+
+        self.assertEqual(expected_message_lines, get_message_lines(str(e.exception)))
+
+        unchecked_decrement = refined(decrement.__wrapped__, validate_return=False)
+        self.assertEqual(unchecked_decrement(1), 0)
+
+        with self.assertRaises(RefinementTypeException):
+            refined(partial(decrement.__wrapped__))(1)
+
+    def test_refine_callable_rebuilds_return_check(self):
+        def decrement(value: int) -> int:
+            return value - 1
+
+        refined_decrement = refined(partial(decrement))
+        self.assertEqual(refined_decrement(1), 0)
+
+        decrement.__annotations__["return"] = Positive[int]
+        refined_decrement.rebuild_validation_plan()
+
+        with self.assertRaises(RefinementTypeException):
+            refined_decrement(1)
@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from numbers import Real
+from typing import Any, Dict, List, Mapping, Optional, Sequence, TypeVar, Union
+from unittest import TestCase
+
+from typing_extensions import Annotated, Literal
+
+from refined import refined, refine, RefinedValidator, RefinementTypeException
+from refined.matching import is_matching_type
+from refined.predicates import PositivePredicate, NonEmptyPredicate
+from refined.refinement_types import Positive, NonEmptyString, NonEmptyDict
+from refined.validator import _MAX_DISPATCH_TYPES
+
+
+class Name(str):
+    pass
+
+
+class TestMatching(TestCase):
+
+    def test_subclasses(self):
+        self.assertTrue(is_matching_type(bool, int))
+        self.assertTrue(is_matching_type(Name, str))
+        self.assertTrue(is_matching_type(OrderedDict, Dict[str, int]))
+        self.assertFalse(is_matching_type(str, int))
+        self.assertFalse(is_matching_type(int, bool))
+
+    def test_abstract_base_classes(self):
+        self.assertTrue(is_matching_type(list, Sequence[int]))
+        self.assertTrue(is_matching_type(dict, Mapping[str, int]))
+        self.assertTrue(is_matching_type(float, Real))
+        self.assertFalse(is_matching_type(set, Sequence[int]))
+
+    def test_unions_and_type_variables(self):
+        self.assertTrue(is_matching_type(type(None), Optional[int]))
+        self.assertTrue(is_matching_type(float, Union[int, float]))
+        self.assertTrue(is_matching_type(int, Optional[Positive[int]]))
+        self.assertFalse(is_matching_type(str, Optional[int]))
+        self.assertTrue(is_matching_type(bytes, Any))
+        self.assertTrue(is_matching_type(int, TypeVar("N", bound=Real)))
+        self.assertFalse(is_matching_type(str, TypeVar("N", int, float)))
+        self.assertFalse(is_matching_type(int, Literal[1]))
+
+    def test_validators_check_matching_types(self):
+        self.assertFalse(RefinedValidator(NonEmptyString).is_valid(Name("")))
+        self.assertFalse(RefinedValidator(Positive[int]).is_valid(False))
+        self.assertFalse(RefinedValidator(NonEmptyDict[str, int]).is_valid(OrderedDict()))
+        non_empty_sequence = Annotated[Sequence[int], NonEmptyPredicate[Sequence[int]]]
+        self.assertFalse(RefinedValidator(non_empty_sequence).is_valid(()))
+        self.assertFalse(RefinedValidator(Positive[int]).is_valid("a"))
+        # i.e. not checked
+        self.assertTrue(RefinedValidator(Positive[int], strict=False).is_valid("a"))
+
+    def test_refined_functions_check_matching_types(self):
+        @refined
+        def scale(name: NonEmptyString,
+                  factor: Annotated[Union[int, float], PositivePredicate[Union[int, float]]],
+                  values: List[Positive[int]] = None) -> str:
+            return name
+
+        self.assertEqual(scale(Name("a"), True), "a")
+        self.assertEqual(scale(refine("a", NonEmptyString), 1.5), "a")
+
+        with self.assertRaises(RefinementTypeException) as e:
+            scale(Name(""), -1.0, [1, -1])
+
+        self.assertEqual([_.parameter for _ in e.exception.violations],
+                         ["name", "factor", "values[1]"])
+
+    def test_validators_check_refined_members_of_unions(self):
+        optional_validator = RefinedValidator(Optional[Positive[int]])
+        union_validator = RefinedValidator(Union[Positive[int], NonEmptyString])
+
+        self.assertTrue(optional_validator.is_refined)
+        self.assertEqual([optional_validator.is_valid(_) for _ in (None, 1, Name("a"), -1, 0)],
+                         [True, True, False, False, False])
+        self.assertEqual([union_validator.is_valid(_) for _ in (1, "a", Name("a"), -1, "", None)],
+                         [True, True, True, False, False, False])
+        self.assertEqual(RefinedValidator(List[Optional[Positive[int]]])
+                         .first_violation([1, None, -1], "values").parameter, "values[2]")
+
+    def test_refined_functions_check_refined_members_of_unions(self):
+        @refined
+        def label(count: Optional[Positive[int]] = None,
+                  name: Union[Positive[int], NonEmptyString] = "a") -> str:
+            return f"{name}: {count}"
+
+        self.assertEqual(label(), "a: None")
+        self.assertEqual(label(None, 1), "1: None")
+
+        with self.assertRaises(RefinementTypeException) as e:
+            label(-1, "")
+
+        self.assertEqual([_.parameter for _ in e.exception.violations], ["count", "name"])
+
+        with self.assertRaises(RefinementTypeException):
+            label(name=-1)
+
+    def test_dispatch_is_bounded(self):
+        validator = RefinedValidator(Positive[int])
+        types = [type(f"Int{_}", (int,), {}) for _ in range(_MAX_DISPATCH_TYPES + 1)]
+
+        self.assertTrue(all(validator.is_valid(_(1)) for _ in types))
+        self.assertLessEqual(len(validator._dispatches), _MAX_DISPATCH_TYPES)
@@ -0,0 +1,85 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from refined import refined, RefinementTypeException
+from refined.parallel import get_shared_pool
+from refined.refinement_types import CsvString, NonEmpty, XmlString
+
+DOCUMENT = "<a>" + "<b/>" * 100 + "</a>"
+TABLE = "a,b\n" * 100
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.submitted = []
+
+    def submit(self, function, *args, **kwargs):
+        self.submitted.append(args[0])
+        return super().submit(function, *args, **kwargs)
+
+
+class TestParallel(TestCase):
+
+    def test_expensive_parameters_are_checked_at_once(self):
+        with RecordingExecutor() as executor:
+            @refined(parallel=executor, parallel_min_size=10)
+            def merge(first: XmlString, second: XmlString, table: CsvString,
+                      tag: NonEmpty[str]) -> str:
+                return tag
+
+            self.assertIn("__refined_check_concurrently((first, second, table, ))",
+                          merge.__refined_source__)
+            self.assertIn("__refined_guard_3_0(tag)", merge.__refined_source__)
+            self.assertEqual(merge(DOCUMENT, DOCUMENT, TABLE, "a"), "a")
+            # i.e. the caller checks the table
+            self.assertEqual(executor.submitted, [DOCUMENT, DOCUMENT])
+
+            with self.assertRaises(RefinementTypeException) as e:
+                merge(DOCUMENT, DOCUMENT[:-1], TABLE, "")
+
+            self.assertEqual([_.parameter for _ in e.exception.violations], ["second", "tag"])
+
+    def test_default_values_passed_explicitly_are_checked(self):
+        @refined(parallel=True, parallel_min_size=10)
+        def merge(first: XmlString = "<a", second: XmlString = "<b") -> None:
+            pass
+
+        merge()
+        merge(DOCUMENT, DOCUMENT)
+
+        with self.assertRaises(RefinementTypeException) as e:
+            merge("<a", "<b")
+
+        self.assertEqual([_.parameter for _ in e.exception.violations], ["first", "second"])
+
+    def test_small_values_are_checked_inline(self):
+        with RecordingExecutor() as executor:
+            @refined(parallel=executor)
+            def merge(first: XmlString, second: XmlString) -> None:
+                pass
+
+            merge("<a/>", DOCUMENT)
+
+            with self.assertRaises(RefinementTypeException):
+                merge("<a", "<b")
+
+            self.assertEqual(executor.submitted, [])
+
+    def test_fail_fast(self):
+        @refined(parallel=True, parallel_min_size=10, fail_fast=True)
+        def merge(first: XmlString, second: XmlString, third: XmlString) -> None:
+            pass
+
+        with self.assertRaises(RefinementTypeException) as e:
+            merge(DOCUMENT[:-1], DOCUMENT[:-1], DOCUMENT)
+
+        self.assertEqual([_.parameter for _ in e.exception.violations], ["first"])
+        self.assertIs(get_shared_pool(), get_shared_pool())
+
+    def test_single_expensive_parameter_is_checked_inline(self):
+        @refined(parallel=True)
+        def parse(document: XmlString, tag: NonEmpty[str]) -> str:
+            return tag
+
+        self.assertNotIn("__refined_check_concurrently", parse.__refined_source__)
@@ -0,0 +1,84 @@
+import pickle
+from unittest import TestCase
+
+import numpy as np
+from typing_extensions import Annotated
+
+from refined import refined, validate_many, RefinedValidator, RefinementTypeException
+from refined.predicates import And, Or, Not, CompositePredicate
+from refined.predicates import PositivePredicate, EmptyPredicate, NonEmptyPredicate, XmlPredicate
+from refined.predicates.numeric import Greater, Less, InRange, Modulo
+
+
+class TestPredicatesAlgebra(TestCase):
+
+    def test_operators(self):
+        percentage = Greater[0] & Less[100]
+
+        self.assertIsInstance(percentage, CompositePredicate)
+        self.assertEqual(percentage, And[Greater[0], Less[100]])
+        self.assertEqual(Greater[0] | Less[100], Or[Greater[0], Less[100]])
+        self.assertEqual(~Greater[0], Not[Greater[0]])
+        self.assertEqual([percentage.type_guard(_) for _ in (0, 1, 99, 100)],
+                         [False, True, True, False])
+
+    def test_intervals_are_fused(self):
+        predicate = And[PositivePredicate[int], Greater[-10], InRange[-5, 50], Less[50]]
+        source = predicate.type_guard.__refined_source__
+
+        self.assertIn("return (__refined_constant_0 < value < __refined_constant_1)", source)
+        self.assertNotIn("__refined_guard", source)
+        self.assertEqual([predicate.type_guard(_) for _ in (0, 1, 49, 50)],
+                         [False, True, True, False])
+
+    def test_nested_combinations_are_flattened(self):
+        predicate = Or[Less[-100], And[And[Greater[0], Modulo[2]], Not[Not[Less[10]]]]]
+        source = predicate.type_guard.__refined_source__
+
+        self.assertEqual(source.count("__refined_guard"), 1)  # i.e. only 'Modulo' is called
+        self.assertNotIn("not", source)
+        self.assertEqual([predicate.type_guard(_) for _ in (-200, 2, 3, 12)],
+                         [True, True, False, False])
+
+    def test_refined_types_with_combinations(self):
+        @refined
+        def parse(document: Annotated[str, Or[EmptyPredicate[str], XmlPredicate[str]]],
+                  tag: Annotated[str, Not[EmptyPredicate[str]]]) -> str:
+            return tag
+
+        self.assertEqual(parse("", "a"), "a")
+        self.assertEqual(parse("<a/>", "a"), "a")
+
+        with self.assertRaises(RefinementTypeException) as e:
+            parse("<a", "")
+
+        self.assertEqual([_.parameter for _ in e.exception.violations], ["document", "tag"])
+
+    def test_combinations_accept_what_all_operands_accept(self):
+        non_empty_or_xml = Or[NonEmptyPredicate[str], XmlPredicate[str]]
+        non_empty_or_greater = Or[NonEmptyPredicate[str], Greater["a"]]
+        non_empty_and_positive = And[NonEmptyPredicate[str], PositivePredicate[int]]
+
+        self.assertTrue(RefinedValidator(Annotated[str, non_empty_or_xml])._is_compatible)
+        self.assertFalse(RefinedValidator(Annotated[str, non_empty_or_greater])._is_compatible)
+        self.assertFalse(RefinedValidator(Annotated[str, non_empty_and_positive]).is_valid("a"))
+
+    def test_cost_and_vectorized_type_guard(self):
+        self.assertEqual(Or[EmptyPredicate[str], XmlPredicate[str]].cost, 1 + XmlPredicate.cost)
+        self.assertIsNone(Or[EmptyPredicate[str], XmlPredicate[str]].vectorized_type_guard)
+
+        values = np.array([-5, 0, 5, 50, 150])
+        mask = validate_many(Annotated[int, (Greater[0] & Less[100]) | Less[-1]], values)
+
+        self.assertEqual(mask.tolist(), [True, False, True, True, False])
+
+    def test_pickle(self):
+        predicate = Not[Greater[0] & Less[100]]
+        unpickled = pickle.loads(pickle.dumps(predicate))
+
+        self.assertEqual(unpickled, predicate)
+        self.assertTrue(unpickled.type_guard(100))
+
+    def test_not_takes_a_single_predicate(self):
+        with self.assertRaises(TypeError):
+            Not[Greater[0], Less[100]]
@@ -0,0 +1,74 @@
+import importlib.util
+from typing import List
+from unittest import TestCase, skipIf
+
+import numpy as np
+from typing_extensions import Annotated
+
+from refined import refined, RefinedValidator, RefinementTypeException
+from refined.predicates import Elementwise
+from refined.predicates.numeric import Greater, Less, InRange
+from refined.refinement_types import PositiveArray, NegativeArray, NonNanArray
+
+HAS_PANDAS = importlib.util.find_spec("pandas") is not None
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+class TestPredicatesArray(TestCase):
+
+    def test_numpy_arrays(self):
+        self.assertTrue(RefinedValidator(PositiveArray[np.ndarray]).is_valid(np.arange(1, 10)))
+        self.assertFalse(RefinedValidator(PositiveArray[np.ndarray]).is_valid(np.arange(0, 10)))
+        self.assertTrue(RefinedValidator(NegativeArray[np.ndarray]).is_valid(-np.ones((3, 3))))
+        self.assertTrue(RefinedValidator(NonNanArray[np.ndarray]).is_valid(np.zeros(0)))
+        self.assertFalse(RefinedValidator(NonNanArray[np.ndarray]).is_valid(
+            np.array([1.0, np.nan])))
+
+    def test_elementwise(self):
+        validator = RefinedValidator(Annotated[np.ndarray, Elementwise[InRange[0, 1]]])
+
+        self.assertTrue(validator.is_valid(np.random.rand(1000)))
+        self.assertFalse(validator.is_valid(np.array([0.5, 1.5])))
+        self.assertTrue(RefinedValidator(Annotated[np.ndarray, Elementwise[Greater[0] & Less[1]]])
+                        .is_valid(np.array([0.5])))
+
+    def test_values_that_can_not_be_checked_do_not_hold(self):
+        self.assertFalse(RefinedValidator(Annotated[np.ndarray, Elementwise[InRange[0, 1]]])
+                         .is_valid(np.array(["a"], dtype=object)))
+        self.assertFalse(RefinedValidator(PositiveArray[List[int]]).is_valid([1, None]))
+
+    def test_iterables_are_checked_value_by_value(self):
+        self.assertTrue(RefinedValidator(PositiveArray[List[int]]).is_valid([1, 2, 3]))
+        self.assertFalse(RefinedValidator(PositiveArray[List[int]]).is_valid([1, -2, 3]))
+
+    def test_decorator(self):
+        @refined
+        def normalize(weights: Annotated[np.ndarray, Elementwise[InRange[0, 1]]]) -> np.ndarray:
+            return weights / weights.sum()
+
+        self.assertEqual(normalize(np.array([0.5, 0.5])).tolist(), [0.5, 0.5])
+
+        with self.assertRaises(RefinementTypeException) as e:
+            normalize(np.array([0.5, 2.0]))
+
+        self.assertEqual(e.exception.violations[0].parameter, "weights")
+
+    @skipIf(not HAS_PANDAS, "pandas is not installed")
+    def test_pandas(self):
+        import pandas as pd
+
+        series_validator = RefinedValidator(PositiveArray[pd.Series])
+        frame_validator = RefinedValidator(PositiveArray[pd.DataFrame])
+
+        self.assertTrue(series_validator.is_valid(pd.Series([1, 2])))
+        self.assertFalse(series_validator.is_valid(pd.Series([1, None], dtype="Int64")))
+        self.assertFalse(frame_validator.is_valid(pd.DataFrame({"a": [1], "b": [-1]})))
+
+    @skipIf(not HAS_PYARROW, "pyarrow is not installed")
+    def test_pyarrow(self):
+        import pyarrow as pa
+
+        chunked_validator = RefinedValidator(PositiveArray[pa.ChunkedArray])
+
+        self.assertTrue(chunked_validator.is_valid(pa.chunked_array([[1], [2]])))
+        self.assertFalse(chunked_validator.is_valid(pa.chunked_array([[1], [None]])))
@@ -0,0 +1,100 @@
+from typing import Any, Dict, Generic, Tuple, TypeVar
+from unittest import TestCase
+
+from typing_extensions import Annotated, TypeGuard
+
+from refined import refined, RefinedValidator, RefinementTypeException
+from refined.predicates import RefinementPredicate, IPv4Predicate, ResultCache, cache_results
+from refined.refinement_types import IPv4String
+
+_S = TypeVar("_S", bound=str)
+
+
+class _CountingPredicate(Generic[_S], RefinementPredicate):
+    evaluated = []
+
+    @staticmethod
+    def type_guard(value: _S, *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> TypeGuard[_S]:
+        _CountingPredicate.evaluated.append(value)
+        return value.startswith("<")
+
+
+class TestPredicatesCache(TestCase):
+
+    def tearDown(self):
+        cache_results(_CountingPredicate, maxsize=0)
+        cache_results(IPv4Predicate, maxsize=0)
+        _CountingPredicate.evaluated.clear()
+
+    def test_cache_is_opt_in(self):
+        validator = RefinedValidator(Annotated[str, _CountingPredicate[str]])
+
+        for _ in range(3):
+            self.assertTrue(validator.is_valid("<a/>"))
+
+        self.assertEqual(3, len(_CountingPredicate.evaluated))
+
+    def test_cached_results(self):
+        cache = cache_results(_CountingPredicate)
+        validator = RefinedValidator(Annotated[str, _CountingPredicate[str]])
+
+        for _ in range(3):
+            self.assertTrue(validator.is_valid("<a/>"))
+            self.assertFalse(validator.is_valid("a"))
+
+        self.assertEqual(["<a/>", "a"], _CountingPredicate.evaluated)
+        self.assertEqual((4, 2, 2), cache.info()[:2] + (cache.info().currsize,))
+
+        cache.clear()
+        self.assertEqual((0, 0, 0), (cache.info().hits, cache.info().misses, cache.info().currsize))
+
+    def test_cache_only_holds_immutable_values(self):
+        class Document(str):
+            pass
+
+        cache_results(_CountingPredicate)
+        validator = RefinedValidator(Annotated[str, _CountingPredicate[str]])
+        type_guard = validator.predicates[0].type_guard
+
+        for _ in range(2):
+            self.assertTrue(type_guard(Document("<a/>")))
+
+        self.assertEqual(2, len(_CountingPredicate.evaluated))
+
+    def test_cache_evicts_least_recently_used(self):
+        cache = ResultCache(maxsize=2)
+        type_guard = cache.wrap(_CountingPredicate.type_guard)
+
+        for value in ("<a/>", "<b/>", "<a/>", "<c/>", "<a/>", "<b/>"):
+            type_guard(value)
+
+        self.assertEqual(["<a/>", "<b/>", "<c/>", "<b/>"], _CountingPredicate.evaluated)
+        self.assertEqual(2, cache.info().currsize)
+
+    def test_cache_bounds_size_of_values(self):
+        cache = ResultCache(maxsize=100, max_bytes=10)
+        type_guard = cache.wrap(_CountingPredicate.type_guard)
+
+        for value in ("<aaaa/>", "<bb/>", "<" * 11, "<bb/>"):
+            type_guard(value)
+
+        self.assertEqual((1, 5), (cache.info().currsize, cache.info().nbytes))
+        self.assertEqual(["<aaaa/>", "<bb/>", "<" * 11], _CountingPredicate.evaluated)
+
+        with self.assertRaises(ValueError):
+            ResultCache(maxsize=0)
+
+    def test_cache_applies_to_decorated_functions(self):
+        cache = cache_results(IPv4Predicate)
+
+        @refined
+        def connect(address: IPv4String) -> str:
+            return address
+
+        for _ in range(3):
+            connect("10.0.0.1")
+
+            with self.assertRaises(RefinementTypeException):
+                connect("10.0.0")
+
+        self.assertEqual((4, 2), (cache.info().hits, cache.info().misses))
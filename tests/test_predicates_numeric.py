@@ -1,6 +1,12 @@
+from typing import List
 from unittest import TestCase
 
-from refined import refined, RefinementTypeException
+from typing_extensions import Annotated, Literal
+
+from refined import refined, validate_many, RefinedValidator, RefinementTypeException
+from refined.predicates import BoundPredicate
+from refined.predicates.common import ValueRangePredicate
+from refined.predicates.numeric import Greater, Less, Divisible, InRange
 from refined.refinement_types import Positive, Negative
 
 from tests.utils import get_message_lines
@@ -41,3 +47,51 @@ class TestPredicatesNumeric(TestCase):
         ]
 
         self.assertEqual(expected_message_lines, get_message_lines(str(e.exception)))
+
+    def test_parameterized_predicates(self):
+        @refined
+        def score(value: Annotated[int, Greater[Literal[0]], Less[100]],
+                  bonus: Annotated[int, Divisible[5]] = 0,
+                  history: Annotated[List[int], ValueRangePredicate[0, 100]] = None
+                  ) -> Annotated[int, InRange[0, 105]]:
+            return value + bonus
+
+        self.assertEqual(score(10, 5, history=[0, 100]), 15)
+
+        with self.assertRaises(RefinementTypeException) as e:
+            score(100, 3, history=[101])
+
+        self.assertEqual(["value", "bonus", "history"],
+                         [_.parameter for _ in e.exception.violations])
+
+        with self.assertRaises(RefinementTypeException):
+            score(99, 10)
+
+    def test_parameterized_predicates_are_bound_once(self):
+        predicate = Greater[Literal[10]]
+
+        self.assertIsInstance(predicate, BoundPredicate)
+        self.assertEqual(predicate, Greater[10])
+        self.assertEqual(hash(predicate), hash(Greater[10]))
+        self.assertEqual(repr(InRange[0, 1]), "refined.predicates.numeric.InRange[0, 1]")
+        self.assertEqual(predicate.parameters, (10,))
+        self.assertTrue(predicate.type_guard(11))
+        self.assertFalse(predicate.type_guard(10))
+
+        # type parameters still make generic aliases, and the unbound type guard still works
+        self.assertNotIsInstance(Greater[int], BoundPredicate)
+        self.assertTrue(Greater.type_guard(11, Literal[10]))
+        self.assertTrue(Divisible.type_guard(9, 3))
+
+    def test_parameterized_predicates_are_vectorized(self):
+        validator = RefinedValidator(Annotated[float, InRange[0, 1]])
+
+        self.assertEqual(validate_many(validator, [0.5, 1.5, -0.5]), [True, False, False])
+
+        try:
+            import numpy as np
+        except ImportError:
+            return
+
+        indices = validate_many(validator, np.array([0.5, 1.5, -0.5]), return_indices=True)
+        self.assertEqual(indices.tolist(), [1, 2])
@@ -0,0 +1,32 @@
+from unittest import TestCase
+from collections.abc import Collection, Iterable
+from numbers import Real
+
+from refined.predicates import PositivePredicate, NonEmptyPredicate
+from refined.predicates.common import ValueRangePredicate
+from refined.predicates.registry import get_predicate_metadata, is_predicate_compatible
+
+
+class TestPredicatesRegistry(TestCase):
+
+    def test_metadata_resolves_bounds(self):
+        metadata = get_predicate_metadata(NonEmptyPredicate[str])
+
+        self.assertIs(metadata.input_bound, Collection)
+        self.assertIs(metadata.type_guard_bound, Collection)
+        self.assertIs(get_predicate_metadata(NonEmptyPredicate[str]), metadata)
+
+    def test_metadata_resolves_generic_bounds(self):
+        metadata = get_predicate_metadata(ValueRangePredicate[list])
+
+        self.assertIs(metadata.input_bound, Iterable)
+
+    def test_compatibility_does_not_mutate_annotations(self):
+        annotations = dict(PositivePredicate.type_guard.__annotations__)
+
+        for _ in range(3):
+            self.assertTrue(is_predicate_compatible(int, PositivePredicate[int]))
+            self.assertFalse(is_predicate_compatible(str, PositivePredicate[int]))
+
+        self.assertEqual(annotations, PositivePredicate.type_guard.__annotations__)
+        self.assertIs(get_predicate_metadata(PositivePredicate[int]).input_bound, Real)
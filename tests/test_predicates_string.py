@@ -4,15 +4,33 @@ from xml.etree import ElementTree as ET
 from unittest import TestCase
 from numbers import Real
 from typing import List
-from io import StringIO
+from io import StringIO, BytesIO, RawIOBase
+from mmap import mmap
+from tempfile import TemporaryFile
 
+from typing_extensions import Annotated
 
 from refined import refined, RefinementTypeException
 from refined.refinement_types import *
+from refined.predicates import (
+    XmlPredicate,
+    CsvPredicate,
+    ValidIntPredicate,
+    IPv4Predicate,
+    IPv6Predicate
+)
 
 from tests.utils import get_message_lines
 
 
+class UnseekableStream(RawIOBase):
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return 0
+
+
 def base_conversion(num: Real, base: int) -> List[int]:
     digits = []
     while num > 0:
@@ -127,3 +145,107 @@ class TestPredicatesString(TestCase):
         ]
 
         self.assertEqual(expected_message_lines, get_message_lines(str(e.exception)))
+
+    def test_predicate_well_formed_xml_document(self):
+        @refined
+        def get_tree_root(value: Annotated[bytes, XmlPredicate[bytes]]) -> ET.Element:
+            return ET.fromstring(value)
+
+        self.assertEqual(get_tree_root(b"<note><to>Tove</to></note>").tag, "note")
+
+        with self.assertRaises(RefinementTypeException):
+            get_tree_root(b"<note><to>Tove</note>")
+
+        self.assertTrue(XmlPredicate.type_guard(BytesIO(b"<note></note>")))
+        self.assertTrue(XmlPredicate.type_guard(StringIO("<note></note>")))
+        self.assertFalse(XmlPredicate.type_guard(BytesIO(b"<note>")))
+
+    def test_predicate_well_formed_xml_mmap(self):
+        with TemporaryFile() as f:
+            f.write(b"<note><to>Tove</to></note>")
+            f.flush()
+
+            with mmap(f.fileno(), 0) as document:
+                self.assertTrue(XmlPredicate.type_guard(document))
+
+    def test_predicate_well_formed_xml_limits(self):
+        document = "<a><b><c></c></b></a>"
+
+        self.assertTrue(XmlPredicate.type_guard(document, max_depth=3, max_bytes=len(document)))
+        self.assertFalse(XmlPredicate.type_guard(document, max_depth=2))
+        self.assertFalse(XmlPredicate.type_guard(document, max_bytes=len(document) - 1))
+
+    def test_predicate_xml_with_bound_limits(self):
+        document = "<a><b><c></c></b></a>"
+
+        @refined
+        def parse(value: Annotated[str, XmlPredicate[len(document), 3]]) -> str:
+            return value
+
+        self.assertEqual(parse(document), document)
+
+        with self.assertRaises(RefinementTypeException):
+            parse(document + " ")  # i.e. too large
+
+        with self.assertRaises(RefinementTypeException):
+            parse("<a>" + document + "</a>")  # i.e. too deep
+
+        self.assertFalse(XmlPredicate[None, 2].type_guard(document))
+        self.assertEqual(repr(XmlPredicate[None, 2]),
+                         "refined.predicates.string.XmlPredicate[None, 2]")
+
+    def test_predicate_documents_keep_stream_position(self):
+        documents = [(XmlPredicate, "<note></note>"), (CsvPredicate, "a,b\r\n1,2\r\n")]
+
+        for predicate, document in documents:
+            for stream in [StringIO("header" + document), BytesIO(("header" + document).encode())]:
+                stream.seek(6)
+
+                self.assertTrue(predicate.type_guard(stream))
+                self.assertEqual(stream.tell(), 6)
+                self.assertEqual(len(stream.read()), len(document))
+
+            with self.assertRaises(ValueError):
+                predicate.type_guard(UnseekableStream())
+
+    def test_predicate_well_formed_csv_document(self):
+        document = 'name,quote\r\npeter,"hello,\nthere"\r\n'
+
+        self.assertTrue(CsvPredicate.type_guard(document))
+        self.assertTrue(CsvPredicate.type_guard(document.encode()))
+        self.assertTrue(CsvPredicate.type_guard(BytesIO(document.encode())))
+        self.assertFalse(CsvPredicate.type_guard(b"\xff\xfe"))
+        self.assertFalse(CsvPredicate.type_guard(document, max_bytes=10))
+
+    def test_predicate_csv_with_bound_separator(self):
+        semicolon_csv = CsvPredicate[';']
+
+        self.assertTrue(semicolon_csv.type_guard('name;quote\r\npeter;"hello; there"\r\n'))
+        self.assertFalse(semicolon_csv.type_guard('"' + "a" * 200_000))
+        self.assertEqual(repr(semicolon_csv), "refined.predicates.string.CsvPredicate[';']")
+
+    def test_predicate_scanners(self):
+        valid_ints = ["10", " -3 ", "+1_000", "\u0661\u0662"]
+        invalid_ints = ["1__0", "_1", "1_", "", " ", "1.0", "0x1f"]
+        valid_ipv4s = ["0.0.0.0", "255.255.255.255", "10.0.0.1"]
+        invalid_ipv4s = ["256.0.0.1", "01.2.3.4", "1.2.3", "1.2.3.4 ", "::1"]
+        valid_ipv6s = [
+            "::", "::1", "1::", "fe80::1%eth0", "1:2:3:4:5:6:7:8", "1:2:3:4:5:6:7::",
+            "::ffff:1.2.3.4", "1:2:3:4:5:6:1.2.3.4"
+        ]
+        invalid_ipv6s = [
+            "1:2:3:4:5:6::1.2.3.4", "1:2:3:4:5:6:7:8:9", ":1::2", "1::2::3", "12345::", "fe80::1%",
+            "1.2.3.4"
+        ]
+        cases = [
+            (ValidIntPredicate, valid_ints, invalid_ints),
+            (IPv4Predicate, valid_ipv4s, invalid_ipv4s),
+            (IPv6Predicate, valid_ipv6s, invalid_ipv6s),
+        ]
+
+        for predicate, valid_values, invalid_values in cases:
+            for value in valid_values:
+                self.assertTrue(predicate.type_guard(value), value)
+
+            for value in invalid_values:
+                self.assertFalse(predicate.type_guard(value), value)
@@ -0,0 +1,106 @@
+import pickle
+from unittest import TestCase
+from typing import Generic, TypeVar
+
+from typing_extensions import Annotated, TypeGuard
+
+from refined import ProvenValue, RefinedValidator, RefinementTypeException, refine, refined
+from refined.predicates import NonEmptyPredicate, RefinementPredicate, XmlPredicate
+from refined.predicates.numeric import Greater
+from refined.refinement_types import NonEmptyList, NonEmptyString, Positive, XmlString
+
+_S = TypeVar("_S", bound=str)
+
+
+class CountingXmlPredicate(Generic[_S], RefinementPredicate):
+    calls = 0
+
+    @staticmethod
+    def type_guard(value: _S, *args, **kwargs) -> TypeGuard[_S]:
+        CountingXmlPredicate.calls += 1
+        return XmlPredicate.type_guard(value)
+
+
+CountedXmlString = Annotated[str, CountingXmlPredicate[str]]
+
+
+class TestProof(TestCase):
+
+    def setUp(self):
+        CountingXmlPredicate.calls = 0
+
+    def test_refine_returns_proven_value(self):
+        document = refine("<a></a>", XmlString)
+
+        self.assertIsInstance(document, str)
+        self.assertIsInstance(document, ProvenValue)
+        self.assertEqual(document, "<a></a>")
+        self.assertEqual(type(document).__refined_proof__, frozenset({XmlPredicate}))
+
+    def test_refine_raises_for_invalid_values(self):
+        with self.assertRaises(RefinementTypeException):
+            refine("<a>", XmlString)
+
+        with self.assertRaises(TypeError):
+            refine(3, XmlString)
+
+    def test_proofs_accumulate(self):
+        document = refine(refine("<a></a>", XmlString), NonEmptyString)
+
+        self.assertEqual(type(document).__refined_proof__,
+                         frozenset({XmlPredicate, NonEmptyPredicate}))
+        self.assertIs(type(refine(document, XmlString)), type(document))
+
+    def test_refined_functions_skip_proven_predicates(self):
+        @refined
+        def parse(document: CountedXmlString) -> str:
+            return document
+
+        @refined(fail_fast=True)
+        def forward(document: Annotated[str, NonEmptyPredicate[str],
+                                        CountingXmlPredicate[str]]) -> str:
+            return parse(document)
+
+        document = refine("<a></a>", CountedXmlString)
+        self.assertEqual(CountingXmlPredicate.calls, 1)
+
+        self.assertEqual(forward(document), "<a></a>")
+        self.assertEqual(CountingXmlPredicate.calls, 1)
+
+        # the predicates that are not proven are still checked
+        with self.assertRaises(RefinementTypeException):
+            forward(refine("<a>", NonEmptyString))
+
+        self.assertEqual(CountingXmlPredicate.calls, 2)
+        self.assertEqual(forward("<a></a>"), "<a></a>")
+        self.assertEqual(CountingXmlPredicate.calls, 4)
+
+    def test_validators_skip_proven_predicates(self):
+        validator = RefinedValidator(Annotated[int, Greater[10], Greater[0]])
+        value = refine(20, Annotated[int, Greater[10]])
+
+        self.assertTrue(validator.is_valid(value))
+        self.assertEqual(validator.errors(value), [])
+        self.assertEqual(validator._dispatch(type(value))[0][0].predicate, Greater[0])
+        self.assertIsNotNone(validator.first_violation(refine(-1, Annotated[int, Greater[-2]])))
+
+    def test_mutable_values_are_not_proven(self):
+        values = [1, 2]
+
+        self.assertIs(refine(values, NonEmptyList[int]), values)
+        self.assertNotIsInstance(refine(values, NonEmptyList[int]), ProvenValue)
+
+    def test_proof_is_lost_by_new_values_and_pickling(self):
+        document = refine("<a></a>", XmlString)
+
+        self.assertNotIsInstance(document + "<b/>", ProvenValue)
+        self.assertIs(type(pickle.loads(pickle.dumps(document))), str)
+        self.assertIs(type(pickle.loads(pickle.dumps(refine(3, Positive[int])))), int)
+
+    def test_proven_values_of_other_types_are_not_checked(self):
+        @refined
+        def parse(document: XmlString) -> int:
+            return 0
+
+        self.assertEqual(parse(refine(3, Positive[int])), 0)
+        self.assertFalse(RefinedValidator(XmlString, strict=False).errors(refine(3, Positive[int])))
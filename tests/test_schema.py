@@ -0,0 +1,152 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+from unittest import TestCase
+
+from typing_extensions import NotRequired, Required, TypedDict
+
+from refined import compile_schema, RefinementTypeException
+from refined.refinement_types import NonEmptyList, NonEmptyString, Positive
+from refined.schema import MISSING
+
+
+class Address(TypedDict):
+    zip: NonEmptyString
+    city: str
+
+
+class Order(TypedDict):
+    id: Positive[int]
+    email: NonEmptyString
+    items: List[Positive[int]]
+    address: Address
+
+
+class Shipment(TypedDict, total=False):
+    address: Required[Address]
+    return_address: Optional[Address]
+
+
+class Note(TypedDict, total=False):
+    text: NonEmptyString
+
+
+class Comment(TypedDict, total=False):
+    author: Required[NonEmptyString]
+    text: NotRequired[NonEmptyString]
+
+
+class Reply(TypedDict):
+    author: Required[NonEmptyString]
+    text: NotRequired[NonEmptyString]
+    score: Positive[int]
+
+
+@dataclass
+class Item:
+    id: Positive[int]
+    tags: NonEmptyList[str] = field(default_factory=lambda: ["new"])
+    comment: Optional[NonEmptyString] = None
+
+
+VALID_ORDER = {"id": 1, "email": "a@b.c", "items": [1, 2], "address": {"zip": "1000", "city": ""}}
+
+
+class TestSchema(TestCase):
+
+    def test_typed_dict(self):
+        validator = compile_schema(Order)
+
+        self.assertTrue(validator.is_valid(VALID_ORDER))
+        self.assertIs(validator.check(VALID_ORDER), VALID_ORDER)
+        self.assertEqual(validator.errors(VALID_ORDER), [])
+
+        errors = validator.errors({"id": -1, "email": "", "items": [1, 0], "address": {"zip": ""}})
+        self.assertEqual([_.parameter for _ in errors],
+                         ["id", "email", "items[1]", "address['zip']"])
+
+    def test_missing_fields(self):
+        errors = compile_schema(Order).errors({"id": 1, "address": {}})
+
+        self.assertEqual([_.parameter for _ in errors], ["email", "items", "address['zip']"])
+        self.assertTrue(all(_.value is MISSING for _ in errors))
+        self.assertTrue(compile_schema(Note).is_valid({}))
+        self.assertFalse(compile_schema(Note).is_valid({"text": ""}))
+
+    def test_nested_fields_that_are_not_mappings(self):
+        errors = compile_schema(Order).errors({**VALID_ORDER, "address": 5})
+
+        self.assertEqual([(_.parameter, _.value) for _ in errors], [("address", 5)])
+
+        shipment = compile_schema(Shipment)
+        address = VALID_ORDER["address"]
+
+        self.assertTrue(shipment.is_valid({"address": address}))
+        self.assertTrue(shipment.is_valid({"address": address, "return_address": None}))
+        self.assertFalse(shipment.is_valid({"address": None}))
+        errors = shipment.errors({"address": [], "return_address": ""})
+        self.assertEqual([_.parameter for _ in errors], ["address", "return_address"])
+
+        with self.assertRaises(RefinementTypeException):
+            compile_schema(Shipment, fail_fast=True).check({"address": address,
+                                                            "return_address": 1})
+
+    def test_required_and_not_required_fields(self):
+        comment, reply = compile_schema(Comment), compile_schema(Reply)
+
+        self.assertEqual([(_.name, _.is_required) for _ in comment.fields],
+                         [("author", True), ("text", False)])
+        self.assertEqual([(_.name, _.is_required) for _ in reply.fields],
+                         [("author", True), ("text", False), ("score", True)])
+        self.assertTrue(comment.is_valid({"author": "a"}))
+        self.assertFalse(comment.is_valid({"text": "b"}))
+        self.assertTrue(reply.is_valid({"author": "a", "score": 1}))
+        errors = reply.errors({"author": "", "text": "", "score": 1})
+        self.assertEqual([_.parameter for _ in errors], ["author", "text"])
+        self.assertEqual([_.parameter for _ in reply.errors({"a": -1, "score": 1})], ["author"])
+
+    def test_dataclass(self):
+        validator = compile_schema(Item)
+
+        self.assertTrue(validator.is_valid({"id": 1, "comment": None}))
+        self.assertFalse(validator.is_valid({"id": 1, "tags": []}))
+        self.assertFalse(validator.is_valid({"id": 1, "comment": ""}))
+        self.assertEqual([_.parameter for _ in validator.errors({"tags": []})], ["id", "tags"])
+
+    def test_mapping_schema(self):
+        validator = compile_schema({"id": Positive[int], "name": str})
+
+        self.assertEqual([_.name for _ in validator.fields], ["id"])
+        self.assertTrue(validator.is_valid({"id": 1}))
+        # i.e. values of other types are not checked
+        self.assertTrue(validator.is_valid({"id": "1"}))
+        self.assertFalse(validator.is_valid({}))
+
+    def test_check(self):
+        with self.assertRaises(RefinementTypeException) as e:
+            compile_schema(Order).check({"id": 0, "email": ""})
+
+        self.assertEqual(len(e.exception.violations), 4)
+
+        with self.assertRaises(RefinementTypeException) as e:
+            compile_schema(Order, fail_fast=True).check({"id": 0, "email": ""})
+
+        self.assertEqual([_.parameter for _ in e.exception.violations], ["id"])
+
+    def test_invalid_schemas_and_payloads(self):
+        with self.assertRaises(TypeError):
+            compile_schema(int)
+
+        self.assertFalse(compile_schema(Order).is_valid([VALID_ORDER]))
+        self.assertFalse(compile_schema(Order).is_valid(None))
+
+        with self.assertRaises(TypeError):
+            compile_schema(Order).check([VALID_ORDER])
+
+    def test_items_are_checked_inline(self):
+        validator = compile_schema({"values": List[Positive[int]]})
+
+        self.assertIn("for __refined_item in", validator._find_violations.__refined_source__)
+        self.assertTrue(validator.is_valid({"values": [1, 2, True]}))
+        self.assertTrue(validator.is_valid({"values": [1, "a"]}))
+        errors = validator.errors({"values": [1, False, 0]})
+        self.assertEqual([_.parameter for _ in errors], ["values[1]"])
@@ -0,0 +1,170 @@
+from unittest import TestCase
+from typing import Any, Dict, Generic, List, Tuple, TypeVar
+
+from typing_extensions import Annotated, TypeGuard
+
+from refined import RefinedValidator, RefinementTypeException
+from refined.predicates import RefinementPredicate, TrimmedPredicate, XmlPredicate
+from refined.refinement_types import Positive, NonEmptyList, NonEmptyString, IPv4String
+
+from tests.utils import get_message_lines
+
+_S = TypeVar("_S", bound=str)
+
+
+class TestValidator(TestCase):
+
+    def test_validator_from_alias(self):
+        validator = RefinedValidator(Positive[int])
+
+        self.assertTrue(validator.is_valid(3))
+        self.assertFalse(validator.is_valid(-3))
+        self.assertEqual(validator.check(3), 3)
+        self.assertEqual(validator.errors(3), [])
+
+    def test_validator_from_custom_annotated(self):
+        validator = RefinedValidator(Annotated[str, TrimmedPredicate[str]])
+
+        self.assertTrue(validator.is_valid("hello"))
+        self.assertFalse(validator.is_valid(" hello "))
+
+    def test_validator_from_generic_collection(self):
+        validator = RefinedValidator(NonEmptyList[int])
+
+        self.assertTrue(validator.is_valid([1]))
+        self.assertFalse(validator.is_valid([]))
+
+    def test_validator_errors(self):
+        validator = RefinedValidator(Positive[int])
+        violation, = validator.errors(-3)
+
+        self.assertIsNone(violation.parameter)
+        self.assertIs(violation.refined_type, int)
+        self.assertEqual(violation.value, -3)
+
+        violation, = RefinedValidator(List[Positive[int]]).errors([1, -2])
+        self.assertEqual(violation.parameter, "[1]")
+        self.assertEqual(violation.value, -2)
+
+    def test_validator_rejects_values_of_other_types(self):
+        validator = RefinedValidator(Positive[int])
+        violation, = validator.errors("3")
+
+        self.assertFalse(validator.is_valid("3"))
+        self.assertFalse(validator.is_valid(None))
+        self.assertEqual(str(violation), "For refined type <class 'int'>, 3 is not of that type")
+        self.assertEqual(RefinedValidator(Positive[int], strict=False).errors("3"), [])
+
+        with self.assertRaises(RefinementTypeException):
+            validator.check("3")
+
+    def test_validator_check(self):
+        validator = RefinedValidator(IPv4String)
+
+        with self.assertRaises(RefinementTypeException) as e:
+            validator.check("10.0.0")
+
+        expected_message_lines = [
+            "Conditions do not hold for the following value:",
+            "For refined type <class 'str'>, 10.0.0 does not hold the predicate "
+            "refined.predicates.string.IPv4Predicate[str]"
+        ]
+
+        self.assertEqual(expected_message_lines, get_message_lines(str(e.exception)))
+
+    def test_validator_of_non_refined_type(self):
+        validator = RefinedValidator(List[int])
+
+        self.assertTrue(validator.is_valid([]))
+        self.assertEqual(validator.predicates, ())
+
+    def test_validator_evaluates_all_predicates(self):
+        validator = RefinedValidator(Annotated[str, TrimmedPredicate[str], XmlPredicate[str]])
+
+        self.assertTrue(validator.is_valid("<note></note>"))
+        self.assertFalse(validator.is_valid(" <note></note> "))
+        self.assertFalse(validator.is_valid("<note>"))
+        self.assertEqual(2, len(validator.errors(" <note> ")))
+
+    def test_validator_evaluates_cheapest_predicates_first(self):
+        evaluated = []
+
+        class ExpensivePredicate(Generic[_S], RefinementPredicate):
+            cost = 100
+
+            @staticmethod
+            def type_guard(value: _S, *args: Tuple[Any, ...],
+                           **kwargs: Dict[str, Any]) -> TypeGuard[_S]:
+                evaluated.append("expensive")
+                return True
+
+        class CheapPredicate(Generic[_S], RefinementPredicate):
+
+            @staticmethod
+            def type_guard(value: _S, *args: Tuple[Any, ...],
+                           **kwargs: Dict[str, Any]) -> TypeGuard[_S]:
+                evaluated.append("cheap")
+                return len(value) > 0
+
+        validator = RefinedValidator(Annotated[str, ExpensivePredicate[str], CheapPredicate[str]])
+
+        self.assertFalse(validator.is_valid(""))
+        self.assertEqual(["cheap"], evaluated)
+
+        self.assertTrue(validator.is_valid("hello"))
+        self.assertEqual(["cheap", "cheap", "expensive"], evaluated)
+
+    def test_validator_of_container_items(self):
+        validator = RefinedValidator(List[Positive[int]])
+
+        self.assertTrue(validator.is_refined)
+        self.assertTrue(validator.is_valid([1, 2, 3]))
+        self.assertFalse(validator.is_valid([1, -2, 3]))
+        self.assertFalse(validator.is_valid((1, -2)))  # i.e. not a list
+        self.assertFalse(validator.is_valid([1, "2"]))
+        self.assertTrue(RefinedValidator(List[Positive[int]], strict=False).is_valid((1, -2)))
+
+        violation = validator.first_violation([1, -2, 3], "values")
+        self.assertEqual(violation.parameter, "values[1]")
+        self.assertEqual(violation.value, -2)
+
+    def test_validator_of_nested_containers(self):
+        validator = RefinedValidator(Dict[str, NonEmptyList[Tuple[Positive[int], str]]])
+
+        self.assertTrue(validator.is_valid({"a": [(1, "x")], "b": [(2, "y"), (3, "z")]}))
+        self.assertFalse(validator.is_valid({"a": []}))
+        values = {"a": [(1, "x")], "b": [(2, "y"), (-3, "z")]}
+        violation = validator.first_violation(values, "values")
+        self.assertEqual(violation.parameter, "values['b'][1][0]")
+
+        key_validator = RefinedValidator(Dict[NonEmptyString, int])
+        key_violation = key_validator.first_violation({"a": 1, "": 2}, "values")
+        self.assertEqual((key_violation.parameter, key_violation.value), ("values['']", ""))
+
+        variadic_tuple_validator = RefinedValidator(Tuple[Positive[int], ...])
+        self.assertTrue(variadic_tuple_validator.is_valid((1, 2, 3)))
+        self.assertFalse(variadic_tuple_validator.is_valid((1, 2, -3)))
+        self.assertEqual(1, len(variadic_tuple_validator.errors((1, -2, -3))))
+
+    def test_validator_of_containers_without_refined_items(self):
+        for type_hint in (List[int], Dict[str, List[int]], Tuple[int, str]):
+            validator = RefinedValidator(type_hint)
+
+            self.assertFalse(validator.is_refined)
+            self.assertIsNone(validator.annotated_type)
+
+    def test_validator_checks_a_sample_of_large_containers(self):
+        validator = RefinedValidator(List[Positive[int]], max_items=10)
+        values = list(range(1, 1001))
+
+        self.assertTrue(validator.is_valid(values))
+        self.assertFalse(validator.is_valid([-1, *values]))  # the first item is always checked
+
+        values[500] = -1
+        self.assertFalse(validator.is_valid(values))  # the sample is spread over the list
+
+        values[500], values[501] = 1, -1
+        self.assertTrue(validator.is_valid(values))
+
+        with self.assertRaises(ValueError):
+            RefinedValidator(List[Positive[int]], max_items=0)